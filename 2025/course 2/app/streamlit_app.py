@@ -5,16 +5,21 @@ from __future__ import annotations
 import logging
 import time
 from pathlib import Path
-from typing import List
 
+import numpy as np
 import streamlit as st
 
-from src.config import load_config
-from src.predict import load_default_model, predict_price
-from src.simulator import HouseEvent, load_feature_stats, iter_events
+from src.config import load_config_cached
+from src.drift import DriftMonitor, FeatureDrift
+from src.event_log import EventLog
+from src.history import PredictionHistory
+from src.predict import CurrentModel
+from src.simulator import EventBatch, load_feature_stats
+from src.worker import ScoringWorker
 
 
 LOG_PATH = Path("logs/events.log")
+EVENT_LOG_PATH = Path("logs/events.jsonl")
 
 
 def setup_logging() -> None:
@@ -38,15 +43,14 @@ def draw_sidebar(
     st.sidebar.header("Simulation Controls")
     interval = st.sidebar.slider(
         "Seconds between batches",
-        min_value=5,
+        min_value=1,
         max_value=120,
         value=int(default_interval),
-        step=5,
     )
     batch = st.sidebar.slider(
         "Houses per batch",
         min_value=1,
-        max_value=5,
+        max_value=1000,
         value=default_batch,
     )
     st.sidebar.caption(
@@ -57,58 +61,120 @@ def draw_sidebar(
     return float(interval), int(batch)
 
 
-def display_events(events: List[HouseEvent], predictions: List[float]) -> None:
-    for event, prediction in zip(events, predictions):
-        st.toast(f"New house added – estimated price ${prediction:,.0f}")
-        logging.info(
-            "House event | payload=%s | prediction=%s", event.payload, prediction
+@st.cache_resource
+def open_event_log() -> EventLog:
+    """One background event writer per server process."""
+
+    return EventLog(EVENT_LOG_PATH)
+
+
+def display_events(
+    events: EventBatch, predictions: np.ndarray, event_log: EventLog
+) -> None:
+    if len(predictions):
+        st.toast(
+            f"{len(predictions)} new house(s) added – "
+            f"latest estimated price ${predictions[-1]:,.0f}"
         )
+    event_log.log_batch(events, predictions)
+
+
+def display_drift_alerts(alerts: list[FeatureDrift]) -> None:
+    for alert in alerts:
+        st.toast(
+            f"Drift on {alert.feature}: PSI {alert.psi:.2f}, "
+            f"live mean {alert.live_mean:,.1f} vs training {alert.reference_mean:,.1f}"
+        )
+
+
+def session_worker(config_path: str) -> ScoringWorker:
+    """This session's scoring thread, started on first use; reruns reuse it.
+
+    Each browser session gets its own worker and queue, so sessions do not
+    take each other's batches. The model is re-resolved through the
+    registry whenever its files change, so retrained, pinned or online
+    models show up without restarting. A worker nobody drains (the tab
+    was closed) stops itself, and a rerun starts a fresh one.
+    """
+
+    worker = st.session_state.get("scoring_worker")
+    if worker is not None and worker.is_alive():
+        return worker
+    config = load_config_cached(config_path)
+    stats = load_feature_stats(config.paths.artifacts / "feature_stats.json")
+    worker = ScoringWorker(
+        CurrentModel(config_path).get,
+        stats,
+        interval_seconds=config.simulator.interval_seconds,
+        batch_size=config.simulator.batch_size,
+        idle_timeout=max(60.0, 10 * config.app.refresh_rate),
+    )
+    worker.start()
+    st.session_state["scoring_worker"] = worker
+    return worker
 
 
 def main() -> None:
     setup_logging()
-    config = load_config("configs/default.yaml")
+    config = load_config_cached("configs/default.yaml")
     st.set_page_config(page_title=config.app.title, layout="wide")
     st.title(config.app.title)
 
-    model, _settings = load_default_model("configs/default.yaml")
     stats_path = config.paths.artifacts / "feature_stats.json"
     if not stats_path.exists():
         st.error("Feature stats not found. Run `python -m src.train` first.")
         st.stop()
 
-    stats = load_feature_stats(stats_path)
-
     interval, batch = draw_sidebar(
         refresh_rate=config.app.refresh_rate,
         default_interval=config.simulator.interval_seconds,
         default_batch=config.simulator.batch_size,
     )
 
+    event_log = open_event_log()
+    worker = session_worker("configs/default.yaml")
+    worker.interval_seconds = interval
+    worker.batch_size = batch
+
     placeholder = st.empty()
-    history = []
+    history = PredictionHistory(
+        config.training.features, capacity=config.app.history_size
+    )
+    drift = DriftMonitor.from_feature_stats(
+        load_feature_stats(stats_path),
+        config.training.features,
+        bins=config.drift.bins,
+        half_life=config.drift.half_life,
+        psi_threshold=config.drift.psi_threshold,
+        ks_threshold=config.drift.ks_threshold,
+        min_events=config.drift.min_events,
+    )
 
     while True:
-        events = list(iter_events(stats, batch))
-        predictions = [predict_price(model, e.payload) for e in events]
-        history.extend(
-            {
-                "timestamp": time.strftime("%H:%M:%S", time.localtime(e.created_at)),
-                **e.payload,
-                "prediction": p,
-            }
-            for e, p in zip(events, predictions)
-        )
+        scored = worker.drain()
+        if not scored:
+            time.sleep(config.app.refresh_rate)
+            continue
 
-        display_events(events, predictions)
+        for item in scored:
+            history.extend(item.events.columns, item.predictions, item.events.created_at)
+            display_events(item.events, item.predictions, event_log)
+            display_drift_alerts(drift.update(item.events))
 
         with placeholder.container():
             st.subheader("Latest batch")
-            st.write(history[-batch:])
+            st.write(history.to_frame(len(scored[-1].predictions)))
             st.subheader("Prediction history")
-            st.dataframe(history[-50:])
-
-        time.sleep(interval)
+            p10, p50, p90 = history.quantiles([0.1, 0.5, 0.9])
+            cols = st.columns(3)
+            cols[0].metric("Mean prediction", f"${history.mean():,.0f}")
+            cols[1].metric("Median prediction", f"${p50:,.0f}")
+            cols[2].metric("10th–90th percentile", f"${p10:,.0f} – ${p90:,.0f}")
+            st.dataframe(history.to_frame(50))
+            st.subheader("Feature drift vs training data")
+            st.dataframe(drift.to_frame())
+
+        time.sleep(config.app.refresh_rate)
 
 
 if __name__ == "__main__":
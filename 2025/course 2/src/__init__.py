@@ -6,4 +6,8 @@ __all__ = [
     "train",
     "predict",
     "simulator",
+    "service",
+    "stats",
+    "artifact_store",
+    "registry",
 ]
@@ -0,0 +1,150 @@
+"""Content-addressed store of trained model versions."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import joblib
+import pandas as pd
+
+
+MANIFEST = "manifest.json"
+MODEL_FILE = "model.pkl"
+STATS_FILE = "feature_stats.json"
+# Sources whose contents change what a stored run holds: the fitted model,
+# its feature stats and the drift histograms. Serving code (predict.py) is
+# deliberately left out so serving-only edits do not force a retrain.
+CODE_FILES = ("train.py", "data_prep.py", "stats.py", "drift.py")
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Hash a frame's values and column names."""
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(column) for column in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def code_version() -> str:
+    """Hash of the training code, so edits invalidate cached runs."""
+
+    digest = hashlib.sha256()
+    for name in CODE_FILES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def artifact_key(data_digest: str, *configs: Any, code: Optional[str] = None) -> str:
+    """Content address for a run: data, configuration and code version."""
+
+    payload = {
+        "data": data_digest,
+        "configs": [asdict(c) if is_dataclass(c) else c for c in configs],
+        "code": code or code_version(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class ArtifactStore:
+    """Versions live in ``<root>/<key>/``; ``manifest.json`` indexes them.
+
+    The manifest records every version, the most recently trained one
+    (``latest``) and an optional ``pinned`` version that loaders should
+    prefer, which is how a deployment is pinned or rolled back.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST
+
+    def _manifest(self) -> dict:
+        path = self.manifest_path
+        if not path.exists():
+            return {"versions": {}, "latest": None, "pinned": None}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _write_manifest(self, manifest: dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f"{MANIFEST}.tmp{os.getpid()}"
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+    def versions(self) -> dict[str, dict]:
+        return self._manifest()["versions"]
+
+    def latest(self) -> Optional[str]:
+        return self._manifest()["latest"]
+
+    def pinned(self) -> Optional[str]:
+        return self._manifest()["pinned"]
+
+    def has(self, key: str) -> bool:
+        return key in self.versions() and self.model_path(key).exists()
+
+    def model_path(self, key: str) -> Path:
+        return self.root / key / MODEL_FILE
+
+    def save(self, key: str, model: Any, stats: dict, metadata: Optional[dict] = None) -> Path:
+        """Store a version; an existing key is left untouched."""
+
+        target = self.root / key
+        if not target.exists():
+            tmp_dir = self.root / f"{key}.tmp{os.getpid()}"
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+            joblib.dump(model, tmp_dir / MODEL_FILE)
+            (tmp_dir / STATS_FILE).write_text(json.dumps(stats, indent=2), encoding="utf-8")
+            os.replace(tmp_dir, target)
+
+        manifest = self._manifest()
+        manifest["versions"].setdefault(key, {"created_at": time.time(), **(metadata or {})})
+        manifest["latest"] = key
+        self._write_manifest(manifest)
+        return target
+
+    def load(self, key: str) -> tuple[Any, dict]:
+        if not self.has(key):
+            raise KeyError(f"Unknown model version: {key}")
+        stats = json.loads((self.root / key / STATS_FILE).read_text(encoding="utf-8"))
+        return joblib.load(self.model_path(key)), stats
+
+    def pin(self, key: str) -> None:
+        """Make loaders use `key` until `unpin` is called."""
+
+        if not self.has(key):
+            raise KeyError(f"Unknown model version: {key}")
+        manifest = self._manifest()
+        manifest["pinned"] = key
+        self._write_manifest(manifest)
+
+    def unpin(self) -> None:
+        manifest = self._manifest()
+        manifest["pinned"] = None
+        self._write_manifest(manifest)
+
+
+def default_store(settings) -> ArtifactStore:
+    """The store under ``models/store`` for a loaded `Settings`."""
+
+    return ArtifactStore(settings.paths.models / "store")
+
+
+__all__ = [
+    "ArtifactStore",
+    "default_store",
+    "artifact_key",
+    "code_version",
+    "frame_digest",
+]
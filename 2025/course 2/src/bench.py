@@ -0,0 +1,337 @@
+"""Open-loop latency benchmark for the prediction paths.
+
+Requests are issued on a fixed schedule (``--rate`` per second) whether or
+not earlier ones have finished, and each latency is measured from the
+request's *scheduled* start. A slow call therefore shows up in the tail of
+every request queued behind it instead of silently lowering the offered
+load (coordinated omission).
+
+Examples::
+
+    python -m src.bench --mode single --rate 2000 --duration 5
+    python -m src.bench --mode batch --rate 50000 --batch-sizes 1,8,64,512
+    python -m src.bench --mode http --url http://127.0.0.1:8000/predict --rate 500
+    python -m src.bench --mode startup --repeats 5
+    python -m src.bench --mode single --cache --payloads 1000
+
+``--cache`` puts a `cache.PredictionCache` (configured by the ``cache:``
+section) in front of the model; ``--payloads`` sets how many distinct
+listings are cycled through, i.e. how often requests repeat.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Sequence
+
+import numpy as np
+
+from .cache import PredictionCache
+from .predict import batch_predict, compile_model, load_default_model, predict_price
+from .simulator import generate_batch, load_feature_stats
+
+
+PERCENTILES = {"p50": 50.0, "p95": 95.0, "p99": 99.0, "p999": 99.9}
+
+
+def latency_summary(latencies: Sequence[float]) -> dict:
+    """Percentiles of `latencies` (seconds) reported in milliseconds."""
+
+    values = np.asarray(latencies, dtype=np.float64) * 1000.0
+    if values.size == 0:
+        return {name: None for name in [*PERCENTILES, "mean", "max"]}
+    summary = {
+        name: float(np.percentile(values, q)) for name, q in PERCENTILES.items()
+    }
+    summary["mean"] = float(values.mean())
+    summary["max"] = float(values.max())
+    return summary
+
+
+def run_open_loop(call: Callable[[int], None], rate: float, duration: float) -> dict:
+    """Invoke `call(i)` at `rate` per second for `duration` seconds.
+
+    Calls run on one thread, so when the callee falls behind schedule the
+    backlog is charged to the waiting requests' latency.
+    """
+
+    count = max(1, int(rate * duration))
+    latencies = np.empty(count)
+    start = time.perf_counter()
+    for i in range(count):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        call(i)
+        latencies[i] = time.perf_counter() - scheduled
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": count,
+        "offered_rate": rate,
+        "throughput": count / elapsed,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+async def run_open_loop_async(
+    send: Callable[[int], Awaitable[None]], rate: float, duration: float
+) -> dict:
+    """Async variant: each request is its own task, fired on schedule."""
+
+    count = max(1, int(rate * duration))
+    latencies = np.empty(count)
+    errors = 0
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def fire(i: int, scheduled: float) -> None:
+        nonlocal errors
+        try:
+            await send(i)
+        except Exception:
+            errors += 1
+        latencies[i] = loop.time() - scheduled
+
+    tasks = []
+    for i in range(count):
+        scheduled = start + i / rate
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(i, scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+    return {
+        "requests": count,
+        "errors": errors,
+        "offered_rate": rate,
+        "throughput": count / elapsed,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def make_payloads(stats: dict, features: Sequence[str], n: int, seed: int) -> list[dict]:
+    """Pre-generate `n` simulator payloads restricted to `features`."""
+
+    batch = generate_batch(stats, n, rng=seed)
+    return [{name: event.payload[name] for name in features} for event in batch]
+
+
+def bench_single(
+    model,
+    payloads: list[dict],
+    rate: float,
+    duration: float,
+    cache: Optional[PredictionCache] = None,
+) -> dict:
+    def call(i: int) -> None:
+        predict_price(model, payloads[i % len(payloads)], cache=cache)
+
+    result = run_open_loop(call, rate, duration)
+    if cache is not None:
+        result["cache"] = cache.stats()
+    return result
+
+
+def bench_batch(
+    model,
+    payloads: list[dict],
+    rate: float,
+    duration: float,
+    batch_sizes: Sequence[int],
+    cache: Optional[PredictionCache] = None,
+) -> list[dict]:
+    """One open-loop run per batch size; `rate` is rows per second."""
+
+    curves = []
+    for size in batch_sizes:
+        batches = [
+            [payloads[(start + j) % len(payloads)] for j in range(size)]
+            for start in range(0, len(payloads), size)
+        ]
+
+        def call(i: int, batches: list = batches) -> None:
+            batch_predict(model, batches[i % len(batches)], cache=cache)
+
+        if cache is not None:
+            cache.reset()
+        result = run_open_loop(call, rate / size, duration)
+        if cache is not None:
+            result["cache"] = cache.stats()
+        result["batch_size"] = size
+        result["rows_per_second"] = result["throughput"] * size
+        curves.append(result)
+    return curves
+
+
+def bench_http(url: str, payloads: list[dict], rate: float, duration: float) -> dict:
+    import httpx
+
+    async def run() -> dict:
+        limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+        async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+
+            async def send(i: int) -> None:
+                response = await client.post(
+                    url, json={"features": payloads[i % len(payloads)]}
+                )
+                response.raise_for_status()
+
+            return await run_open_loop_async(send, rate, duration)
+
+    return asyncio.run(run())
+
+
+_STARTUP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from src import predict
+imported = time.perf_counter()
+if {compact!r}:
+    model, settings = predict.load_default_compact_model({config!r})
+else:
+    model, settings = predict.load_default_model({config!r})
+loaded = time.perf_counter()
+predict.predict_price(model, dict.fromkeys(settings.training.features, 1.0))
+done = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - start,
+    "load_s": loaded - imported,
+    "first_predict_s": done - loaded,
+    "sklearn_imported": "sklearn" in sys.modules,
+}}))
+"""
+
+
+def bench_startup(config_path: str, repeats: int = 5) -> dict:
+    """Cold-start cost of the pickled pipeline vs the compact JSON model.
+
+    Each repeat runs in a fresh interpreter so import time is included.
+    """
+
+    project_root = Path(__file__).resolve().parent.parent
+    config = str(Path(config_path).resolve())
+    report = {}
+    for name, compact in (("pickle", False), ("compact", True)):
+        runs = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-c", _STARTUP_SNIPPET.format(compact=compact, config=config)],
+                cwd=project_root,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            run = json.loads(completed.stdout.strip().splitlines()[-1])
+            run["process_s"] = time.perf_counter() - start
+            runs.append(run)
+        report[name] = {
+            key: float(np.median([run[key] for run in runs]))
+            for key in ("process_s", "import_s", "load_s", "first_predict_s")
+        }
+        report[name]["sklearn_imported"] = any(run["sklearn_imported"] for run in runs)
+    return report
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="configs/default.yaml")
+    parser.add_argument(
+        "--mode", choices=["single", "batch", "http", "startup"], default="single"
+    )
+    parser.add_argument("--rate", type=float, default=1000.0, help="requests (rows for batch) per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--batch-sizes", default="1,8,64,512")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/predict")
+    parser.add_argument("--compiled", action="store_true", help="use the compiled model path")
+    parser.add_argument("--payloads", type=int, default=10_000, help="distinct payloads cycled through")
+    parser.add_argument("--cache", action="store_true", help="cache predictions (see cache: in the config)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5, help="fresh processes per startup path")
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> dict:
+    if args.mode == "startup":
+        return {
+            "mode": "startup",
+            "commit": git_revision(),
+            "timestamp": time.time(),
+            "result": bench_startup(args.config, args.repeats),
+        }
+
+    model, settings = load_default_model(args.config)
+    features = settings.training.features
+    stats = load_feature_stats(settings.paths.artifacts / "feature_stats.json")
+    payloads = make_payloads(stats, features, args.payloads, args.seed)
+    if args.compiled:
+        model = compile_model(model, features)
+    cache = PredictionCache.from_config(settings.cache, features) if args.cache else None
+
+    report = {
+        "mode": args.mode,
+        "compiled": args.compiled,
+        "cache": args.cache,
+        "commit": git_revision(),
+        "timestamp": time.time(),
+        "duration": args.duration,
+    }
+    if args.mode == "single":
+        report["result"] = bench_single(model, payloads, args.rate, args.duration, cache)
+    elif args.mode == "batch":
+        sizes = [int(size) for size in args.batch_sizes.split(",")]
+        report["curves"] = bench_batch(
+            model, payloads, args.rate, args.duration, sizes, cache
+        )
+    else:
+        report["url"] = args.url
+        report["result"] = bench_http(args.url, payloads, args.rate, args.duration)
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict:
+    args = parse_args(argv)
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+    return report
+
+
+__all__ = [
+    "latency_summary",
+    "run_open_loop",
+    "run_open_loop_async",
+    "bench_single",
+    "bench_batch",
+    "bench_http",
+    "bench_startup",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    main()
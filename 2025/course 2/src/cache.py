@@ -0,0 +1,192 @@
+"""LRU/TTL cache of predictions keyed on (quantized) feature vectors."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Mapping, Optional, Sequence
+
+from .schema import SchemaError
+
+# Rough per-entry cost of the OrderedDict slot and the (value, expiry) pair.
+_ENTRY_OVERHEAD = 200
+
+
+def model_version(model: Any) -> Optional[Hashable]:
+    """The model's ``version`` attribute, if it carries one."""
+
+    return getattr(model, "version", None)
+
+
+class PredictionCache:
+    """Map feature vectors to predictions for repeated or templated listings.
+
+    Keys are ``(model version, *features)`` with the features taken in
+    `features` order. A feature listed in `quantize` is rounded to a
+    multiple of its step first, so near-duplicates share an entry (and
+    the prediction of whichever was seen first). Models without a
+    ``version`` attribute are tracked by identity instead: switching to a
+    different object clears the cache.
+
+    Entries are evicted least recently used first once `max_entries` or the
+    approximate `max_bytes` budget is exceeded, and expire `ttl_seconds`
+    after insertion when a TTL is set.
+    """
+
+    def __init__(
+        self,
+        features: Sequence[str],
+        quantize: Optional[Mapping[str, float]] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = 16 * 2**20,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.features = list(features)
+        quantize = dict(quantize or {})
+        unknown = set(quantize) - set(self.features)
+        if unknown:
+            raise ValueError(f"Cannot quantize unknown features: {sorted(unknown)}")
+        self._steps = [quantize.get(name) for name in self.features]
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, Optional[float], int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._unversioned: Any = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_config(cls, config, features: Sequence[str]) -> "PredictionCache":
+        """Build from a `config.CacheConfig`, whether or not it is enabled."""
+
+        return cls(
+            features,
+            quantize=config.quantize,
+            max_entries=config.max_entries,
+            max_bytes=int(config.max_mb * 2**20) if config.max_mb is not None else None,
+            ttl_seconds=config.ttl_seconds,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, version: Optional[Hashable], row: Mapping[str, float]) -> tuple:
+        """Cache key for `row`; raises `SchemaError` for missing or non-numeric features."""
+
+        missing = [name for name in self.features if name not in row]
+        if missing:
+            raise SchemaError(f"missing features {missing}")
+        parts: list = [version]
+        for name, step in zip(self.features, self._steps):
+            try:
+                value = float(row[name])
+            except (TypeError, ValueError):
+                raise SchemaError(f"non-numeric value for {name!r}") from None
+            # round() yields ints, so 1500.0000001 and 1500.0 share a key;
+            # adding 0.0 folds -0.0 into 0.0 for the exact case.
+            parts.append(round(value / step) if step else value + 0.0)
+        return tuple(parts)
+
+    def version_for(self, model: Any) -> Optional[Hashable]:
+        """Key prefix for `model`, clearing entries left by a replaced model."""
+
+        version = model_version(model)
+        if version is None and model is not self._unversioned:
+            with self._lock:
+                if model is not self._unversioned:
+                    if self._unversioned is not None:
+                        self.invalidations += 1
+                    self._drop_unversioned()
+                    self._unversioned = model
+        return version
+
+    def _drop_unversioned(self) -> None:
+        for key in [key for key in self._entries if key[0] is None]:
+            self.bytes -= self._entries.pop(key)[2]
+
+    def get(self, key: tuple) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: float) -> None:
+        size = sys.getsizeof(key) + sum(map(sys.getsizeof, key)) + _ENTRY_OVERHEAD
+        expires_at = None if self.ttl_seconds is None else self._clock() + self.ttl_seconds
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+            self._entries[key] = (float(value), expires_at, size)
+            self.bytes += size
+            while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.invalidations += 1
+
+    def reset(self) -> None:
+        """Drop every entry and zero the counters, e.g. between benchmark runs."""
+
+        with self._lock:
+            self._entries.clear()
+            self._unversioned = None
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+            self.expirations = self.invalidations = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def cache_from_settings(settings) -> Optional[PredictionCache]:
+    """A cache configured by the ``cache:`` section, or ``None`` if disabled."""
+
+    if not settings.cache.enabled:
+        return None
+    return PredictionCache.from_config(settings.cache, settings.training.features)
+
+
+__all__ = [
+    "PredictionCache",
+    "cache_from_settings",
+    "model_version",
+]
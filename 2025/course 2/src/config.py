@@ -1,8 +1,8 @@
 """Simple configuration helper for the MLOps regression demo."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import yaml
 
@@ -35,6 +35,55 @@ class SimulatorConfig:
 class AppConfig:
     title: str
     refresh_rate: float
+    history_size: int = 500
+
+
+@dataclass
+class ServingConfig:
+    max_batch_size: int = 64
+    max_wait_ms: float = 5.0
+    # "pickle" serves the trained pipeline, "compact" the JSON model that
+    # `src.online` republishes as labelled events arrive.
+    model_format: str = "pickle"
+
+
+@dataclass
+class SearchConfig:
+    enabled: bool = False
+    cv_folds: int = 5
+    n_jobs: int = -1
+    early_stop_factor: float = 1.5
+    candidates: list[dict] = field(default_factory=list)
+
+
+@dataclass
+class DriftConfig:
+    bins: int = 20
+    half_life: float = 1000.0
+    psi_threshold: float = 0.2
+    ks_threshold: float = 0.15
+    min_events: int = 200
+
+
+@dataclass
+class CacheConfig:
+    enabled: bool = False
+    max_entries: Optional[int] = None
+    max_mb: Optional[float] = 16.0
+    ttl_seconds: Optional[float] = None
+    # Per-feature rounding step, e.g. {"Gr Liv Area": 10}.
+    quantize: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class DataConfig:
+    url: Optional[str] = None  # None: data_prep.AMES_URL
+    sha256: Optional[str] = None  # pin the raw file; None trusts the first download
+    cache_dir: Optional[str] = None  # None: $AMES_DATA_CACHE or ~/.cache/ames-mlops
+    parts: int = 4
+    retries: int = 3
+    # Rows cleaned at a time; None reads the whole raw file at once.
+    chunk_size: Optional[int] = 50_000
 
 
 @dataclass
@@ -43,6 +92,11 @@ class Settings:
     training: TrainingConfig
     simulator: SimulatorConfig
     app: AppConfig
+    serving: ServingConfig
+    search: SearchConfig
+    drift: DriftConfig
+    cache: CacheConfig
+    data: DataConfig
 
 
 def load_config(path: str | Path) -> Settings:
@@ -64,20 +118,52 @@ def load_config(path: str | Path) -> Settings:
     training = TrainingConfig(**raw["training"])
     simulator = SimulatorConfig(**raw["simulator"])
     app = AppConfig(**raw["app"])
+    serving = ServingConfig(**raw.get("serving", {}))
+    search = SearchConfig(**raw.get("search", {}))
+    drift = DriftConfig(**raw.get("drift", {}))
+    cache = CacheConfig(**raw.get("cache", {}))
+    data = DataConfig(**raw.get("data", {}))
 
     return Settings(
         paths=paths,
         training=training,
         simulator=simulator,
         app=app,
+        serving=serving,
+        search=search,
+        drift=drift,
+        cache=cache,
+        data=data,
     )
 
 
+_CONFIG_CACHE: Dict[Path, tuple[int, Settings]] = {}
+
+
+def load_config_cached(path: str | Path) -> Settings:
+    """`load_config`, reparsed only when the YAML file's mtime changes."""
+
+    key = Path(path).resolve()
+    mtime = key.stat().st_mtime_ns
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    settings = load_config(path)
+    _CONFIG_CACHE[key] = (mtime, settings)
+    return settings
+
+
 __all__ = [
     "Settings",
     "Paths",
     "TrainingConfig",
     "SimulatorConfig",
     "AppConfig",
+    "ServingConfig",
+    "SearchConfig",
+    "DriftConfig",
+    "CacheConfig",
+    "DataConfig",
     "load_config",
+    "load_config_cached",
 ]
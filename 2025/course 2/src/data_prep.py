@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
+from .fetch import fetch
+from .stats import FeatureStatsAccumulator
+
 
 AMES_URL = "http://jse.amstat.org/v19n3/decock/AmesHousing.txt"
 SELECTED_COLUMNS = [
@@ -18,6 +26,9 @@ SELECTED_COLUMNS = [
     "Total Bsmt SF",
     "SalePrice",
 ]
+# Bump whenever `clean_frame` changes so cached processed data is rebuilt.
+PREPROCESS_VERSION = "1"
+CACHE_MANIFEST = "manifest.json"
 
 
 @dataclass
@@ -26,41 +37,249 @@ class DataPaths:
     processed_csv: Path
 
 
-def download_data(output_path: Path, columns: Optional[list[str]] = None) -> Path:
-    """Download the Ames dataset subset to `output_path`. Returns saved path."""
+def download_data(
+    output_path: Path,
+    columns: Optional[list[str]] = None,
+    url: str = AMES_URL,
+    sha256: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+    **fetch_options,
+) -> Path:
+    """Download the Ames dataset subset to `output_path`. Returns saved path.
+
+    The full file comes from the shared download cache (see `fetch.fetch`),
+    so it is only transferred once per machine and is checksum-verified.
+    """
 
     columns = columns or SELECTED_COLUMNS
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df = pd.read_csv(AMES_URL, sep="\t", usecols=columns)
+    source = fetch(url, sha256=sha256, cache_dir=cache_dir, **fetch_options)
+    df = pd.read_csv(source, sep="\t", usecols=columns)
     df.to_csv(output_path, index=False)
     return output_path
 
 
-def preprocess(raw_path: Path, processed_path: Path) -> Path:
-    """Clean the raw dataset and save the processed file."""
-
-    processed_path.parent.mkdir(parents=True, exist_ok=True)
-    df = pd.read_csv(raw_path)
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply the basic cleaning steps to a raw frame."""
 
-    # Basic cleaning
     df["Central Air"] = df["Central Air"].map({"N": 0, "Y": 1})
-    df = df.dropna(axis=0)
+    return df.dropna(axis=0)
+
+
+def preprocess(
+    raw_path: Path, processed_path: Path, chunk_size: Optional[int] = None
+) -> Path:
+    """Clean the raw dataset and save the processed file.
 
+    With `chunk_size` set the file is streamed; see `preprocess_streaming`.
+    """
+
+    if chunk_size is not None:
+        return preprocess_streaming(raw_path, processed_path, chunk_size)[0]
+
+    processed_path.parent.mkdir(parents=True, exist_ok=True)
+    df = clean_frame(pd.read_csv(raw_path))
     df.to_csv(processed_path, index=False)
     return processed_path
 
 
-def load_processed(processed_path: Path) -> pd.DataFrame:
-    """Load the processed dataset."""
+def preprocess_streaming(
+    raw_path: Path,
+    processed_path: Path,
+    chunk_size: int = 50_000,
+    target: str = "SalePrice",
+) -> tuple[Path, dict]:
+    """Clean `raw_path` in chunks of `chunk_size` rows and append to the output.
+
+    Only one chunk is held in memory at a time. Returns the processed path
+    and per-feature min/max/mean/std (population std, `target` excluded) in
+    the same layout as `train.compute_feature_stats`.
+    """
+
+    processed_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = processed_path.with_name(processed_path.name + ".part")
+
+    stats: Optional[FeatureStatsAccumulator] = None
+    with tmp_path.open("w", encoding="utf-8", newline="") as handle:
+        for chunk in pd.read_csv(raw_path, chunksize=chunk_size):
+            chunk = clean_frame(chunk)
+            if stats is None:
+                stats = FeatureStatsAccumulator(c for c in chunk.columns if c != target)
+                chunk.to_csv(handle, index=False)
+            else:
+                chunk.to_csv(handle, index=False, header=False)
+            stats.update(chunk)
+
+    os.replace(tmp_path, processed_path)
+    return processed_path, stats.to_dict() if stats is not None else {}
+
+
+def cache_dir_for(processed_path: Path) -> Path:
+    """Directory holding the columnar cache next to the processed CSV."""
+
+    return processed_path.with_name(processed_path.stem + ".cache")
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in chunks."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_signature(path: Path) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _read_manifest(cache_dir: Path) -> Optional[dict]:
+    manifest_path = cache_dir / CACHE_MANIFEST
+    if not manifest_path.exists():
+        return None
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return None
+
+
+def source_digest(source_path: Path, manifest: Optional[dict] = None) -> str:
+    """Content hash of `source_path`.
+
+    If `manifest` was written for the same file size and mtime the stored
+    hash is reused, so a warm cache never re-reads the source file.
+    """
+
+    if manifest is not None and manifest.get("source") == _source_signature(source_path):
+        return manifest["source_digest"]
+    return file_digest(source_path)
+
+
+def cache_key(digest: str) -> str:
+    """Cache key: source content hash plus preprocessing version."""
+
+    return f"{digest}-v{PREPROCESS_VERSION}"
+
+
+def write_column_cache(
+    df: pd.DataFrame,
+    cache_dir: Path,
+    source_path: Path,
+    digest: Optional[str] = None,
+    stats: Optional[dict] = None,
+) -> Path:
+    """Store each column of `df` as a ``.npy`` file plus a JSON manifest.
+
+    `stats` (feature statistics gathered while building `df`) are kept in
+    the manifest so a warm cache can hand them back without a pass.
+    """
+
+    digest = digest or file_digest(source_path)
+    tmp_dir = cache_dir.with_name(cache_dir.name + f".tmp{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        filename = f"col{i}.npy"
+        np.save(tmp_dir / filename, np.ascontiguousarray(df[name].to_numpy()))
+        columns.append({"name": name, "file": filename})
+    manifest = {
+        "key": cache_key(digest),
+        "source": _source_signature(source_path),
+        "source_digest": digest,
+        "rows": len(df),
+        "columns": columns,
+    }
+    if stats is not None:
+        manifest["feature_stats"] = stats
+    (tmp_dir / CACHE_MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    return cache_dir
+
+
+def read_column_cache(cache_dir: Path, key: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """Open a column cache as memory-mapped arrays, or ``None`` if stale."""
+
+    manifest = _read_manifest(cache_dir)
+    if manifest is None or (key is not None and manifest.get("key") != key):
+        return None
+    arrays = {
+        column["name"]: np.load(cache_dir / column["file"], mmap_mode="r")
+        for column in manifest["columns"]
+    }
+    return pd.DataFrame(arrays, copy=False)
+
+
+def load_processed_with_stats(
+    processed_path: Path,
+    raw_path: Optional[Path] = None,
+    chunk_size: Optional[int] = None,
+) -> tuple[pd.DataFrame, Optional[dict]]:
+    """Load the processed dataset, preferring the columnar cache.
+
+    The cache is keyed on the contents of `raw_path` (or of the processed
+    CSV when no raw file is given) and the preprocessing version. A stale
+    or missing cache is rebuilt, re-running `preprocess` when `raw_path`
+    is provided; with `chunk_size` set the raw file is streamed and the
+    feature statistics collected on the way are returned (and cached)
+    alongside the frame. Otherwise the statistics are ``None``.
+    """
+
+    cache_dir = cache_dir_for(processed_path)
+    source_path = raw_path if raw_path is not None else processed_path
+    manifest = _read_manifest(cache_dir)
+    digest = source_digest(source_path, manifest)
+    cached = read_column_cache(cache_dir, cache_key(digest))
+    if cached is not None:
+        return cached, manifest.get("feature_stats")
+
+    stats = None
+    if raw_path is not None and chunk_size is not None:
+        _, stats = preprocess_streaming(raw_path, processed_path, chunk_size)
+        df = pd.read_csv(processed_path, float_precision="round_trip")
+    elif raw_path is not None:
+        processed_path.parent.mkdir(parents=True, exist_ok=True)
+        df = clean_frame(pd.read_csv(raw_path))
+        df.to_csv(processed_path, index=False)
+    else:
+        df = pd.read_csv(processed_path)
+
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        # Text columns cannot be memory-mapped; serve the frame uncached.
+        return df, stats
+    write_column_cache(df.reset_index(drop=True), cache_dir, source_path, digest, stats)
+    return read_column_cache(cache_dir), stats
+
+
+def load_processed(
+    processed_path: Path,
+    raw_path: Optional[Path] = None,
+    chunk_size: Optional[int] = None,
+) -> pd.DataFrame:
+    """Load the processed dataset; see `load_processed_with_stats`."""
 
-    return pd.read_csv(processed_path)
+    return load_processed_with_stats(processed_path, raw_path, chunk_size)[0]
 
 
 __all__ = [
     "AMES_URL",
     "SELECTED_COLUMNS",
+    "PREPROCESS_VERSION",
     "DataPaths",
     "download_data",
+    "clean_frame",
     "preprocess",
+    "preprocess_streaming",
+    "cache_dir_for",
+    "source_digest",
+    "cache_key",
+    "write_column_cache",
+    "read_column_cache",
+    "load_processed_with_stats",
     "load_processed",
 ]
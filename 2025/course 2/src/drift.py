@@ -0,0 +1,283 @@
+"""Streaming drift detection against the training feature distribution.
+
+Each feature keeps a fixed-size histogram over the training range plus
+an underflow and an overflow bin, so memory does not grow with traffic.
+Live counts decay exponentially (``half_life`` events) so the sketch
+tracks recent traffic; updating costs one ``searchsorted`` and one
+``bincount`` per feature per batch. PSI and a binned Kolmogorov-Smirnov
+distance compare the live histogram with the reference one.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .simulator import EventBatch, HouseEvent
+
+logger = logging.getLogger(__name__)
+
+# Smoothing for empty bins so PSI stays finite.
+_EPSILON = 1e-4
+
+
+def histogram_edges(low: float, high: float, bins: int) -> np.ndarray:
+    if not high > low:
+        high = low + 1.0
+    return np.linspace(low, high, bins + 1)
+
+
+def reference_histograms(df: pd.DataFrame, bins: int = 20) -> dict[str, dict]:
+    """Per-column training histograms, in the `feature_stats.json` layout.
+
+    Integer columns with fewer than `bins` distinct levels get one bin per
+    level, so continuous live values are compared with the nearest level.
+    """
+
+    histograms = {}
+    for column in df.columns:
+        values = df[column].to_numpy(dtype=np.float64)
+        low, high = float(values.min()), float(values.max())
+        if np.array_equal(values, np.round(values)) and high - low < bins:
+            edges = np.arange(low - 0.5, high + 1.0)
+        else:
+            edges = histogram_edges(low, high, bins)
+        counts, _ = np.histogram(values, bins=edges)
+        histograms[column] = {"edges": edges.tolist(), "counts": counts.tolist()}
+    return histograms
+
+
+def _normal_cdf(x: np.ndarray, mean: float, std: float) -> np.ndarray:
+    scale = std * math.sqrt(2.0)
+    return np.array([0.5 * (1.0 + math.erf((value - mean) / scale)) for value in x])
+
+
+@dataclass
+class FeatureDrift:
+    feature: str
+    psi: float
+    ks: float
+    live_mean: float
+    reference_mean: float
+    events: float
+    drifted: bool
+
+
+class FeatureSketch:
+    """Decayed histogram of one feature next to its reference histogram."""
+
+    def __init__(
+        self,
+        edges: Sequence[float],
+        reference: Sequence[float],
+        reference_mean: float,
+        half_life: float = 1000.0,
+    ) -> None:
+        self.edges = np.asarray(edges, dtype=np.float64)
+        reference = np.asarray(reference, dtype=np.float64)
+        if len(reference) == len(self.edges) - 1:
+            reference = np.concatenate([[0.0], reference, [0.0]])
+        if len(reference) != len(self.edges) + 1:
+            raise ValueError("reference needs one weight per bin, plus optional under/overflow")
+        self.reference = self._smooth(reference)
+        self.reference_mean = reference_mean
+        self.half_life = half_life
+        self.counts = np.zeros(len(self.edges) + 1)
+        self.weight = 0.0
+        self.total = 0.0  # decayed sum of values, for the live mean
+
+    @classmethod
+    def from_stats(
+        cls, values: Mapping, bins: int = 20, half_life: float = 1000.0
+    ) -> "FeatureSketch":
+        """Use the stored training histogram, else a clipped normal approximation."""
+
+        histogram = values.get("histogram")
+        if histogram is not None:
+            return cls(histogram["edges"], histogram["counts"], values["mean"], half_life)
+
+        low, high, mean, std = values["min"], values["max"], values["mean"], values["std"]
+        spread = (mean - low) * (high - mean)
+        if high > low and np.isclose(std**2, spread, rtol=1e-3):
+            # Maximal variance for the range: all mass sits on min and max
+            # (e.g. a 0/1 flag), with P(max) = (mean - min) / (max - min).
+            edges = np.array([low - 0.5, (low + high) / 2, high + 0.5])
+            upper = (mean - low) / (high - low)
+            return cls(edges, [1.0 - upper, upper], mean, half_life)
+
+        edges = histogram_edges(low, high, bins)
+        cdf = _normal_cdf(edges, mean, std or 1.0)
+        # Mass outside the range is clipped onto the end bins, as the simulator does.
+        cdf[0], cdf[-1] = 0.0, 1.0
+        return cls(edges, np.diff(cdf), mean, half_life)
+
+    @staticmethod
+    def _smooth(counts: np.ndarray) -> np.ndarray:
+        total = counts.sum()
+        probs = counts / total if total > 0 else np.full(len(counts), 1.0 / len(counts))
+        probs = np.maximum(probs, _EPSILON)
+        return probs / probs.sum()
+
+    def bin_index(self, values: np.ndarray) -> np.ndarray:
+        """0 is underflow, ``len(edges)`` overflow; the range's max is in range."""
+
+        index = np.searchsorted(self.edges[1:-1], values, side="right") + 1
+        index[values < self.edges[0]] = 0
+        index[values > self.edges[-1]] = len(self.edges)
+        return index
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        decay = 0.5 ** (n / self.half_life)
+        self.counts *= decay
+        self.counts += np.bincount(self.bin_index(values), minlength=len(self.counts))
+        self.weight = self.weight * decay + n
+        self.total = self.total * decay + float(values.sum())
+
+    def live(self) -> np.ndarray:
+        return self._smooth(self.counts)
+
+    def psi(self) -> float:
+        live = self.live()
+        return float(np.sum((live - self.reference) * np.log(live / self.reference)))
+
+    def ks(self) -> float:
+        """Largest CDF gap at the bin edges, a lower bound on the KS statistic."""
+
+        if self.weight == 0:
+            return 0.0
+        live = self.counts / self.counts.sum()
+        reference = self.reference
+        return float(np.max(np.abs(np.cumsum(live) - np.cumsum(reference))))
+
+    def live_mean(self) -> float:
+        return self.total / self.weight if self.weight else float("nan")
+
+
+class DriftMonitor:
+    """Compare live feature values with the training stats, batch by batch.
+
+    `update` returns the features whose PSI or KS distance crossed a
+    threshold in that batch and logs a warning for each; `report` gives
+    the current scores for every feature.
+    """
+
+    def __init__(
+        self,
+        sketches: Dict[str, FeatureSketch],
+        psi_threshold: float = 0.2,
+        ks_threshold: float = 0.15,
+        min_events: int = 200,
+    ) -> None:
+        self.sketches = sketches
+        self.psi_threshold = psi_threshold
+        self.ks_threshold = ks_threshold
+        self.min_events = min_events
+        self.events = 0
+        self._alerting: set[str] = set()
+
+    @classmethod
+    def from_feature_stats(
+        cls,
+        stats: dict,
+        features: Optional[Sequence[str]] = None,
+        bins: int = 20,
+        half_life: float = 1000.0,
+        **thresholds,
+    ) -> "DriftMonitor":
+        items = {name: values for name, values in stats.items() if isinstance(values, dict)}
+        names = list(features) if features is not None else list(items)
+        sketches = {
+            name: FeatureSketch.from_stats(items[name], bins=bins, half_life=half_life)
+            for name in names
+        }
+        return cls(sketches, **thresholds)
+
+    @property
+    def features(self) -> list[str]:
+        return list(self.sketches)
+
+    def update(self, columns: EventBatch | Mapping[str, np.ndarray]) -> list[FeatureDrift]:
+        """Fold a batch of columns in and return newly raised alerts."""
+
+        if isinstance(columns, EventBatch):
+            columns = columns.columns
+        n = 0
+        for name, sketch in self.sketches.items():
+            values = np.asarray(columns[name], dtype=np.float64)
+            sketch.update(values)
+            n = len(values)
+        self.events += n
+        return self._check()
+
+    def update_events(self, events: Iterable[HouseEvent]) -> list[FeatureDrift]:
+        return self.update_records({"payload": event.payload} for event in events)
+
+    def update_records(self, records: Iterable[dict]) -> list[FeatureDrift]:
+        """Fold event-log records (see `event_log.read_events`) in."""
+
+        payloads = [record["payload"] for record in records]
+        if not payloads:
+            return []
+        return self.update(
+            {name: np.array([p[name] for p in payloads]) for name in self.sketches}
+        )
+
+    def report(self) -> list[FeatureDrift]:
+        ready = self.events >= self.min_events
+        rows = []
+        for name, sketch in self.sketches.items():
+            psi, ks = sketch.psi(), sketch.ks()
+            rows.append(
+                FeatureDrift(
+                    feature=name,
+                    psi=psi,
+                    ks=ks,
+                    live_mean=sketch.live_mean(),
+                    reference_mean=sketch.reference_mean,
+                    events=sketch.weight,
+                    drifted=ready and (psi > self.psi_threshold or ks > self.ks_threshold),
+                )
+            )
+        return rows
+
+    def alerts(self) -> list[FeatureDrift]:
+        return [row for row in self.report() if row.drifted]
+
+    def _check(self) -> list[FeatureDrift]:
+        raised = []
+        alerting = set()
+        for row in self.alerts():
+            alerting.add(row.feature)
+            if row.feature not in self._alerting:
+                raised.append(row)
+                logger.warning(
+                    "Drift on %s: PSI %.3f, KS %.3f, live mean %.2f vs training %.2f",
+                    row.feature,
+                    row.psi,
+                    row.ks,
+                    row.live_mean,
+                    row.reference_mean,
+                )
+        self._alerting = alerting
+        return raised
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame([asdict(row) for row in self.report()])
+
+
+__all__ = [
+    "FeatureDrift",
+    "FeatureSketch",
+    "DriftMonitor",
+    "histogram_edges",
+    "reference_histograms",
+]
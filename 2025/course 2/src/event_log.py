@@ -0,0 +1,249 @@
+"""Asynchronous structured log of house events and predictions.
+
+Callers hand records to a `logging.handlers.QueueHandler`, which only
+enqueues them. A `QueueListener` thread turns them into newline-delimited
+JSON, writes them in batches, fsyncs periodically and rotates the file by
+size. `read_events` and friends replay the log, oldest record first.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Dict, Iterator
+
+import numpy as np
+
+from .simulator import EventBatch, HouseEvent
+
+
+class JsonlEventHandler(logging.Handler):
+    """Buffer event records and append them to a size-rotated NDJSON file.
+
+    Records carry either ``event`` (one row) or ``batch`` (columnar rows)
+    as an attribute. The buffer is written once it holds `batch_size`
+    lines or `flush_interval` seconds have passed, and the file is fsynced
+    at most every `fsync_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        fsync_interval: float = 1.0,
+    ) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._lines: list[str] = []
+        self._last_write = time.monotonic()
+        self._last_fsync = time.monotonic()
+        self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream = self.path.open("a", encoding="utf-8")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            batch = getattr(record, "batch", None)
+            if batch is not None:
+                self._lines.extend(_batch_lines(**batch))
+            else:
+                self._lines.append(json.dumps(getattr(record, "event")))
+            if (
+                len(self._lines) >= self.batch_size
+                or time.monotonic() - self._last_write >= self.flush_interval
+            ):
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self, fsync: bool = False) -> None:
+        with self.lock:
+            if self._lines:
+                data = "\n".join(self._lines) + "\n"
+                self._lines.clear()
+                if self._stream.tell() and self._stream.tell() + len(data) > self.max_bytes:
+                    self._rotate()
+                self._stream.write(data)
+                self._stream.flush()
+                self._last_write = time.monotonic()
+                self._dirty = True
+            if self._dirty and (
+                fsync or time.monotonic() - self._last_fsync >= self.fsync_interval
+            ):
+                os.fsync(self._stream.fileno())
+                self._last_fsync = time.monotonic()
+                self._dirty = False
+
+    def _rotate(self) -> None:
+        self._stream.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = rotated_path(self.path, i)
+                if source.exists():
+                    os.replace(source, rotated_path(self.path, i + 1))
+            os.replace(self.path, rotated_path(self.path, 1))
+        else:
+            self.path.unlink()
+        self._stream = self.path.open("a", encoding="utf-8")
+
+    def close(self) -> None:
+        self.flush(fsync=True)
+        self._stream.close()
+        super().close()
+
+
+class _FlushingListener(QueueListener):
+    """QueueListener that flushes its handler whenever the queue goes idle."""
+
+    def __init__(self, queue_: queue.SimpleQueue, handler: JsonlEventHandler) -> None:
+        super().__init__(queue_, handler)
+        self.handler = handler
+
+    def dequeue(self, block: bool):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.handler.flush_interval)
+            except queue.Empty:
+                self.handler.flush()
+
+
+def _batch_lines(
+    columns: Dict[str, list], predictions: list, created_at: list
+) -> list[str]:
+    names = list(columns)
+    rows = zip(*(columns[name] for name in names))
+    return [
+        json.dumps(
+            {
+                "created_at": ts,
+                "payload": dict(zip(names, values)),
+                "prediction": prediction,
+            }
+        )
+        for values, prediction, ts in zip(rows, predictions, created_at)
+    ]
+
+
+def rotated_path(path: Path, index: int) -> Path:
+    return path.with_name(f"{path.name}.{index}")
+
+
+class EventLog:
+    """Non-blocking sink for house events; use as a context manager."""
+
+    def __init__(self, path: Path, **handler_options) -> None:
+        self.path = Path(path)
+        self.handler = JsonlEventHandler(self.path, **handler_options)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.listener = _FlushingListener(self._queue, self.handler)
+        self.logger = logging.getLogger(f"{__name__}.{self.path}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._queue_handler = QueueHandler(self._queue)
+        self.logger.addHandler(self._queue_handler)
+        self.listener.start()
+
+    def log_event(
+        self, payload: dict[str, float], prediction: float, created_at: float
+    ) -> None:
+        event = {"created_at": created_at, "payload": payload, "prediction": prediction}
+        self.logger.info("house_event", extra={"event": event})
+
+    def log_batch(self, events: EventBatch, predictions: np.ndarray) -> None:
+        """Log a whole scored batch as a single queued record."""
+
+        batch = {
+            "columns": {name: column.tolist() for name, column in events.columns.items()},
+            "predictions": np.asarray(predictions).tolist(),
+            "created_at": events.created_at.tolist(),
+        }
+        self.logger.info("house_batch", extra={"batch": batch})
+
+    def close(self) -> None:
+        self.logger.removeHandler(self._queue_handler)
+        self.listener.stop()
+        self.handler.close()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def read_events(path: Path, include_rotated: bool = True) -> Iterator[dict]:
+    """Yield logged records, oldest first, across rotated files."""
+
+    path = Path(path)
+    files = []
+    if include_rotated:
+        index = 1
+        while rotated_path(path, index).exists():
+            files.append(rotated_path(path, index))
+            index += 1
+        files.reverse()
+    if path.exists():
+        files.append(path)
+    for file in files:
+        with file.open(encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def replay_events(path: Path, include_rotated: bool = True) -> Iterator[HouseEvent]:
+    """Replay the log as `HouseEvent`s, e.g. to feed the simulator consumers."""
+
+    for record in read_events(path, include_rotated):
+        yield HouseEvent(payload=record["payload"], created_at=record["created_at"])
+
+
+def iter_event_batches(
+    path: Path, batch_size: int = 1024, include_rotated: bool = True
+) -> Iterator[tuple[EventBatch, np.ndarray]]:
+    """Replay the log as columnar batches plus their predictions."""
+
+    records: list[dict] = []
+    for record in read_events(path, include_rotated):
+        records.append(record)
+        if len(records) == batch_size:
+            yield _to_batch(records)
+            records = []
+    if records:
+        yield _to_batch(records)
+
+
+def _to_batch(records: list[dict]) -> tuple[EventBatch, np.ndarray]:
+    names = list(records[0]["payload"])
+    columns = {
+        name: np.array([record["payload"][name] for record in records], dtype=np.float64)
+        for name in names
+    }
+    created_at = np.array([record["created_at"] for record in records], dtype=np.float64)
+    predictions = np.array(
+        [np.nan if record["prediction"] is None else record["prediction"] for record in records],
+        dtype=np.float64,
+    )
+    return EventBatch(columns=columns, created_at=created_at), predictions
+
+
+__all__ = [
+    "JsonlEventHandler",
+    "EventLog",
+    "read_events",
+    "replay_events",
+    "iter_event_batches",
+]
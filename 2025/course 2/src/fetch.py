@@ -0,0 +1,246 @@
+"""Cached, resumable and checksum-verified downloads.
+
+`fetch` keeps one copy of each (URL, checksum) pair in a shared cache
+directory (``$AMES_DATA_CACHE``, default ``~/.cache/ames-mlops``) so CI
+jobs and worker processes reuse it instead of downloading again. Data is
+written to ``.part`` files first: a dropped connection resumes with an
+HTTP ``Range`` request, and servers that advertise range support are
+fetched in several parts in parallel. The finished file must match the
+pinned SHA-256 before it is moved into place; without a pin, the digest
+of the first download is recorded and every later reuse is checked
+against it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import http.client
+import os
+import re
+import shutil
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence, TypeVar
+from urllib.parse import urlsplit
+
+try:  # advisory locks are POSIX-only; elsewhere concurrent fetches just race
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+CACHE_ENV = "AMES_DATA_CACHE"
+CHUNK_SIZE = 1 << 20
+# Files smaller than this per part are not worth splitting.
+MIN_PART_SIZE = 1 << 20
+
+T = TypeVar("T")
+
+
+class ChecksumError(ValueError):
+    """Downloaded or cached bytes do not match the expected SHA-256."""
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_ENV) or Path.home() / ".cache" / "ames-mlops")
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(
+    url: str, sha256: Optional[str] = None, cache_dir: Optional[Path] = None
+) -> Path:
+    """Where `url` (expected to hash to `sha256`) is kept in the cache."""
+
+    key = hashlib.sha256(f"{url}\n{sha256 or ''}".encode()).hexdigest()[:16]
+    name = Path(urlsplit(url).path).name or "download"
+    return Path(cache_dir or default_cache_dir()) / key / name
+
+
+@contextlib.contextmanager
+def _locked(directory: Path) -> Iterator[None]:
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / ".lock", "w") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+def _probe(url: str, timeout: float) -> tuple[Optional[int], bool]:
+    """Content length and whether the server accepts byte ranges."""
+
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            length = response.headers.get("Content-Length")
+            ranges = response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            return (int(length) if length is not None else None), ranges
+    except urllib.error.HTTPError:
+        return None, False
+
+
+def _download_range(
+    url: str, path: Path, start: int, end: Optional[int], timeout: float
+) -> None:
+    """Fill `path` with bytes ``start..end`` (inclusive), resuming what it holds."""
+
+    done = path.stat().st_size if path.exists() else 0
+    expected = None if end is None else end - start + 1
+    if expected is not None and done >= expected:
+        return
+    offset = start + done
+    request = urllib.request.Request(url)
+    if offset or end is not None:
+        request.add_header("Range", f"bytes={offset}-{'' if end is None else end}")
+    try:
+        response = urllib.request.urlopen(request, timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 416 and end is None and done:
+            return  # nothing left past what we already have
+        raise
+    with response:
+        mode = "ab"
+        if (offset or end is not None) and response.status != 206:
+            if start or end is not None:
+                raise OSError(f"{url} ignored the range request for bytes {offset}-")
+            mode = "wb"  # no range support: start over
+        elif response.status == 206:
+            content_range = response.headers.get("Content-Range", "")
+            match = re.match(r"bytes (\d+)-", content_range)
+            if match is None or int(match.group(1)) != offset:
+                raise OSError(
+                    f"{url} answered the request for bytes {offset}- with {content_range!r}"
+                )
+        length = response.headers.get("Content-Length")
+        with open(path, mode) as handle:
+            # Chunked reads return short instead of raising when the server
+            # hangs up early, so compare against Content-Length ourselves.
+            shutil.copyfileobj(response, handle, CHUNK_SIZE)
+            received = handle.tell() - (0 if mode == "wb" else done)
+    if length is not None and received != int(length):
+        raise OSError(f"Incomplete download of {url}: {received} of {length} bytes")
+    size = path.stat().st_size
+    if expected is not None and size != expected:
+        raise OSError(f"Incomplete download of {url}: {size} of {expected} bytes")
+
+
+def _with_retries(call: Callable[[], T], retries: int, backoff: float) -> T:
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except urllib.error.HTTPError as exc:
+            if exc.code < 500 or attempt == retries:
+                raise
+        except (OSError, http.client.HTTPException):  # resets, truncated bodies
+            if attempt == retries:
+                raise
+        time.sleep(backoff * 2**attempt)
+
+
+def _download(
+    url: str, tmp_path: Path, parts: int, retries: int, timeout: float, backoff: float
+) -> None:
+    # Unreachable hosts and resets surface as URLError (an OSError) here too.
+    length, ranges = _with_retries(lambda: _probe(url, timeout), retries, backoff)
+    parts = max(1, min(parts, (length or 0) // MIN_PART_SIZE)) if ranges else 1
+    if parts == 1:
+        _with_retries(
+            lambda: _download_range(url, tmp_path, 0, None, timeout), retries, backoff
+        )
+        return
+
+    bounds = [length * i // parts for i in range(parts + 1)]
+    part_paths = [
+        tmp_path.with_name(f"{tmp_path.name}.{i}of{parts}") for i in range(parts)
+    ]
+
+    def fetch_part(i: int) -> None:
+        _with_retries(
+            lambda: _download_range(
+                url, part_paths[i], bounds[i], bounds[i + 1] - 1, timeout
+            ),
+            retries,
+            backoff,
+        )
+
+    with ThreadPoolExecutor(max_workers=parts) as pool:
+        list(pool.map(fetch_part, range(parts)))
+    with open(tmp_path, "wb") as out:
+        for part_path in part_paths:
+            with open(part_path, "rb") as handle:
+                shutil.copyfileobj(handle, out, CHUNK_SIZE)
+    for part_path in part_paths:
+        part_path.unlink()
+
+
+def fetch(
+    url: str,
+    sha256: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+    parts: int = 4,
+    retries: int = 3,
+    timeout: float = 30.0,
+    backoff: float = 0.5,
+) -> Path:
+    """Return a verified local copy of `url`, downloading it only if needed."""
+
+    target = cache_path(url, sha256, cache_dir)
+    digest_path = target.with_name(f"{target.name}.sha256")
+    with _locked(target.parent):
+        if target.exists():
+            expected = sha256 or (
+                digest_path.read_text().strip() if digest_path.exists() else None
+            )
+            if expected is None or file_sha256(target) == expected:
+                return target
+            target.unlink()  # corrupted or truncated copy: fetch it again
+
+        tmp_path = target.with_name(f"{target.name}.part")
+        _download(url, tmp_path, parts, retries, timeout, backoff)
+        digest = file_sha256(tmp_path)
+        if sha256 is not None and digest != sha256:
+            tmp_path.unlink()
+            raise ChecksumError(f"{url}: expected sha256 {sha256}, got {digest}")
+        digest_path.write_text(digest)
+        os.replace(tmp_path, target)
+    return target
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url")
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Fetch a URL into the cache and print its SHA-256, ready to pin."""
+
+    args = parse_args(argv)
+    path = fetch(args.url, cache_dir=args.cache_dir)
+    print(f"{file_sha256(path)}  {path}")
+
+
+__all__ = [
+    "ChecksumError",
+    "cache_path",
+    "default_cache_dir",
+    "fetch",
+    "file_sha256",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Fixed-size prediction history for the monitoring app."""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class PredictionHistory:
+    """Preallocated columnar ring buffer of recent predictions.
+
+    Every row is written twice, at ``i`` and ``i + capacity``, so the most
+    recent ``n`` rows are always one contiguous slice and `last` can hand
+    out views instead of copies. Appends are O(1) and the running sum of
+    the predictions held in the buffer is kept up to date for `mean`.
+    """
+
+    def __init__(self, features: Sequence[str], capacity: int = 500) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.features = list(features)
+        self.capacity = capacity
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(2 * capacity) for name in self.features
+        }
+        self._timestamps = np.zeros(2 * capacity)
+        self._predictions = np.zeros(2 * capacity)
+        self._head = 0  # slot the next row is written to
+        self._size = 0
+        self._sum = 0.0
+        self.total = 0  # rows appended since creation
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(
+        self,
+        payload: dict[str, float],
+        prediction: float,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        i, j = self._head, self._head + self.capacity
+        if self._size == self.capacity:
+            self._sum -= self._predictions[i]
+        else:
+            self._size += 1
+        for name in self.features:
+            self._columns[name][i] = self._columns[name][j] = payload[name]
+        self._timestamps[i] = self._timestamps[j] = (
+            time.time() if timestamp is None else timestamp
+        )
+        self._predictions[i] = self._predictions[j] = prediction
+        self._sum += prediction
+        self._head = (self._head + 1) % self.capacity
+        self.total += 1
+
+    def extend(
+        self,
+        columns: Dict[str, np.ndarray],
+        predictions: np.ndarray,
+        timestamps: np.ndarray,
+    ) -> None:
+        """Append a whole batch of rows with vectorized writes."""
+
+        predictions = np.asarray(predictions, dtype=np.float64)
+        n = len(predictions)
+        if n == 0:
+            return
+        keep = slice(max(0, n - self.capacity), n)
+        slots = (self._head + np.arange(n)[keep]) % self.capacity
+        mirror = slots + self.capacity
+        for name in self.features:
+            values = np.asarray(columns[name], dtype=np.float64)[keep]
+            self._columns[name][slots] = self._columns[name][mirror] = values
+        self._timestamps[slots] = self._timestamps[mirror] = np.asarray(timestamps)[keep]
+        self._predictions[slots] = self._predictions[mirror] = predictions[keep]
+
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self.capacity, self._size + n)
+        self._sum = float(self._predictions[self._window(None)].sum())
+        self.total += n
+
+    def _window(self, n: Optional[int]) -> slice:
+        n = self._size if n is None else max(0, min(n, self._size))
+        end = self._head + self.capacity
+        return slice(end - n, end)
+
+    def last(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Read-only views of the newest `n` rows (all rows by default)."""
+
+        window = self._window(n)
+        views = {name: column[window] for name, column in self._columns.items()}
+        views["timestamp"] = self._timestamps[window]
+        views["prediction"] = self._predictions[window]
+        for view in views.values():
+            view.flags.writeable = False
+        return views
+
+    def mean(self) -> float:
+        """Mean prediction over the rows currently in the buffer."""
+
+        return self._sum / self._size if self._size else float("nan")
+
+    def quantiles(self, q: Sequence[float], n: Optional[int] = None) -> np.ndarray:
+        """Prediction quantiles over the newest `n` rows."""
+
+        if not self._size:
+            return np.full(len(q), np.nan)
+        return np.quantile(self._predictions[self._window(n)], q)
+
+    def to_frame(self, n: Optional[int] = None) -> pd.DataFrame:
+        """Newest `n` rows as a DataFrame for display."""
+
+        views = self.last(n)
+        timestamps = views.pop("timestamp")
+        frame = pd.DataFrame(views)
+        frame.insert(
+            0,
+            "timestamp",
+            [time.strftime("%H:%M:%S", time.localtime(ts)) for ts in timestamps],
+        )
+        return frame
+
+
+__all__ = [
+    "PredictionHistory",
+]
@@ -0,0 +1,143 @@
+"""Multi-worker serving with one shared copy of the model weights.
+
+Run ``python -m src.launcher --workers 4``. The parent process loads and
+compiles the model once, publishes its weights to shared memory and then
+runs uvicorn with `--workers` processes. Each worker serves `app` below,
+which reads the weights through `shared_weights.SharedModelReader`
+instead of loading the model itself, so adding workers adds no model
+memory and workers never import scikit-learn. The parent polls the model
+file every ``--reload-interval`` seconds and publishes a new generation
+when it changes; workers pick it up on their next batch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .config import Settings, load_config_cached
+from .predict import (
+    CompiledModel,
+    load_default_compact_model,
+    load_default_compiled_model,
+)
+from .service import create_app
+from .shared_weights import SharedModelReader, WeightPublisher
+
+# Passed from the launcher to its workers through the environment.
+SEGMENT_ENV = "AMES_SHARED_WEIGHTS"
+CONFIG_ENV = "AMES_CONFIG"
+
+_reader: Optional[SharedModelReader] = None
+
+
+def load_shared_model(config_path: str | Path) -> tuple[CompiledModel, Settings]:
+    """Worker-side loader: the current model from the launcher's segment."""
+
+    global _reader
+    if _reader is None:
+        name = os.environ.get(SEGMENT_ENV)
+        if not name:
+            raise RuntimeError(f"{SEGMENT_ENV} is not set; start with src.launcher")
+        _reader = SharedModelReader(name)
+    return _reader.current(), load_config_cached(config_path)
+
+
+def _load_parent_model(config_path: str | Path) -> CompiledModel:
+    settings = load_config_cached(config_path)
+    if settings.serving.model_format == "compact":
+        return load_default_compact_model(config_path)[0]
+    return load_default_compiled_model(config_path)[0]
+
+
+class ModelWatcher(threading.Thread):
+    """Republish whenever the registry hands back a different model."""
+
+    def __init__(
+        self, publisher: WeightPublisher, config_path: str | Path, interval: float
+    ) -> None:
+        super().__init__(name="model-watcher", daemon=True)
+        self.publisher = publisher
+        self.config_path = config_path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self.model = _load_parent_model(config_path)
+        publisher.publish(self.model)
+
+    def check(self) -> bool:
+        model = _load_parent_model(self.config_path)
+        if model is self.model:
+            return False
+        self.publisher.publish(model)
+        self.model = model
+        return True
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except (OSError, ValueError):
+                # A half-written or unsupported artifact: keep serving the
+                # current generation and try again on the next tick.
+                continue
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+def serve(
+    config_path: str | Path = "configs/default.yaml",
+    workers: int = 2,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    reload_interval: float = 2.0,
+) -> None:
+    import uvicorn
+
+    publisher = WeightPublisher()
+    watcher = ModelWatcher(publisher, config_path, reload_interval)
+    watcher.start()
+    os.environ[SEGMENT_ENV] = publisher.name
+    os.environ[CONFIG_ENV] = str(config_path)
+    try:
+        uvicorn.run("src.launcher:app", host=host, port=port, workers=workers)
+    finally:
+        watcher.stop()
+        watcher.join()
+        publisher.close()
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="configs/default.yaml")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--reload-interval", type=float, default=2.0, help="seconds")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    serve(args.config, args.workers, args.host, args.port, args.reload_interval)
+
+
+app = create_app(
+    os.environ.get(CONFIG_ENV, "configs/default.yaml"), load=load_shared_model
+)
+
+
+__all__ = [
+    "ModelWatcher",
+    "load_shared_model",
+    "serve",
+    "main",
+    "app",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Incremental least-squares updates for the linear price model.
+
+`OnlineRegressor` keeps the sufficient statistics of ordinary least
+squares: the row count, feature and target means, and the centred
+co-moments X^T X and X^T y. Each labelled batch is folded in with the
+same pairwise update used by `stats.FeatureStatsAccumulator`, at
+O(batch * features^2) to summarise the batch and O(features^2) to merge
+it. Solving for new coefficients costs O(features^3) and never touches
+past data. Published models use the compact JSON format, so any process
+serving `predict.load_default_compact_model` picks them up (in
+`src.service`, ``serving.model_format: compact``); the pickled pipeline
+is left alone. The saved state belongs to the latest training run and is
+rebuilt from the training data once `train.main` stores a new one.
+
+Run ``python -m src.online <labelled.csv|events.jsonl>`` to fold labelled
+listings (a CSV, or an event log whose payloads carry the target) into
+the saved state and republish the model.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .artifact_store import default_store
+from .config import Settings, load_config
+from .event_log import read_events
+from .predict import CompiledModel, load_compact_model, save_compact_model
+from .registry import registry
+from .schema import FeatureSchema
+
+
+class OnlineRegressor:
+    """Streaming OLS over a fixed feature order."""
+
+    def __init__(self, features: Sequence[str], l2: float = 0.0) -> None:
+        self.features = list(features)
+        self.l2 = l2
+        k = len(self.features)
+        self.count = 0
+        self.x_mean = np.zeros(k)
+        self.y_mean = 0.0
+        self.xx = np.zeros((k, k))  # sum of (x - x_mean)(x - x_mean)^T
+        self.xy = np.zeros(k)  # sum of (x - x_mean)(y - y_mean)
+        self.yy = 0.0
+        # Artifact store run the statistics were bootstrapped from.
+        self.run: Optional[str] = None
+
+    def update(self, X: np.ndarray, y: np.ndarray) -> "OnlineRegressor":
+        """Fold a labelled batch (`X` in `features` order) into the statistics."""
+
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.features))
+        y = np.asarray(y, dtype=np.float64).reshape(-1)
+        n = len(y)
+        if n == 0:
+            return self
+
+        batch_x_mean = X.mean(axis=0)
+        batch_y_mean = float(y.mean())
+        Xc = X - batch_x_mean
+        yc = y - batch_y_mean
+
+        total = self.count + n
+        weight = self.count * n / total
+        dx = batch_x_mean - self.x_mean
+        dy = batch_y_mean - self.y_mean
+        self.xx += Xc.T @ Xc + np.outer(dx, dx) * weight
+        self.xy += Xc.T @ yc + dx * dy * weight
+        self.yy += float(yc @ yc) + dy * dy * weight
+        self.x_mean = self.x_mean + dx * (n / total)
+        self.y_mean += dy * (n / total)
+        self.count = total
+        return self
+
+    def update_frame(self, df: pd.DataFrame, target: str) -> "OnlineRegressor":
+        return self.update(df[self.features].to_numpy(dtype=np.float64), df[target].to_numpy())
+
+    def update_records(self, records: Iterable[dict], target: str) -> "OnlineRegressor":
+        """Fold labelled event-log style records (``payload`` holds `target`)."""
+
+        rows = [record["payload"] for record in records if target in record["payload"]]
+        if rows:
+            # Payloads carry the target too, hence allow_extra.
+            schema = FeatureSchema(self.features, allow_extra=True)
+            self.update(schema.pack_rows(rows), [row[target] for row in rows])
+        return self
+
+    @property
+    def scales(self) -> np.ndarray:
+        """Population std of each feature, as `StandardScaler` would store it."""
+
+        if not self.count:
+            return np.ones(len(self.features))
+        std = np.sqrt(np.diag(self.xx) / self.count)
+        return np.where(std > 0, std, 1.0)
+
+    def coefficients(self) -> tuple[np.ndarray, float]:
+        """Raw-feature coefficients and intercept of the current fit."""
+
+        if self.count < 2:
+            raise ValueError("At least two labelled rows are needed to fit")
+        # Solve on the standardized scale for better conditioning.
+        scales = self.scales
+        gram = self.xx / np.outer(scales, scales)
+        rhs = self.xy / scales
+        if self.l2:
+            gram = gram + self.l2 * np.eye(len(self.features))
+        standardized = np.linalg.lstsq(gram, rhs, rcond=None)[0]
+        coef = standardized / scales
+        return coef, self.y_mean - float(self.x_mean @ coef)
+
+    def to_compiled(self) -> CompiledModel:
+        coef, intercept = self.coefficients()
+        return CompiledModel(
+            features=self.features, weights=coef, intercept=intercept, pipeline=None
+        )
+
+    def publish(self, path: Path) -> CompiledModel:
+        """Atomically write the compact model and swap it into the registry."""
+
+        coef, _ = self.coefficients()
+        scales = self.scales
+        save_compact_model(
+            path,
+            self.features,
+            means=self.x_mean,
+            scales=scales,
+            coefficients=coef * scales,
+            intercept=self.y_mean,
+        )
+        model = load_compact_model(path)
+        registry.publish(path, model)
+        return model
+
+    def to_state(self) -> dict:
+        return {
+            "features": self.features,
+            "l2": self.l2,
+            "count": self.count,
+            "x_mean": self.x_mean.tolist(),
+            "y_mean": self.y_mean,
+            "xx": self.xx.tolist(),
+            "xy": self.xy.tolist(),
+            "yy": self.yy,
+            "run": self.run,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "OnlineRegressor":
+        model = cls(state["features"], l2=state.get("l2", 0.0))
+        model.count = int(state["count"])
+        model.x_mean = np.asarray(state["x_mean"], dtype=np.float64)
+        model.y_mean = float(state["y_mean"])
+        model.xx = np.asarray(state["xx"], dtype=np.float64)
+        model.xy = np.asarray(state["xy"], dtype=np.float64)
+        model.yy = float(state["yy"])
+        model.run = state.get("run")
+        return model
+
+
+def state_path(settings: Settings) -> Path:
+    return settings.paths.artifacts / "online_state.json"
+
+
+def load_or_bootstrap(settings: Settings) -> OnlineRegressor:
+    """Saved state for the latest training run, else one pass over its data.
+
+    State saved against an older run is discarded: `train.main` has since
+    replaced the published model, and folding new rows into the old
+    statistics would silently revert it. Rows folded in since that run
+    are dropped unless they were added to the training data.
+    """
+
+    run = default_store(settings).latest()
+    path = state_path(settings)
+    if path.exists():
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state.get("run") == run:
+            return OnlineRegressor.from_state(state)
+
+    from .train import prepare_data
+
+    model = OnlineRegressor(settings.training.features)
+    model.run = run
+    return model.update_frame(prepare_data(settings), settings.training.target)
+
+
+def save_state(model: OnlineRegressor, settings: Settings) -> Path:
+    path = state_path(settings)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    tmp_path.write_text(json.dumps(model.to_state()), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def update_from_file(
+    labelled_path: str | Path,
+    config_path: str | Path = "configs/default.yaml",
+) -> CompiledModel:
+    """Fold `labelled_path` into the online state and publish the model."""
+
+    settings = load_config(config_path)
+    target = settings.training.target
+    model = load_or_bootstrap(settings)
+    labelled_path = Path(labelled_path)
+    if labelled_path.suffix == ".jsonl":
+        model.update_records(read_events(labelled_path), target)
+    else:
+        columns = [*settings.training.features, target]
+        for chunk in pd.read_csv(labelled_path, usecols=columns, chunksize=50_000):
+            model.update_frame(chunk.dropna(), target)
+    save_state(model, settings)
+    return model.publish(settings.paths.models / "linear_regression.json")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0],
+        epilog="The model is republished as models/linear_regression.json; "
+        "src.service only serves it with serving.model_format: compact.",
+    )
+    parser.add_argument("labelled", type=Path, help="labelled CSV or .jsonl event log")
+    parser.add_argument("--config", default="configs/default.yaml")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    update_from_file(args.labelled, args.config)
+
+
+__all__ = [
+    "OnlineRegressor",
+    "state_path",
+    "load_or_bootstrap",
+    "save_state",
+    "update_from_file",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,213 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Optional, Sequence
 
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.pipeline import Pipeline
 
-from .config import Settings, load_config
+from .artifact_store import default_store
+from .config import Settings, load_config_cached
+from .registry import file_signature, registry
+from .schema import FeatureSchema
+
+if TYPE_CHECKING:
+    from .cache import PredictionCache
+
+    # sklearn is only imported when a pickled pipeline is actually used, so
+    # compact models can be served without it.
+    from sklearn.pipeline import Pipeline
+
+COMPACT_FORMAT = "ames-linear/1"
+
+
+@dataclass
+class CompiledModel:
+    """A pipeline folded into one weight vector for fast scoring.
+
+    `weights` and `intercept` are ``None`` when the pipeline could not be
+    folded; scoring then falls back to the original sklearn pipeline.
+    `version` identifies the artifact it came from, e.g. for cache keys.
+    """
+
+    features: list[str]
+    weights: Optional[np.ndarray]
+    intercept: float
+    pipeline: Optional[Pipeline]
+    version: Optional[str] = None
+
+    @property
+    def is_folded(self) -> bool:
+        return self.weights is not None
+
+    @cached_property
+    def schema(self) -> FeatureSchema:
+        return FeatureSchema(self.features)
+
+    def predict_array(self, X: np.ndarray) -> np.ndarray:
+        """Score a 2D array whose columns follow `features` order."""
+
+        X = self.schema.check_matrix(X)
+        if self.weights is None:
+            return self._predict_pipeline(X)
+        return X @ self.weights + self.intercept
+
+    def predict_many(self, rows: Iterable[Mapping[str, float]]) -> np.ndarray:
+        """Score a sequence of feature dicts, validated against `schema`."""
+
+        X = self.schema.pack_rows(rows)
+        if self.weights is None:
+            return self._predict_pipeline(X)
+        return X @ self.weights + self.intercept
+
+    def predict_columns(self, data: Any) -> np.ndarray:
+        """Score columnar input: a mapping of arrays, a DataFrame or an Arrow table.
+
+        A folded model accumulates ``weight * column`` per feature, so the
+        input columns are read in place and no row matrix is built.
+        """
+
+        columns = self.schema.columns(data)
+        if self.weights is None:
+            return self._predict_pipeline(np.column_stack(columns))
+        out = np.full(len(columns[0]) if columns else 0, self.intercept)
+        for weight, column in zip(self.weights, columns):
+            out += weight * column
+        return out
+
+    def _predict_pipeline(self, X: np.ndarray) -> np.ndarray:
+        df = pd.DataFrame(X, columns=self.features, copy=False)
+        return np.asarray(self.pipeline.predict(df), dtype=np.float64)
+
+
+def _fold_linear(model: Pipeline) -> Optional[tuple[np.ndarray, float]]:
+    """Fold StandardScaler steps into a linear regressor's coefficients."""
+
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    steps = [step for _, step in model.steps] if isinstance(model, Pipeline) else [model]
+    *transforms, regressor = steps
+
+    coef = getattr(regressor, "coef_", None)
+    intercept = getattr(regressor, "intercept_", None)
+    if coef is None or intercept is None:
+        return None
+    if np.ndim(coef) != 1 or np.ndim(intercept) != 0:
+        return None
+
+    weights = np.asarray(coef, dtype=np.float64).copy()
+    bias = float(intercept)
+    # Walk backwards: each scaler maps x -> (x - mean) / scale, so the
+    # weights absorb 1 / scale and the bias absorbs -mean . weights.
+    for step in reversed(transforms):
+        if step is None or step == "passthrough":
+            continue
+        if type(step) is not StandardScaler:
+            return None
+        # mean_ is set even with with_mean=False, so trust the flags.
+        if step.with_std and step.scale_ is not None:
+            weights = weights / step.scale_
+        if step.with_mean and step.mean_ is not None:
+            bias -= float(np.dot(step.mean_, weights))
+    return np.ascontiguousarray(weights), bias
+
+
+def compile_model(
+    model: Pipeline,
+    features: Optional[Sequence[str]] = None,
+    version: Optional[str] = None,
+) -> CompiledModel:
+    """Precompute a single weight vector for `model` in `features` order.
+
+    When `features` is omitted the column order seen at fit time is used.
+    """
+
+    if features is None:
+        names = getattr(model, "feature_names_in_", None)
+        if names is None:
+            raise ValueError("features must be given for models fit without names")
+        features = list(names)
+    features = list(features)
+
+    folded = _fold_linear(model)
+    fitted_names = getattr(model, "feature_names_in_", None)
+    if folded is not None and fitted_names is not None and list(fitted_names) != features:
+        # Reorder weights so they line up with the requested feature order.
+        index = {name: i for i, name in enumerate(fitted_names)}
+        if set(index) != set(features):
+            raise ValueError(
+                f"Model was fit on {list(fitted_names)}, cannot compile for {features}"
+            )
+        weights, bias = folded
+        folded = (weights[[index[name] for name in features]], bias)
+
+    if folded is None:
+        return CompiledModel(
+            features=features, weights=None, intercept=0.0, pipeline=model, version=version
+        )
+    weights, bias = folded
+    return CompiledModel(
+        features=features, weights=weights, intercept=bias, pipeline=model, version=version
+    )
+
+
+def save_compact_model(
+    path: Path,
+    features: Sequence[str],
+    means: Sequence[float],
+    scales: Sequence[float],
+    coefficients: Sequence[float],
+    intercept: float,
+) -> Path:
+    """Atomically write the compact JSON model format."""
+
+    spec = {
+        "format": COMPACT_FORMAT,
+        "features": list(features),
+        "means": np.asarray(means, dtype=float).tolist(),
+        "scales": np.asarray(scales, dtype=float).tolist(),
+        "coefficients": np.asarray(coefficients, dtype=float).tolist(),
+        "intercept": float(intercept),
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    tmp_path.write_text(json.dumps(spec, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_compact_model(path: Path) -> CompiledModel:
+    """Load a model written by `train.export_compact_model`.
+
+    Only NumPy is needed: the scaler and regressor parameters are folded
+    into one weight vector here, exactly as `compile_model` does.
+    """
+
+    text = Path(path).read_text(encoding="utf-8")
+    spec = json.loads(text)
+    if spec.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"Unsupported model format: {spec.get('format')!r}")
+    means = np.asarray(spec["means"], dtype=np.float64)
+    scales = np.asarray(spec["scales"], dtype=np.float64)
+    weights = np.asarray(spec["coefficients"], dtype=np.float64) / scales
+    intercept = float(spec["intercept"]) - float(np.dot(means, weights))
+    return CompiledModel(
+        features=list(spec["features"]),
+        weights=np.ascontiguousarray(weights),
+        intercept=intercept,
+        pipeline=None,
+        version=hashlib.sha256(text.encode()).hexdigest()[:16],
+    )
 
 
 def load_model(model_path: Path) -> Pipeline:
@@ -19,34 +217,227 @@ def load_model(model_path: Path) -> Pipeline:
     return joblib.load(model_path)
 
 
-def predict_price(model: Pipeline, features: dict[str, float]) -> float:
+def _pipeline_frame(model: Pipeline, rows: Sequence[Mapping[str, float]]) -> pd.DataFrame:
+    """Rows as a frame in the order the pipeline was fit on, validated first."""
+
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        return pd.DataFrame(list(rows))
+    schema = FeatureSchema(list(names))
+    return pd.DataFrame(schema.pack_rows(rows), columns=schema.features, copy=False)
+
+
+def predict_price(
+    model: Pipeline | CompiledModel,
+    features: dict[str, float],
+    cache: Optional[PredictionCache] = None,
+) -> float:
     """Predict a single house price given feature values."""
 
-    df = pd.DataFrame([features])
-    prediction = model.predict(df)
+    if cache is not None:
+        key = cache.key(cache.version_for(model), features)
+        value = cache.get(key)
+        if value is None:
+            value = predict_price(model, features)
+            cache.put(key, value)
+        return value
+    if isinstance(model, CompiledModel):
+        return float(model.predict_many([features])[0])
+    prediction = model.predict(_pipeline_frame(model, [features]))
     return float(prediction[0])
 
 
-def batch_predict(model: Pipeline, rows: Iterable[dict[str, float]]) -> list[float]:
-    """Predict prices for multiple houses."""
+def batch_predict(
+    model: Pipeline | CompiledModel,
+    rows: Iterable[dict[str, float]],
+    cache: Optional[PredictionCache] = None,
+) -> list[float]:
+    """Predict prices for multiple houses.
+
+    With a `cache`, only rows whose key is not cached are scored, in one
+    call and once per distinct key.
+    """
 
-    df = pd.DataFrame(rows)
-    predictions = model.predict(df)
+    if cache is not None:
+        rows = list(rows)
+        version = cache.version_for(model)
+        keys = [cache.key(version, row) for row in rows]
+        results = [cache.get(key) for key in keys]
+        pending: dict[tuple, int] = {}
+        for i, (key, value) in enumerate(zip(keys, results)):
+            if value is None:
+                pending.setdefault(key, i)
+        if pending:
+            scored = batch_predict(model, [rows[i] for i in pending.values()])
+            fresh = dict(zip(pending, scored))
+            for key, value in fresh.items():
+                cache.put(key, value)
+            results = [
+                fresh[key] if value is None else value for key, value in zip(keys, results)
+            ]
+        return results
+    if isinstance(model, CompiledModel):
+        return model.predict_many(rows).tolist()
+    predictions = model.predict(_pipeline_frame(model, list(rows)))
     return np.asarray(predictions, dtype=float).tolist()
 
 
+def predict_array(model: CompiledModel, X: np.ndarray) -> np.ndarray:
+    """Score a float matrix in `model.features` column order."""
+
+    return model.predict_array(X)
+
+
+def predict_many(model: CompiledModel, rows: Iterable[dict[str, float]]) -> np.ndarray:
+    """Score feature dicts through the compiled path."""
+
+    return model.predict_many(rows)
+
+
+def predict_columns(model: CompiledModel, data: Any) -> np.ndarray:
+    """Score NumPy/pandas/Arrow columnar input without assembling rows."""
+
+    return model.predict_columns(data)
+
+
+def default_model_path(settings: Settings, version: Optional[str] = None) -> Path:
+    """Path of `version`, else the pinned store version, else the latest model."""
+
+    store = default_store(settings)
+    version = version or store.pinned()
+    if version is not None:
+        if not store.has(version):
+            raise KeyError(f"Unknown model version: {version}")
+        return store.model_path(version)
+    return settings.paths.models / "linear_regression.pkl"
+
+
 def load_default_model(
     config_path: str | Path = "configs/default.yaml",
+    version: Optional[str] = None,
 ) -> tuple[Pipeline, Settings]:
-    settings = load_config(config_path)
-    model_path = settings.paths.models / "linear_regression.pkl"
-    model = load_model(model_path)
+    """Return the default model through the process-wide registry.
+
+    The config and model are only reloaded when their files change, so
+    repeated calls (e.g. on every Streamlit rerun) are cheap.
+    """
+
+    settings = load_config_cached(config_path)
+    model_path = default_model_path(settings, version)
+    model = registry.get(model_path)
     return model, settings
 
 
+def load_default_compiled_model(
+    config_path: str | Path = "configs/default.yaml",
+    version: Optional[str] = None,
+) -> tuple[CompiledModel, Settings]:
+    settings = load_config_cached(config_path)
+    features = settings.training.features
+    model_path = default_model_path(settings, version)
+
+    def build(model: Pipeline) -> CompiledModel:
+        mtime_ns, size = file_signature(model_path)
+        return compile_model(model, features, version=f"{model_path.name}@{mtime_ns}-{size}")
+
+    compiled = registry.get_derived(model_path, f"compiled:{','.join(features)}", build)
+    return compiled, settings
+
+
+def load_default_compact_model(
+    config_path: str | Path = "configs/default.yaml",
+) -> tuple[CompiledModel, Settings]:
+    """Serve ``models/linear_regression.json`` without importing sklearn."""
+
+    settings = load_config_cached(config_path)
+    path = settings.paths.models / "linear_regression.json"
+    return registry.get(path, loader=load_compact_model), settings
+
+
+class CurrentModel:
+    """The default model, re-resolved only when a file behind it changes.
+
+    A full resolve (config, store manifest, registry lookup) costs tens of
+    microseconds, more than scoring a small batch. `get` instead stats the
+    config, the store manifest and the top-level model files, and resolves
+    again only when one of them changed, so retrained, pinned or
+    republished models are still picked up on the next call.
+    """
+
+    def __init__(
+        self,
+        config_path: str | Path = "configs/default.yaml",
+        resolve: Callable[[str | Path], tuple[Any, Settings]] = load_default_compiled_model,
+    ) -> None:
+        self.config_path = config_path
+        self._resolve = resolve
+        self._lock = threading.Lock()
+        self._paths: list[str] = []
+        self._seen: Optional[tuple] = None
+        self.refresh()
+
+    def _signature(self) -> tuple:
+        signature = []
+        for path in self._paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                signature.append(None)
+            else:
+                signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def refresh(self) -> Any:
+        """Resolve the model now, whether or not anything changed."""
+
+        with self._lock:
+            settings = load_config_cached(self.config_path)
+            models = settings.paths.models
+            self._paths = [
+                os.fspath(path)
+                for path in (
+                    Path(self.config_path),
+                    default_store(settings).manifest_path,
+                    models / "linear_regression.pkl",
+                    models / "linear_regression.json",
+                )
+            ]
+            # Signature first: a change during the resolve is seen next time.
+            seen = self._signature()
+            self.model, self.settings = self._resolve(self.config_path)
+            self._seen = seen
+            return self.model
+
+    def get(self) -> Any:
+        if self._signature() != self._seen:
+            return self.refresh()
+        return self.model
+
+
+def preload_default_model(config_path: str | Path = "configs/default.yaml") -> None:
+    """Warm-up hook: load, compile and exercise the default model once."""
+
+    compiled, settings = load_default_compiled_model(config_path)
+    registry.warm_up(default_model_path(settings), settings.training.features)
+    compiled.predict_array(np.zeros((1, len(compiled.features))))
+
+
 __all__ = [
+    "CompiledModel",
+    "compile_model",
+    "COMPACT_FORMAT",
+    "save_compact_model",
+    "load_compact_model",
     "load_model",
+    "default_model_path",
     "predict_price",
     "batch_predict",
+    "predict_array",
+    "predict_many",
+    "predict_columns",
     "load_default_model",
+    "load_default_compiled_model",
+    "load_default_compact_model",
+    "CurrentModel",
+    "preload_default_model",
 ]
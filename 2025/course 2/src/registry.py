@@ -0,0 +1,116 @@
+"""Process-wide cache of loaded model artifacts."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class _Entry:
+    signature: tuple[int, int]
+    model: Any
+    derived: dict = field(default_factory=dict)
+
+
+def file_signature(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ModelRegistry:
+    """Load each artifact once and reuse it until the file changes.
+
+    Entries are keyed by resolved path and validated against the file's
+    mtime and size on every lookup, which costs one ``stat`` call. Arrays
+    inside the pickle are memory-mapped read-only (``mmap_mode="r"``), so
+    large estimators are paged in lazily and shared between processes
+    through the page cache. Artifacts must therefore be replaced atomically
+    (write elsewhere, then rename) rather than rewritten in place.
+    """
+
+    def __init__(self, mmap_mode: Optional[str] = "r") -> None:
+        self.mmap_mode = mmap_mode
+        self._entries: dict[Path, _Entry] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _entry(self, path: Path, loader: Optional[Callable[[Path], Any]] = None) -> _Entry:
+        key = Path(path).resolve()
+        signature = file_signature(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            return entry
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.signature != signature:
+                if loader is not None:
+                    model = loader(key)
+                else:
+                    model = joblib.load(key, mmap_mode=self.mmap_mode)
+                self.loads += 1
+                entry = _Entry(signature=signature, model=model)
+                self._entries[key] = entry
+        return entry
+
+    def get(self, path: Path, loader: Optional[Callable[[Path], Any]] = None) -> Any:
+        """The model stored at `path`, reloaded only if the file changed.
+
+        `loader` replaces ``joblib.load`` for non-pickle formats.
+        """
+
+        return self._entry(path, loader).model
+
+    def get_derived(self, path: Path, name: str, build: Callable[[Any], Any]) -> Any:
+        """Cache `build(model)` (e.g. a compiled model) alongside the artifact."""
+
+        entry = self._entry(path)
+        if name not in entry.derived:
+            entry.derived[name] = build(entry.model)
+        return entry.derived[name]
+
+    def publish(self, path: Path, model: Any) -> None:
+        """Register `model` as the current contents of `path`.
+
+        Call after the file has been atomically replaced; readers in this
+        process switch to `model` without re-reading it, other processes
+        reload it on their next lookup.
+        """
+
+        key = Path(path).resolve()
+        entry = _Entry(signature=file_signature(key), model=model)
+        with self._lock:
+            self._entries[key] = entry
+
+    def preload(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            self.get(path)
+
+    def warm_up(self, path: Path, features: Sequence[str]) -> None:
+        """Load `path` and run one prediction so first requests are fast."""
+
+        sample = pd.DataFrame(np.zeros((1, len(features))), columns=list(features))
+        self.get(path).predict(sample)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(path).resolve(), None)
+
+
+registry = ModelRegistry()
+
+
+__all__ = [
+    "ModelRegistry",
+    "file_signature",
+    "registry",
+]
@@ -0,0 +1,172 @@
+"""Validated packing of request payloads into model-ordered float matrices."""
+
+from __future__ import annotations
+
+from operator import itemgetter
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+class SchemaError(ValueError):
+    """A payload does not match the model's feature schema."""
+
+
+class FeatureSchema:
+    """The model's feature order, compiled once and applied to every request.
+
+    `pack_rows` fills a preallocated ``(n, k)`` float64 matrix from dicts
+    in `features` order; `columns` pulls the feature columns out of a
+    mapping of arrays, a pandas frame or an Arrow table/record batch,
+    without copying float64 data. Missing, extra (unless `allow_extra`)
+    and non-finite values raise `SchemaError` naming the offending
+    features and row.
+    """
+
+    def __init__(self, features: Sequence[str], allow_extra: bool = False) -> None:
+        self.features = list(features)
+        if len(set(self.features)) != len(self.features):
+            raise SchemaError(f"Duplicate features in schema: {self.features}")
+        self.allow_extra = allow_extra
+        self._names = frozenset(self.features)
+        getter = itemgetter(*self.features)
+        # itemgetter returns a bare value, not a tuple, for a single name.
+        self._get = getter if len(self.features) > 1 else (lambda row: (getter(row),))
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def _row_error(self, row: Mapping[str, Any], index: int) -> SchemaError:
+        missing = [name for name in self.features if name not in row]
+        if missing:
+            return SchemaError(f"Row {index}: missing features {missing}")
+        extra = sorted(set(row) - self._names)
+        if extra and not self.allow_extra:
+            return SchemaError(f"Row {index}: unexpected features {extra}")
+        bad = [name for name in self.features if not _is_number(row[name])]
+        return SchemaError(f"Row {index}: non-numeric values for {bad}")
+
+    def check_row(self, row: Mapping[str, Any], index: int = 0) -> None:
+        if len(row) == len(self.features) and self._names.issuperset(row):
+            return
+        if self.allow_extra and self._names.issubset(row.keys()):
+            return
+        raise self._row_error(row, index)
+
+    def pack_rows(
+        self, rows: Iterable[Mapping[str, Any]], out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Pack dict rows into `out` (allocated if omitted) and return it."""
+
+        if not isinstance(rows, Sequence):
+            rows = list(rows)
+        if out is None:
+            out = np.empty((len(rows), len(self.features)), dtype=np.float64)
+        elif out.shape != (len(rows), len(self.features)) or out.dtype != np.float64:
+            raise SchemaError(
+                f"out must be float64 of shape ({len(rows)}, {len(self.features)})"
+            )
+        get = self._get
+        for i, row in enumerate(rows):
+            self.check_row(row, i)
+            try:
+                out[i] = get(row)
+            except (TypeError, ValueError):
+                raise self._row_error(row, i) from None
+        self._check_finite(out)
+        return out
+
+    def columns(self, data: Any) -> list[np.ndarray]:
+        """The feature columns of `data` as 1D float64 arrays, in order.
+
+        Columns that already are contiguous float64 are returned as views.
+        """
+
+        names = _column_names(data)
+        missing = [name for name in self.features if name not in names]
+        if missing:
+            raise SchemaError(f"Missing feature columns {missing}")
+        extra = sorted(set(names) - self._names)
+        if extra and not self.allow_extra:
+            raise SchemaError(f"Unexpected feature columns {extra}")
+
+        columns = [_column_array(data, name) for name in self.features]
+        lengths = {len(column) for column in columns}
+        if len(lengths) > 1:
+            raise SchemaError(f"Feature columns have different lengths: {sorted(lengths)}")
+        for name, column in zip(self.features, columns):
+            if not np.isfinite(column).all():
+                raise SchemaError(f"Non-finite values in column {name!r}")
+        return columns
+
+    def pack_columns(self, data: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Columnar input as an ``(n, k)`` matrix (one copy into `out`)."""
+
+        columns = self.columns(data)
+        n = len(columns[0]) if columns else 0
+        if out is None:
+            out = np.empty((n, len(self.features)), dtype=np.float64)
+        for j, column in enumerate(columns):
+            out[:, j] = column
+        return out
+
+    def check_matrix(self, X: Any) -> np.ndarray:
+        """A 2D array already in `features` order, as float64 without copying if possible."""
+
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != len(self.features):
+            raise SchemaError(
+                f"Expected an array of shape (n, {len(self.features)}), got {X.shape}"
+            )
+        self._check_finite(X)
+        return X
+
+    def _check_finite(self, X: np.ndarray) -> None:
+        if not np.isfinite(X).all():
+            rows, cols = np.nonzero(~np.isfinite(X))
+            bad = sorted({self.features[j] for j in cols})
+            raise SchemaError(f"Row {rows[0]}: non-finite values for {bad}")
+
+
+def _is_number(value: Any) -> bool:
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _column_names(data: Any) -> list[str]:
+    if isinstance(data, np.ndarray) and data.dtype.names is not None:
+        return list(data.dtype.names)
+    if hasattr(data, "column_names"):  # pyarrow Table / RecordBatch
+        return list(data.column_names)
+    if hasattr(data, "columns"):  # pandas DataFrame
+        return [str(name) for name in data.columns]
+    if isinstance(data, Mapping):
+        return list(data)
+    raise SchemaError(f"Unsupported columnar input: {type(data).__name__}")
+
+
+def _column_array(data: Any, name: str) -> np.ndarray:
+    if hasattr(data, "column_names"):
+        column = data.column(name)
+        if column.null_count:
+            raise SchemaError(f"Null values in column {name!r}")
+        if hasattr(column, "chunks"):  # ChunkedArray: only one chunk can be a view
+            column = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+        values = column.to_numpy(zero_copy_only=False)
+    elif hasattr(data, "columns") and not isinstance(data, Mapping):
+        values = data[name].to_numpy()
+    else:
+        values = data[name]
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 1:
+        raise SchemaError(f"Column {name!r} must be one-dimensional, got shape {values.shape}")
+    return values
+
+
+__all__ = [
+    "FeatureSchema",
+    "SchemaError",
+]
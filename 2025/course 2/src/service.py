@@ -0,0 +1,212 @@
+"""FastAPI prediction service that coalesces concurrent requests.
+
+Run with ``uvicorn src.service:app``. Requests arriving within
+``serving.max_wait_ms`` of each other are scored together in one
+vectorized call, up to ``serving.max_batch_size`` rows per call. With
+``cache.enabled``, repeated payloads are answered from a
+`cache.PredictionCache` without reaching the batcher.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from .cache import cache_from_settings
+from .config import Settings, load_config_cached
+from .predict import (
+    CompiledModel,
+    CurrentModel,
+    load_default_compact_model,
+    load_default_compiled_model,
+)
+from .schema import SchemaError
+
+
+class HouseFeatures(BaseModel):
+    features: dict[str, float]
+
+
+class MicroBatcher:
+    """Collect single rows into batches and score them with one call."""
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Rows taken off the queue but not answered yet.
+        self._batch: list[tuple[np.ndarray, asyncio.Future]] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop scoring; requests still waiting fail instead of hanging."""
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        pending = self._batch
+        self._batch = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._queue = None
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher stopped"))
+
+    async def submit(self, row: np.ndarray) -> float:
+        """Queue one feature row and wait for its prediction."""
+
+        if self._queue is None:
+            raise RuntimeError("MicroBatcher.start() has not been called")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _collect(self) -> list[tuple[np.ndarray, asyncio.Future]]:
+        assert self._queue is not None
+        batch = self._batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                # Inside the try: a malformed row must fail its batch, not
+                # kill the loop and leave every later request waiting.
+                X = np.stack([row for row, _ in batch])
+                predictions = await asyncio.to_thread(self.predict_fn, X)
+            except Exception as exc:  # fan the failure out to every caller
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                self._batch = []
+                continue
+            for (_, future), value in zip(batch, predictions):
+                if not future.done():
+                    future.set_result(float(value))
+            self._batch = []
+
+
+def create_app(
+    config_path: str | Path = "configs/default.yaml",
+    load: Optional[Callable[[str | Path], tuple[CompiledModel, Settings]]] = None,
+) -> FastAPI:
+    """Build the service; the model is loaded when the app starts.
+
+    By default the model comes from ``serving.model_format`` through a
+    `predict.CurrentModel`, which re-resolves it only when its files
+    change. `load` overrides this and is called once per batch (and per
+    cached lookup), so it must be cheap and return a cached model until
+    the underlying artifact changes.
+    """
+
+    state: dict = {}
+
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI):
+        settings = load_config_cached(config_path)
+        if load is not None:
+
+            def current_model() -> CompiledModel:
+                return load(config_path)[0]
+
+            current_model()  # fail at startup, not on the first request
+        else:
+            resolve = load_default_compiled_model
+            if settings.serving.model_format == "compact":
+                resolve = load_default_compact_model
+            current_model = CurrentModel(config_path, resolve).get
+
+        def predict_fn(X: np.ndarray) -> np.ndarray:
+            # A few stat calls, so a republished model file is served from
+            # the next batch on without a restart.
+            return current_model().predict_array(X)
+
+        batcher = MicroBatcher(
+            predict_fn,
+            max_batch_size=settings.serving.max_batch_size,
+            max_wait_ms=settings.serving.max_wait_ms,
+        )
+        await batcher.start()
+        state.update(
+            batcher=batcher,
+            cache=cache_from_settings(settings),
+            current_model=current_model,
+        )
+        try:
+            yield
+        finally:
+            await batcher.stop()
+            state.clear()
+
+    app = FastAPI(title="Ames Housing Price API", lifespan=lifespan)
+
+    @app.get("/health")
+    async def health() -> dict:
+        if not state:
+            return {"status": "starting"}
+        cache = state["cache"]
+        return {"status": "ok", "cache": cache.stats() if cache is not None else None}
+
+    @app.post("/predict")
+    async def predict(house: HouseFeatures) -> dict:
+        model = state["current_model"]()
+        cache = state["cache"]
+        try:
+            row = model.schema.pack_rows([house.features])[0]
+            if cache is not None:
+                key = cache.key(cache.version_for(model), house.features)
+        except SchemaError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from None
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return {"prediction": cached}
+        prediction = await state["batcher"].submit(row)
+        if cache is not None:
+            cache.put(key, prediction)
+        return {"prediction": prediction}
+
+    return app
+
+
+app = create_app()
+
+
+__all__ = [
+    "HouseFeatures",
+    "MicroBatcher",
+    "create_app",
+    "app",
+]
@@ -0,0 +1,223 @@
+"""Compiled model weights published once and mapped by every worker.
+
+A publisher owns a small control segment holding the current generation
+number and one data segment per generation::
+
+    <name>      int64 generation
+    <name>_<g>  uint64 header length | JSON header | pad | float64 weights
+
+Readers map the data segment and wrap the weights in a read-only NumPy
+view, so N workers share one copy and never unpickle anything. A reload
+writes generation ``g + 1`` in full before bumping the counter; readers
+compare the counter on every lookup (one 8-byte read) and switch to the
+new segment, and the publisher unlinks the old one, which stays mapped
+for readers still holding it.
+"""
+
+from __future__ import annotations
+
+import json
+import secrets
+import sys
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+from .predict import CompiledModel
+
+_HEADER_LEN = np.dtype(np.uint64).itemsize
+# Generations a reader will chase while the publisher races ahead of it.
+_MAX_ATTACH_ATTEMPTS = 8
+
+
+def segment_name(name: str, generation: int) -> str:
+    return f"{name}_{generation}"
+
+
+def _attach(name: str) -> SharedMemory:
+    # Readers must not let their resource tracker unlink the publisher's
+    # segments when they exit.
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    segment = SharedMemory(name=name)
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+def _pack(model: CompiledModel, generation: int) -> tuple[bytes, np.ndarray]:
+    header = json.dumps(
+        {
+            "generation": generation,
+            "features": model.features,
+            "intercept": model.intercept,
+            "version": model.version,
+        }
+    ).encode()
+    return header, np.ascontiguousarray(model.weights, dtype=np.float64)
+
+
+def _weights_offset(header_len: int) -> int:
+    offset = _HEADER_LEN + header_len
+    return offset + (-offset % 8)
+
+
+def _unpack(buf: memoryview) -> tuple[dict, np.ndarray]:
+    header_len = int(np.frombuffer(buf, dtype=np.uint64, count=1)[0])
+    header = json.loads(bytes(buf[_HEADER_LEN : _HEADER_LEN + header_len]))
+    # frombuffer (unlike ndarray(buffer=...)) holds a buffer export, so the
+    # segment refuses to close while this view is alive.
+    weights = np.frombuffer(
+        buf,
+        dtype=np.float64,
+        count=len(header["features"]),
+        offset=_weights_offset(header_len),
+    )
+    weights.flags.writeable = False
+    return header, weights
+
+
+class WeightPublisher:
+    """Owns the shared segments; lives in the parent (serving) process."""
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self._control = SharedMemory(
+            name=name or f"ames_{secrets.token_hex(4)}", create=True, size=8
+        )
+        self._generation = np.frombuffer(self._control.buf, dtype=np.int64, count=1)
+        self._generation[0] = 0
+        self._segment: Optional[SharedMemory] = None
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._control.name
+
+    @property
+    def generation(self) -> int:
+        return int(self._generation[0])
+
+    def publish(self, model: CompiledModel) -> int:
+        """Copy `model` into a new segment and make it current."""
+
+        if not model.is_folded:
+            raise ValueError("Only folded linear models can be shared; see compile_model")
+        with self._lock:
+            generation = self.generation + 1
+            header, weights = _pack(model, generation)
+            offset = _weights_offset(len(header))
+            segment = SharedMemory(
+                name=segment_name(self.name, generation),
+                create=True,
+                size=offset + weights.nbytes,
+            )
+            np.ndarray((1,), dtype=np.uint64, buffer=segment.buf)[0] = len(header)
+            segment.buf[_HEADER_LEN : _HEADER_LEN + len(header)] = header
+            segment.buf[offset : offset + weights.nbytes] = weights.tobytes()
+
+            self._generation[0] = generation  # readers switch from here on
+            previous, self._segment = self._segment, segment
+            if previous is not None:
+                previous.close()
+                previous.unlink()
+            return generation
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in (self._segment, self._control):
+                if segment is None:
+                    continue
+                if segment is self._control:
+                    del self._generation
+                segment.close()
+                segment.unlink()
+            self._segment = None
+
+
+class SharedModelReader:
+    """Worker-side view of the published model, following reloads."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._control = _attach(name)
+        self._generation = np.frombuffer(self._control.buf, dtype=np.int64, count=1)
+        self._generation.flags.writeable = False
+        self._lock = threading.Lock()
+        self._loaded = -1
+        # Advertised generation whose segment was already gone.
+        self._missing = -1
+        self._model: Optional[CompiledModel] = None
+        self._segments: list[SharedMemory] = []
+
+    @property
+    def generation(self) -> int:
+        return int(self._generation[0])
+
+    def current(self) -> CompiledModel:
+        """The model for the latest published generation.
+
+        If the advertised segment is gone and the counter does not move on
+        (the publisher died mid-reload), the last mapped model keeps being
+        served; with none mapped yet this raises `RuntimeError`.
+        """
+
+        if self.generation not in (self._loaded, self._missing):
+            with self._lock:
+                for _ in range(_MAX_ATTACH_ATTEMPTS):
+                    generation = self.generation
+                    if generation in (self._loaded, self._missing):
+                        break
+                    if not self._load(generation) and self.generation == generation:
+                        self._missing = generation
+        if self._model is None:
+            raise RuntimeError(
+                f"No segment for generation {self.generation} of {self.name}"
+            )
+        return self._model
+
+    def _load(self, generation: int) -> bool:
+        if generation == 0:
+            raise RuntimeError(f"Nothing has been published to {self.name} yet")
+        try:
+            segment = _attach(segment_name(self.name, generation))
+        except FileNotFoundError:
+            return False  # superseded and unlinked already
+        header, weights = _unpack(segment.buf)
+        self._model = CompiledModel(
+            features=header["features"],
+            weights=weights,
+            intercept=header["intercept"],
+            pipeline=None,
+            version=header["version"],
+        )
+        self._loaded = generation
+        self._release_old()
+        self._segments.append(segment)
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._model = None
+            self._release_old()
+            del self._generation
+            self._control.close()
+
+    def _release_old(self) -> None:
+        # A segment can only be closed once no array views into it remain,
+        # i.e. after in-flight requests have dropped the old model.
+        kept = []
+        for segment in self._segments:
+            try:
+                segment.close()
+            except BufferError:
+                kept.append(segment)
+        self._segments = kept
+
+
+__all__ = [
+    "WeightPublisher",
+    "SharedModelReader",
+    "segment_name",
+]
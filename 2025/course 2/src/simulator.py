@@ -7,7 +7,9 @@ import random
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Generator, Iterable
+from typing import Dict, Generator, Iterable, Iterator
+
+import numpy as np
 
 
 @dataclass
@@ -16,6 +18,33 @@ class HouseEvent:
     created_at: float
 
 
+@dataclass
+class EventBatch:
+    """Columnar batch of simulated listings: one array per feature."""
+
+    columns: Dict[str, np.ndarray]
+    created_at: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.created_at)
+
+    def __iter__(self) -> Iterator[HouseEvent]:
+        return self.events()
+
+    def to_matrix(self, features: Iterable[str]) -> np.ndarray:
+        """Stack the requested columns into an (n, k) float64 matrix."""
+
+        return np.column_stack([self.columns[name] for name in features])
+
+    def events(self) -> Iterator[HouseEvent]:
+        """Lazily build `HouseEvent` objects, one row at a time."""
+
+        names = list(self.columns)
+        for i in range(len(self)):
+            payload = {name: float(self.columns[name][i]) for name in names}
+            yield HouseEvent(payload=payload, created_at=float(self.created_at[i]))
+
+
 def load_feature_stats(stats_path: Path) -> dict:
     return json.loads(stats_path.read_text(encoding="utf-8"))
 
@@ -38,6 +67,44 @@ def generate_event(stats: dict) -> HouseEvent:
     return HouseEvent(payload=payload, created_at=timestamp)
 
 
+def _feature_items(stats: dict) -> list[tuple[str, dict]]:
+    return [
+        (feature, values)
+        for feature, values in stats.items()
+        if not (feature.startswith("target") or feature == "test_size")
+    ]
+
+
+def generate_batch(
+    stats: dict,
+    n: int,
+    rng: np.random.Generator | int | None = None,
+) -> EventBatch:
+    """Draw `n` events at once, clipped to each feature's min/max.
+
+    Pass a seed or a `numpy.random.Generator` for reproducible batches.
+    `Central Air` is rounded to 0/1.
+    """
+
+    rng = np.random.default_rng(rng)
+    items = _feature_items(stats)
+    mean = np.array([values["mean"] for _, values in items], dtype=np.float64)
+    std = np.array([values["std"] or 1.0 for _, values in items], dtype=np.float64)
+    low = np.array([values["min"] for _, values in items], dtype=np.float64)
+    high = np.array([values["max"] for _, values in items], dtype=np.float64)
+
+    # One row per feature so every column is a contiguous array.
+    draws = rng.standard_normal((len(items), n))
+    draws *= std[:, None]
+    draws += mean[:, None]
+    np.clip(draws, low[:, None], high[:, None], out=draws)
+
+    columns = {feature: draws[i] for i, (feature, _) in enumerate(items)}
+    if "Central Air" in columns:
+        np.round(columns["Central Air"], out=columns["Central Air"])
+    return EventBatch(columns=columns, created_at=np.full(n, time.time()))
+
+
 def event_stream(
     stats: dict,
     interval_seconds: float = 30.0,
@@ -64,8 +131,10 @@ def iter_events(
 
 __all__ = [
     "HouseEvent",
+    "EventBatch",
     "load_feature_stats",
     "generate_event",
+    "generate_batch",
     "event_stream",
     "iter_events",
 ]
@@ -0,0 +1,134 @@
+"""Mergeable per-feature summary statistics."""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class FeatureStatsAccumulator:
+    """Running min/max/mean/std for a fixed set of columns.
+
+    Each `update` folds a whole block of rows in with one vectorized pass
+    per statistic, and blocks are combined with Chan's parallel update, so
+    accumulators built on different shards can be merged without revisiting
+    the data. `std` is the population standard deviation (``ddof=0``).
+    """
+
+    def __init__(self, columns: Iterable[str]) -> None:
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = 0
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame, exclude: Iterable[str] = ("SalePrice",)
+    ) -> "FeatureStatsAccumulator":
+        skip = set(exclude)
+        acc = cls(column for column in df.columns if column not in skip)
+        acc.update(df)
+        return acc
+
+    def update(self, values: pd.DataFrame | np.ndarray) -> "FeatureStatsAccumulator":
+        """Add a block of rows (a frame, or an array in `columns` order)."""
+
+        if isinstance(values, pd.DataFrame):
+            values = values[self.columns].to_numpy(dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.columns))
+        n = len(values)
+        if n == 0:
+            return self
+        block_mean = values.mean(axis=0)
+        block_m2 = np.square(values - block_mean).sum(axis=0)
+        self._combine(n, block_mean, block_m2, values.min(axis=0), values.max(axis=0))
+        return self
+
+    def merge(self, other: "FeatureStatsAccumulator") -> "FeatureStatsAccumulator":
+        """Fold `other` into this accumulator in place."""
+
+        if other.columns != self.columns:
+            raise ValueError(f"Cannot merge stats for {other.columns} into {self.columns}")
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    def _combine(
+        self,
+        n: int,
+        mean: np.ndarray,
+        m2: np.ndarray,
+        minimum: np.ndarray,
+        maximum: np.ndarray,
+    ) -> None:
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self.m2 = self.m2 + m2 + np.square(delta) * (self.count * n / total)
+        self.count = total
+        self.min = np.minimum(self.min, minimum)
+        self.max = np.maximum(self.max, maximum)
+
+    @property
+    def std(self) -> np.ndarray:
+        if not self.count:
+            return np.zeros(len(self.columns))
+        return np.sqrt(self.m2 / self.count)
+
+    def to_dict(self) -> dict:
+        """Stats in the `feature_stats.json` layout."""
+
+        std = self.std
+        return {
+            column: {
+                "min": float(self.min[i]),
+                "max": float(self.max[i]),
+                "mean": float(self.mean[i]),
+                "std": float(std[i]),
+            }
+            for i, column in enumerate(self.columns)
+        }
+
+    def to_state(self) -> dict:
+        """JSON-friendly state that keeps the row count, for later merging."""
+
+        return {
+            "columns": self.columns,
+            "count": self.count,
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+            "min": self.min.tolist(),
+            "max": self.max.tolist(),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "FeatureStatsAccumulator":
+        acc = cls(state["columns"])
+        acc.count = int(state["count"])
+        for name in ("mean", "m2", "min", "max"):
+            setattr(acc, name, np.asarray(state[name], dtype=np.float64))
+        return acc
+
+
+def merge_all(
+    accumulators: Iterable[FeatureStatsAccumulator],
+) -> Optional[FeatureStatsAccumulator]:
+    """Merge accumulators from several shards into a new one."""
+
+    merged: Optional[FeatureStatsAccumulator] = None
+    for acc in accumulators:
+        if merged is None:
+            merged = FeatureStatsAccumulator(acc.columns)
+        merged.merge(acc)
+    return merged
+
+
+__all__ = [
+    "FeatureStatsAccumulator",
+    "merge_all",
+]
@@ -2,49 +2,229 @@
 
 from __future__ import annotations
 
+import itertools
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
+from typing import Any, Optional
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.model_selection import KFold, train_test_split
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import PolynomialFeatures, StandardScaler
 
-from .config import Settings, load_config
-from .data_prep import SELECTED_COLUMNS, download_data, preprocess
+from .artifact_store import artifact_key, default_store, frame_digest
+from .config import SearchConfig, Settings, load_config
+from .data_prep import (
+    AMES_URL,
+    SELECTED_COLUMNS,
+    download_data,
+    file_digest,
+    load_processed_with_stats,
+)
+from .drift import reference_histograms
+from .predict import save_compact_model
+from .stats import FeatureStatsAccumulator
 
 
 def compute_feature_stats(df: pd.DataFrame) -> dict:
     """Compute summary statistics used by the simulator."""
 
-    stats = {}
-    for column in df.columns:
-        if column == "SalePrice":
-            continue
-        series = df[column]
-        stats[column] = {
-            "min": float(series.min()),
-            "max": float(series.max()),
-            "mean": float(series.mean()),
-            "std": float(series.std(ddof=0)),
-        }
-    return stats
+    return FeatureStatsAccumulator.from_frame(df, exclude=("SalePrice",)).to_dict()
 
 
-def prepare_data(settings: Settings) -> pd.DataFrame:
+def prepare_data_with_stats(settings: Settings) -> tuple[pd.DataFrame, Optional[dict]]:
+    """Processed frame plus the feature stats streamed while cleaning it.
+
+    The stats are ``None`` when the raw file was not streamed (see
+    `data_prep.load_processed_with_stats`).
+    """
+
     raw_path = settings.paths.data_raw / "ames_subset.csv"
     processed_path = settings.paths.data_processed / "ames_subset_clean.csv"
 
     if not raw_path.exists():
-        download_data(raw_path, columns=SELECTED_COLUMNS)
-    preprocess(raw_path, processed_path)
-    return pd.read_csv(processed_path)
+        data = settings.data
+        download_data(
+            raw_path,
+            columns=SELECTED_COLUMNS,
+            url=data.url or AMES_URL,
+            sha256=data.sha256,
+            cache_dir=Path(data.cache_dir) if data.cache_dir else None,
+            parts=data.parts,
+            retries=data.retries,
+        )
+    return load_processed_with_stats(
+        processed_path, raw_path=raw_path, chunk_size=settings.data.chunk_size
+    )
+
+
+def prepare_data(settings: Settings) -> pd.DataFrame:
+    return prepare_data_with_stats(settings)[0]
+
+
+DEFAULT_SPEC = {"model": "linear"}
+
+
+def build_pipeline(spec: dict, random_state: int = 0) -> Pipeline:
+    """Create an unfitted pipeline from a search-space entry.
+
+    Linear families keep the ``scaler``/``regressor`` step names so that
+    `predict.compile_model` can fold them.
+    """
+
+    family = spec["model"]
+    if family == "linear":
+        regressor: Any = LinearRegression()
+    elif family == "ridge":
+        regressor = Ridge(alpha=spec.get("alpha", 1.0))
+    elif family == "lasso":
+        regressor = Lasso(alpha=spec.get("alpha", 1.0), max_iter=10_000)
+    elif family == "poly_ridge":
+        return Pipeline(
+            steps=[
+                ("poly", PolynomialFeatures(degree=spec.get("degree", 2), include_bias=False)),
+                ("scaler", StandardScaler()),
+                ("regressor", Ridge(alpha=spec.get("alpha", 1.0))),
+            ]
+        )
+    elif family == "gradient_boosting":
+        return Pipeline(
+            steps=[
+                (
+                    "regressor",
+                    GradientBoostingRegressor(
+                        max_depth=spec.get("max_depth", 3),
+                        n_estimators=spec.get("n_estimators", 200),
+                        random_state=random_state,
+                    ),
+                ),
+            ]
+        )
+    else:
+        raise ValueError(f"Unknown model family: {family!r}")
+    return Pipeline(steps=[("scaler", StandardScaler()), ("regressor", regressor)])
+
+
+def expand_search_space(candidates: list[dict]) -> list[dict]:
+    """Expand list-valued parameters of each entry into a grid."""
+
+    specs = []
+    for entry in candidates:
+        keys = list(entry)
+        values = [v if isinstance(v, list) else [v] for v in entry.values()]
+        specs.extend(dict(zip(keys, combo)) for combo in itertools.product(*values))
+    return specs
 
 
-def train_model(settings: Settings) -> tuple[Pipeline, dict]:
-    df = prepare_data(settings)
+# Per-worker state set up by `_init_search_worker`.
+_WORKER: dict = {}
+
+
+def _init_search_worker(shm_name: str, shape: tuple[int, int], best_rmse) -> None:
+    shm = SharedMemory(name=shm_name)
+    data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _WORKER.update(shm=shm, X=data[:, :-1], y=data[:, -1], best=best_rmse)
+
+
+def _evaluate_candidate(
+    spec: dict, cv_folds: int, random_state: int, early_stop_factor: float
+) -> dict:
+    """K-fold RMSE for `spec`; abandons the candidate once it trails the best."""
+
+    X, y, best = _WORKER["X"], _WORKER["y"], _WORKER["best"]
+    folds = KFold(n_splits=cv_folds, shuffle=True, random_state=random_state)
+    scores = []
+    for train_idx, valid_idx in folds.split(X):
+        model = build_pipeline(spec, random_state).fit(X[train_idx], y[train_idx])
+        error = model.predict(X[valid_idx]) - y[valid_idx]
+        scores.append(float(np.sqrt(np.mean(error**2))))
+        if len(scores) < cv_folds and np.mean(scores) > best.value * early_stop_factor:
+            return {"spec": spec, "rmse": float(np.mean(scores)), "folds": scores, "pruned": True}
+
+    rmse = float(np.mean(scores))
+    with best.get_lock():
+        best.value = min(best.value, rmse)
+    return {"spec": spec, "rmse": rmse, "folds": scores, "pruned": False}
+
+
+def search_model(
+    X: pd.DataFrame, y: pd.Series, search: SearchConfig, random_state: int = 0
+) -> tuple[dict, list[dict]]:
+    """Cross-validate every candidate in parallel and return the best spec.
+
+    The training matrix is copied once into shared memory; worker processes
+    map it instead of receiving a pickled copy per task.
+    """
+
+    specs = expand_search_space(search.candidates) or [DEFAULT_SPEC]
+    data = np.column_stack([X.to_numpy(dtype=np.float64), y.to_numpy(dtype=np.float64)])
+    n_jobs = search.n_jobs if search.n_jobs > 0 else (os.cpu_count() or 1)
+
+    context = multiprocessing.get_context()
+    best_rmse = context.Value("d", np.inf)
+    shm = SharedMemory(create=True, size=data.nbytes)
+    try:
+        np.ndarray(data.shape, dtype=np.float64, buffer=shm.buf)[:] = data
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(specs)),
+            mp_context=context,
+            initializer=_init_search_worker,
+            initargs=(shm.name, data.shape, best_rmse),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _evaluate_candidate,
+                    spec,
+                    search.cv_folds,
+                    random_state,
+                    search.early_stop_factor,
+                )
+                for spec in specs
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    finished = [result for result in results if not result["pruned"]]
+    best = min(finished, key=lambda result: result["rmse"])
+    return best["spec"], results
+
+
+def save_search_results(results: list[dict], settings: Settings) -> Path:
+    settings.paths.artifacts.mkdir(parents=True, exist_ok=True)
+    path = settings.paths.artifacts / "search_results.json"
+    ranked = sorted(results, key=lambda result: (result["pruned"], result["rmse"]))
+    path.write_text(json.dumps(ranked, indent=2), encoding="utf-8")
+    return path
+
+
+def run_key(df: pd.DataFrame, settings: Settings) -> str:
+    """Artifact-store key for training on `df` with `settings`."""
+
+    # drift.bins shapes the reference histograms stored with the model.
+    return artifact_key(
+        frame_digest(df), settings.training, settings.search, settings.drift
+    )
+
+
+def train_model(
+    settings: Settings,
+    df: Optional[pd.DataFrame] = None,
+    stats: Optional[dict] = None,
+) -> tuple[Pipeline, dict]:
+    """Fit the model on `df`; `stats` are `df`'s feature stats, if known."""
+
+    if df is None:
+        df, stats = prepare_data_with_stats(settings)
     target = settings.training.target
     features = settings.training.features
 
@@ -58,16 +238,24 @@ def train_model(settings: Settings) -> tuple[Pipeline, dict]:
         random_state=settings.training.random_state,
     )
 
-    pipeline = Pipeline(
-        steps=[
-            ("scaler", StandardScaler()),
-            ("regressor", LinearRegression()),
-        ]
-    )
+    spec = DEFAULT_SPEC
+    if settings.search.enabled:
+        spec, results = search_model(
+            X_train, y_train, settings.search, settings.training.random_state
+        )
+        save_search_results(results, settings)
 
+    pipeline = build_pipeline(spec, settings.training.random_state)
     pipeline.fit(X_train, y_train)
 
-    stats = compute_feature_stats(df)
+    if stats is None:
+        stats = compute_feature_stats(df)
+    else:
+        stats = {feature: dict(values) for feature, values in stats.items()}
+    # Reference distributions for `drift.DriftMonitor`.
+    histograms = reference_histograms(df[features], settings.drift.bins)
+    for feature, histogram in histograms.items():
+        stats[feature]["histogram"] = histogram
     stats["target_mean"] = float(y_train.mean())
     stats["target_std"] = float(y_train.std(ddof=0))
     stats["test_size"] = settings.training.test_size
@@ -75,21 +263,141 @@ def train_model(settings: Settings) -> tuple[Pipeline, dict]:
     return pipeline, stats
 
 
-def save_artifacts(model: Pipeline, stats: dict, settings: Settings) -> None:
+# Which run the files written by `save_artifacts` belong to, and their hashes.
+CURRENT_RUN = "current_run.json"
+
+
+def _artifact_paths(settings: Settings) -> list[Path]:
+    models = settings.paths.models
+    return [
+        models / "linear_regression.pkl",
+        models / "linear_regression.json",
+        settings.paths.artifacts / "feature_stats.json",
+    ]
+
+
+def _artifact_digests(settings: Settings) -> dict[str, Optional[str]]:
+    return {
+        path.name: file_digest(path) if path.exists() else None
+        for path in _artifact_paths(settings)
+    }
+
+
+def artifacts_match(settings: Settings, key: str) -> bool:
+    """Whether the served model files are still exactly those of run `key`."""
+
+    try:
+        recorded = json.loads(
+            (settings.paths.models / CURRENT_RUN).read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        return False
+    return recorded.get("key") == key and recorded.get("files") == _artifact_digests(settings)
+
+
+def save_artifacts(
+    model: Pipeline, stats: dict, settings: Settings, key: Optional[str] = None
+) -> None:
+    """Write the current model and stats, and record them under `key`."""
+
     settings.paths.models.mkdir(parents=True, exist_ok=True)
     settings.paths.artifacts.mkdir(parents=True, exist_ok=True)
 
     model_path = settings.paths.models / "linear_regression.pkl"
     stats_path = settings.paths.artifacts / "feature_stats.json"
 
-    joblib.dump(model, model_path)
+    # Write then rename so readers holding a memory-mapped copy of the old
+    # model are never exposed to a half-written file.
+    tmp_model_path = model_path.with_name(f"{model_path.name}.tmp{os.getpid()}")
+    joblib.dump(model, tmp_model_path)
+    os.replace(tmp_model_path, model_path)
     stats_path.write_text(json.dumps(stats, indent=2), encoding="utf-8")
 
+    compact_path = settings.paths.models / "linear_regression.json"
+    try:
+        export_compact_model(model, settings.training.features, compact_path)
+    except ValueError:
+        # Not a linear pipeline: don't leave a stale compact model behind.
+        compact_path.unlink(missing_ok=True)
+    marker = settings.paths.models / CURRENT_RUN
+    if key is None:
+        marker.unlink(missing_ok=True)
+        return
+    default_store(settings).save(key, model, stats, {"target": settings.training.target})
+    tmp_marker = marker.with_name(f"{marker.name}.tmp{os.getpid()}")
+    tmp_marker.write_text(
+        json.dumps({"key": key, "files": _artifact_digests(settings)}, indent=2),
+        encoding="utf-8",
+    )
+    os.replace(tmp_marker, marker)
+
+
+def export_compact_model(model: Pipeline, features: list[str], path: Path) -> Path:
+    """Write a fitted scaler + linear pipeline as a small JSON document.
+
+    The file holds feature names, scaler means and scales, coefficients
+    and the intercept, and is read back by `predict.load_compact_model`
+    without sklearn or pickle. Raises ValueError for other pipelines.
+    """
+
+    *transforms, regressor = [step for _, step in model.steps]
+    coef = getattr(regressor, "coef_", None)
+    if coef is None or np.ndim(coef) != 1 or np.ndim(regressor.intercept_) != 0:
+        raise ValueError(f"{type(regressor).__name__} is not a single-output linear model")
+    if len(transforms) > 1 or (transforms and type(transforms[0]) is not StandardScaler):
+        raise ValueError("Only an optional StandardScaler may precede the regressor")
+
+    means = np.zeros(len(features))
+    scales = np.ones(len(features))
+    if transforms:
+        scaler = transforms[0]
+        # mean_ is set even with with_mean=False; only a centring scaler uses it.
+        if scaler.with_mean and scaler.mean_ is not None:
+            means = scaler.mean_
+        if scaler.with_std and scaler.scale_ is not None:
+            scales = scaler.scale_
+
+    order = list(range(len(features)))
+    fitted_names = getattr(model, "feature_names_in_", None)
+    if fitted_names is not None:
+        index = {name: i for i, name in enumerate(fitted_names)}
+        order = [index[name] for name in features]
+
+    return save_compact_model(
+        path,
+        features,
+        means=np.asarray(means, dtype=float)[order],
+        scales=np.asarray(scales, dtype=float)[order],
+        coefficients=np.asarray(coef, dtype=float)[order],
+        intercept=float(regressor.intercept_),
+    )
+
+
+def main(
+    config_path: str | Path = "configs/default.yaml", force: bool = False
+) -> Pipeline:
+    """Train (or reuse a cached run) and return the model.
+
+    Runs are cached by a hash of the processed data, the training and
+    search configuration and the training code; pass ``force=True`` to
+    retrain anyway.
+    """
 
-def main(config_path: str | Path = "configs/default.yaml") -> None:
     settings = load_config(config_path)
-    model, stats = train_model(settings)
-    save_artifacts(model, stats, settings)
+    df, data_stats = prepare_data_with_stats(settings)
+    key = run_key(df, settings)
+    store = default_store(settings)
+
+    if not force and store.has(key):
+        model, stats = store.load(key)
+        # Also restore files deleted or overwritten (e.g. by src.online).
+        if store.latest() != key or not artifacts_match(settings, key):
+            save_artifacts(model, stats, settings, key)
+        return model
+
+    model, stats = train_model(settings, df, data_stats)
+    save_artifacts(model, stats, settings, key)
+    return model
 
 
 if __name__ == "__main__":
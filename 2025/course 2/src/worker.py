@@ -0,0 +1,135 @@
+"""Background thread that simulates and scores listings for the monitor."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from .predict import CompiledModel
+from .simulator import EventBatch, generate_batch
+
+
+@dataclass
+class ScoredBatch:
+    events: EventBatch
+    predictions: np.ndarray
+
+
+class ScoringWorker(threading.Thread):
+    """Generate a batch every `interval_seconds` and score it in one call.
+
+    Results go to `results`, a bounded queue the UI drains at its own
+    refresh rate. When the UI falls behind the oldest batch is dropped.
+    `interval_seconds` and `batch_size` may be changed while running; a
+    new interval takes effect immediately rather than after the current
+    wait. `model` is either a model or a callable returning the current
+    one (e.g. `predict.CurrentModel.get`), called once per batch so a
+    retrained or republished model is picked up. With `idle_timeout` set
+    the worker stops once nobody has called `drain` for that long.
+    """
+
+    def __init__(
+        self,
+        model: CompiledModel | Callable[[], CompiledModel],
+        stats: dict,
+        interval_seconds: float,
+        batch_size: int,
+        max_pending: int = 100,
+        seed: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(name="scoring-worker", daemon=True)
+        self.model = model
+        self.stats = stats
+        self._interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.results: queue.Queue[ScoredBatch] = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self._rng = np.random.default_rng(seed)
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._last_drain = time.monotonic()
+
+    @property
+    def interval_seconds(self) -> float:
+        return self._interval_seconds
+
+    @interval_seconds.setter
+    def interval_seconds(self, value: float) -> None:
+        if value != self._interval_seconds:
+            self._interval_seconds = value
+            self._wake.set()
+
+    def current_model(self) -> CompiledModel:
+        return self.model() if callable(self.model) else self.model
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            if (
+                self.idle_timeout is not None
+                and time.monotonic() - self._last_drain > self.idle_timeout
+            ):
+                return
+            started = time.monotonic()
+            self.run_once()
+            self._sleep_until(started)
+
+    def _sleep_until(self, started: float) -> None:
+        # Re-read the interval whenever it changes so a shorter one applies now.
+        while not self._stop_event.is_set():
+            remaining = started + self._interval_seconds - time.monotonic()
+            if remaining <= 0:
+                return
+            self._wake.wait(remaining)
+            self._wake.clear()
+
+    def run_once(self) -> ScoredBatch:
+        """Generate, score and publish a single batch."""
+
+        model = self.current_model()
+        events = generate_batch(self.stats, self.batch_size, rng=self._rng)
+        predictions = model.predict_array(events.to_matrix(model.features))
+        item = ScoredBatch(events=events, predictions=predictions)
+        self._publish(item)
+        return item
+
+    def _publish(self, item: ScoredBatch) -> None:
+        while True:
+            try:
+                self.results.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.results.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def drain(self) -> list[ScoredBatch]:
+        """Return every batch produced since the last call, oldest first."""
+
+        self._last_drain = time.monotonic()
+        items = []
+        while True:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                return items
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop_event.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+
+__all__ = [
+    "ScoredBatch",
+    "ScoringWorker",
+]
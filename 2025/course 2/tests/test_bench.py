@@ -0,0 +1,75 @@
+"""Tests for the open-loop benchmark harness."""
+
+import shutil
+import socket
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+
+from src import bench, service
+
+
+PROJECT = Path(__file__).resolve().parent.parent
+
+
+def test_open_loop_charges_backlog_to_latency() -> None:
+    # Each call takes 4x the arrival interval, so queued requests wait longer
+    # and longer; a closed-loop harness would report ~20 ms for every call.
+    result = bench.run_open_loop(lambda i: time.sleep(0.02), rate=200, duration=0.1)
+
+    assert result["requests"] == 20
+    assert result["latency_ms"]["p50"] > 100
+    assert result["latency_ms"]["max"] > 250
+
+
+def test_batch_mode_reports_one_curve_per_batch_size() -> None:
+    payloads = [{"a": float(i)} for i in range(10)]
+
+    class Model:
+        def predict(self, df):
+            return df["a"].to_numpy()
+
+    curves = bench.bench_batch(Model(), payloads, rate=400, duration=0.05, batch_sizes=[1, 4])
+
+    assert [curve["batch_size"] for curve in curves] == [1, 4]
+    assert all(set(bench.PERCENTILES) <= set(curve["latency_ms"]) for curve in curves)
+
+
+def test_http_mode_against_local_uvicorn(tmp_path: Path) -> None:
+    shutil.copytree(PROJECT / "configs", tmp_path / "configs")
+    shutil.copytree(PROJECT / "models", tmp_path / "models")
+    shutil.copytree(PROJECT / "artifacts", tmp_path / "artifacts")
+    config_path = tmp_path / "configs" / "default.yaml"
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(service.create_app(config_path), port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            time.sleep(0.01)
+        report = bench.main(
+            [
+                "--config", str(config_path),
+                "--mode", "http",
+                "--url", f"http://127.0.0.1:{port}/predict",
+                "--rate", "200",
+                "--duration", "0.25",
+                "--payloads", "20",
+                "--output", str(tmp_path / "report.json"),
+            ]
+        )
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    assert report["result"]["requests"] == 50
+    assert report["result"]["errors"] == 0
+    assert report["result"]["latency_ms"]["p999"] is not None
+    assert (tmp_path / "report.json").exists()
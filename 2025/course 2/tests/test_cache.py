@@ -0,0 +1,100 @@
+"""Tests for the prediction cache."""
+
+import numpy as np
+import pytest
+
+from src.cache import PredictionCache
+from src.predict import CompiledModel, batch_predict, predict_price
+from src.schema import SchemaError
+
+
+FEATURES = ["Gr Liv Area", "Overall Qual"]
+
+
+class CountingModel:
+    """Stand-in pipeline that records how many rows it scored."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+
+    def predict(self, df):
+        self.rows += len(df)
+        return (df["Gr Liv Area"] * 100 + df["Overall Qual"]).to_numpy()
+
+
+def compiled(version: str, weight: float = 100.0) -> CompiledModel:
+    return CompiledModel(
+        features=FEATURES,
+        weights=np.array([weight, 1.0]),
+        intercept=0.0,
+        pipeline=None,
+        version=version,
+    )
+
+
+def test_quantized_keys_share_entries_and_batches_score_misses_once() -> None:
+    cache = PredictionCache(FEATURES, quantize={"Gr Liv Area": 10})
+    model = CountingModel()
+    rows = [
+        {"Gr Liv Area": 1500.0, "Overall Qual": 6.0},
+        {"Gr Liv Area": 1502.0, "Overall Qual": 6.0},  # rounds onto the first row
+        {"Overall Qual": 6.0, "Gr Liv Area": 1500.0},  # key order does not matter
+        {"Gr Liv Area": 2000.0, "Overall Qual": 7.0},
+    ]
+
+    first = batch_predict(model, rows, cache=cache)
+    second = batch_predict(model, rows, cache=cache)
+
+    assert first == second == [150006.0, 150006.0, 150006.0, 200007.0]
+    assert model.rows == 2
+    assert predict_price(model, rows[3], cache=cache) == 200007.0
+    assert cache.stats()["hits"] == 5 and cache.stats()["misses"] == 4
+
+
+def test_model_version_is_part_of_the_key() -> None:
+    cache = PredictionCache(FEATURES)
+    row = {"Gr Liv Area": 1000.0, "Overall Qual": 5.0}
+
+    assert predict_price(compiled("a"), row, cache=cache) == 100005.0
+    assert predict_price(compiled("b", weight=200.0), row, cache=cache) == 200005.0
+    assert predict_price(compiled("a"), row, cache=cache) == 100005.0
+    assert cache.stats()["hits"] == 1
+
+    # Unversioned models are tracked by identity: a reload clears their entries.
+    old, new = CountingModel(), CountingModel()
+    predict_price(old, row, cache=cache)
+    predict_price(new, row, cache=cache)
+    assert new.rows == 1
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_ttl_and_lru_limits() -> None:
+    now = [0.0]
+    cache = PredictionCache(FEATURES, max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    keys = [cache.key("v", {"Gr Liv Area": float(i), "Overall Qual": 1.0}) for i in range(3)]
+
+    cache.put(keys[0], 1.0)
+    cache.put(keys[1], 2.0)
+    assert cache.get(keys[0]) == 1.0  # keys[1] is now least recently used
+    cache.put(keys[2], 3.0)
+    assert cache.get(keys[1]) is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] = 11.0
+    assert cache.get(keys[0]) is None
+    assert cache.stats()["expirations"] == 1
+
+    capped = PredictionCache(FEATURES, max_bytes=4096)
+    for i in range(1000):
+        capped.put(capped.key("v", {"Gr Liv Area": float(i), "Overall Qual": 1.0}), i)
+    assert 0 < len(capped) < 1000
+    assert capped.bytes <= 4096
+
+
+def test_key_rejects_missing_and_non_numeric_features() -> None:
+    cache = PredictionCache(FEATURES)
+
+    with pytest.raises(SchemaError, match="Overall Qual"):
+        cache.key("v1", {"Gr Liv Area": 1500.0})
+    with pytest.raises(SchemaError, match="Gr Liv Area"):
+        cache.key("v1", {"Gr Liv Area": "big", "Overall Qual": 6.0})
@@ -0,0 +1,71 @@
+"""Tests for the streaming drift monitor."""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import drift
+from src.simulator import generate_batch, load_feature_stats
+
+
+STATS_PATH = Path(__file__).resolve().parent.parent / "artifacts" / "feature_stats.json"
+
+
+def test_simulated_traffic_stays_quiet() -> None:
+    stats = load_feature_stats(STATS_PATH)
+    monitor = drift.DriftMonitor.from_feature_stats(stats)
+    rng = np.random.default_rng(0)
+
+    alerts = [monitor.update(generate_batch(stats, 500, rng)) for _ in range(10)]
+
+    assert not any(alerts)
+    report = monitor.report()
+    assert {row.feature for row in report} == set(monitor.features)
+    assert all(row.psi < 0.05 for row in report)
+
+
+def test_shifted_feature_alerts_once_and_recovers(caplog) -> None:
+    stats = load_feature_stats(STATS_PATH)
+    monitor = drift.DriftMonitor.from_feature_stats(stats, half_life=500)
+    rng = np.random.default_rng(1)
+    monitor.update(generate_batch(stats, 1000, rng))
+
+    shifted = generate_batch(stats, 500, rng)
+    shifted.columns["Gr Liv Area"] += 2 * stats["Gr Liv Area"]["std"]
+    with caplog.at_level(logging.WARNING, logger="src.drift"):
+        raised = monitor.update(shifted)
+    again = monitor.update(shifted)
+
+    assert [alert.feature for alert in raised] == ["Gr Liv Area"]
+    assert "Drift on Gr Liv Area" in caplog.text
+    assert again == []
+    assert [alert.feature for alert in monitor.alerts()] == ["Gr Liv Area"]
+
+    for _ in range(10):
+        monitor.update(generate_batch(stats, 500, rng))
+    assert monitor.alerts() == []
+    # Memory is fixed by the bin count, not the traffic seen.
+    assert all(len(s.counts) == len(s.edges) + 1 for s in monitor.sketches.values())
+
+
+def test_training_histograms_match_their_own_data() -> None:
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(
+        {
+            "Overall Qual": rng.integers(1, 11, 2000).astype(float),
+            "Gr Liv Area": rng.lognormal(7.2, 0.3, 2000),
+        }
+    )
+    stats = {
+        column: {"mean": df[column].mean(), "histogram": histogram}
+        for column, histogram in drift.reference_histograms(df).items()
+    }
+
+    monitor = drift.DriftMonitor.from_feature_stats(stats, min_events=0)
+    monitor.update({column: df[column].to_numpy() for column in df})
+
+    assert stats["Overall Qual"]["histogram"]["edges"][0] == 0.5
+    assert len(stats["Overall Qual"]["histogram"]["counts"]) == 10
+    assert all(row.psi < 1e-2 and not row.drifted for row in monitor.report())
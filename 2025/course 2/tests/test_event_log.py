@@ -0,0 +1,44 @@
+"""Tests for the batched structured event log."""
+
+from pathlib import Path
+
+import numpy as np
+
+from src import event_log, simulator
+
+
+STATS = {
+    "a": {"min": 0.0, "max": 10.0, "mean": 5.0, "std": 2.0},
+    "b": {"min": -1.0, "max": 1.0, "mean": 0.0, "std": 1.0},
+}
+
+
+def test_event_log_round_trips_batches_and_events(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    batch = simulator.generate_batch(STATS, 10, rng=0)
+    predictions = np.arange(10, dtype=float)
+
+    with event_log.EventLog(path, batch_size=4) as log:
+        log.log_batch(batch, predictions)
+        log.log_event({"a": 1.0, "b": 0.5}, 42.0, created_at=1.0)
+
+    records = list(event_log.read_events(path))
+    replayed, replayed_predictions = next(event_log.iter_event_batches(path, batch_size=100))
+
+    assert len(records) == 11
+    assert records[-1] == {"created_at": 1.0, "payload": {"a": 1.0, "b": 0.5}, "prediction": 42.0}
+    np.testing.assert_array_equal(replayed.columns["a"][:10], batch.columns["a"])
+    np.testing.assert_array_equal(replayed_predictions[:10], predictions)
+    assert isinstance(next(event_log.replay_events(path)), simulator.HouseEvent)
+
+
+def test_event_log_rotates_by_size(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+
+    with event_log.EventLog(path, max_bytes=500, backup_count=10, batch_size=1) as log:
+        for i in range(40):
+            log.log_event({"a": float(i)}, float(i), created_at=float(i))
+
+    assert event_log.rotated_path(path, 1).exists()
+    assert all(p.stat().st_size <= 500 for p in tmp_path.iterdir())
+    assert [r["prediction"] for r in event_log.read_events(path)] == [float(i) for i in range(40)]
@@ -0,0 +1,192 @@
+"""Tests for the cached, resumable download layer."""
+
+import hashlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src import fetch
+from src.data_prep import download_data
+
+
+class RangeServer:
+    """Local stand-in for the dataset host, with byte ranges and faults."""
+
+    def __init__(
+        self,
+        body: bytes,
+        ranges: bool = True,
+        drop_first_after: int = 0,
+        honour_ranges: bool = True,
+        range_shift: int = 0,
+    ) -> None:
+        self.body = body
+        self.requests: list[str] = []
+        self.drop_first_after = drop_first_after
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_HEAD(self) -> None:
+                server.requests.append("HEAD")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(server.body)))
+                if ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+
+            def do_GET(self) -> None:
+                header = self.headers.get("Range")
+                server.requests.append(header or "GET")
+                start, end = 0, len(server.body) - 1
+                match = re.fullmatch(r"bytes=(\d+)-(\d*)", header or "")
+                if ranges and honour_ranges and match:
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else end
+                    self.send_response(206)
+                    # A misbehaving server serves (and labels) the wrong bytes.
+                    start = max(start - range_shift, 0)
+                    content_range = f"bytes {start}-{end}/{len(server.body)}"
+                    self.send_header("Content-Range", content_range)
+                else:
+                    self.send_response(200)
+                chunk = server.body[start : end + 1]
+                self.send_header("Content-Length", str(len(chunk)))
+                self.end_headers()
+                if server.drop_first_after:
+                    # Promise the whole chunk, send part of it, then hang up.
+                    self.wfile.write(chunk[: server.drop_first_after])
+                    server.drop_first_after = 0
+                    self.close_connection = True
+                    return
+                self.wfile.write(chunk)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/data/AmesHousing.txt"
+
+    def __enter__(self) -> "RangeServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+BODY = b"".join(f"{i}\t{i * 2}\n".encode() for i in range(20_000))
+DIGEST = hashlib.sha256(BODY).hexdigest()
+
+
+def test_dropped_connection_resumes_with_range(tmp_path: Path) -> None:
+    with RangeServer(BODY, drop_first_after=1000) as server:
+        path = fetch.fetch(
+            server.url, sha256=DIGEST, cache_dir=tmp_path, parts=1, backoff=0
+        )
+
+    assert path.read_bytes() == BODY
+    assert server.requests == ["HEAD", "GET", "bytes=1000-"]
+    assert not list(path.parent.glob("*.part*"))
+
+
+def test_parallel_parts_and_shared_cache(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(fetch, "MIN_PART_SIZE", 1024)
+    with RangeServer(BODY) as server:
+        first = fetch.fetch(server.url, sha256=DIGEST, cache_dir=tmp_path, parts=4)
+        requests = len(server.requests)
+        second = fetch.fetch(server.url, sha256=DIGEST, cache_dir=tmp_path, parts=4)
+
+    assert first == second
+    assert first.read_bytes() == BODY
+    assert sorted(server.requests[1:requests]) == sorted(
+        f"bytes={len(BODY) * i // 4}-{len(BODY) * (i + 1) // 4 - 1}" for i in range(4)
+    )
+    assert len(server.requests) == requests  # served from the cache
+
+
+@pytest.mark.parametrize(
+    "server_options", [{"honour_ranges": False}, {"range_shift": 100}]
+)
+def test_parallel_parts_reject_wrong_ranges(
+    tmp_path: Path, monkeypatch, server_options: dict
+) -> None:
+    monkeypatch.setattr(fetch, "MIN_PART_SIZE", 1024)
+    with RangeServer(BODY, **server_options) as server:
+        with pytest.raises(OSError, match="bytes"):
+            fetch.fetch(server.url, cache_dir=tmp_path, parts=4, retries=1, backoff=0)
+
+    target = fetch.cache_path(server.url, None, tmp_path)
+    assert not target.exists()
+    assert not target.with_name(f"{target.name}.sha256").exists()
+
+
+def test_first_part_rejects_full_body_without_range(tmp_path: Path) -> None:
+    part = tmp_path / "part0"
+    with RangeServer(BODY, honour_ranges=False) as server:
+        for _ in range(2):  # a retry must not trust what the first try wrote
+            with pytest.raises(OSError, match="ignored the range request"):
+                fetch._download_range(server.url, part, 0, 999, timeout=5)
+
+    assert not part.exists() or part.stat().st_size == 0
+
+
+def test_checksum_mismatch_is_rejected(tmp_path: Path) -> None:
+    with RangeServer(BODY, ranges=False) as server:
+        with pytest.raises(fetch.ChecksumError):
+            fetch.fetch(server.url, sha256="0" * 64, cache_dir=tmp_path)
+        # Unpinned: the first digest is recorded and a corrupted copy refetched.
+        path = fetch.fetch(server.url, cache_dir=tmp_path)
+        path.write_bytes(b"truncated")
+        refetched = fetch.fetch(server.url, cache_dir=tmp_path)
+
+    assert not fetch.cache_path(server.url, "0" * 64, tmp_path).exists()
+    assert refetched.read_bytes() == BODY
+    assert server.requests.count("GET") == 3
+
+
+def test_download_data_reads_selected_columns_from_cache(tmp_path: Path) -> None:
+    body = b"Order\tSalePrice\tGr Liv Area\n1\t100\t900\n2\t200\t1200\n"
+    with RangeServer(body) as server:
+        output = download_data(
+            tmp_path / "raw" / "ames.csv",
+            columns=["SalePrice", "Gr Liv Area"],
+            url=server.url,
+            sha256=hashlib.sha256(body).hexdigest(),
+            cache_dir=tmp_path / "cache",
+        )
+
+    assert pd.read_csv(output).to_dict("list") == {
+        "SalePrice": [100, 200],
+        "Gr Liv Area": [900, 1200],
+    }
+
+
+def test_probe_retries_unreachable_host(tmp_path: Path, monkeypatch) -> None:
+    urlopen = fetch.urllib.request.urlopen
+    failures = []
+
+    def flaky_urlopen(request, *args, **kwargs):
+        if request.get_method() == "HEAD" and not failures:
+            failures.append(request)
+            raise fetch.urllib.error.URLError("temporary failure in name resolution")
+        return urlopen(request, *args, **kwargs)
+
+    monkeypatch.setattr(fetch.urllib.request, "urlopen", flaky_urlopen)
+    with RangeServer(BODY) as server:
+        path = fetch.fetch(server.url, sha256=DIGEST, cache_dir=tmp_path, backoff=0)
+
+    assert len(failures) == 1
+    assert path.read_bytes() == BODY
+    assert server.requests[0] == "HEAD"
+
+
+def test_main_prints_digest_to_pin(tmp_path: Path, capsys) -> None:
+    with RangeServer(BODY) as server:
+        fetch.main([server.url, "--cache-dir", str(tmp_path)])
+
+    assert capsys.readouterr().out.split()[0] == DIGEST
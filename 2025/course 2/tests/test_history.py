@@ -0,0 +1,47 @@
+"""Tests for the prediction history ring buffer."""
+
+import numpy as np
+
+from src.history import PredictionHistory
+
+
+def test_history_keeps_only_the_newest_rows() -> None:
+    history = PredictionHistory(["a", "b"], capacity=4)
+    for i in range(10):
+        history.append({"a": i, "b": -i}, prediction=10.0 * i, timestamp=float(i))
+
+    last = history.last(3)
+
+    assert len(history) == 4 and history.total == 10
+    assert last["a"].tolist() == [7, 8, 9]
+    assert last["prediction"].tolist() == [70.0, 80.0, 90.0]
+    assert history.last()["b"].tolist() == [-6, -7, -8, -9]
+    assert np.isclose(history.mean(), np.mean([60, 70, 80, 90]))
+    assert np.allclose(history.quantiles([0.5]), [75.0])
+
+
+def test_history_last_returns_read_only_views() -> None:
+    history = PredictionHistory(["a"], capacity=3)
+    for i in range(5):
+        history.append({"a": i}, prediction=i)
+
+    view = history.last(2)["a"]
+
+    assert view.base is not None
+    assert not view.flags.writeable
+    assert list(history.to_frame(2).columns) == ["timestamp", "a", "prediction"]
+
+
+def test_history_extend_matches_repeated_append() -> None:
+    appended = PredictionHistory(["a"], capacity=5)
+    extended = PredictionHistory(["a"], capacity=5)
+    values = np.arange(12, dtype=float)
+    for i in values:
+        appended.append({"a": i}, prediction=2 * i, timestamp=i)
+
+    extended.extend({"a": values[:3]}, 2 * values[:3], values[:3])
+    extended.extend({"a": values[3:]}, 2 * values[3:], values[3:])
+
+    for key, column in appended.last().items():
+        np.testing.assert_array_equal(extended.last()[key], column)
+    assert np.isclose(extended.mean(), appended.mean())
@@ -0,0 +1,152 @@
+"""Tests for the online least-squares updater."""
+
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from src import online, service, train
+from src.artifact_store import default_store
+from src.config import load_config
+from src.schema import SchemaError
+from src.predict import load_default_compact_model
+from src.registry import registry
+
+
+FEATURES = ["Overall Qual", "Gr Liv Area", "Central Air"]
+
+
+def labelled_frame(n: int = 400, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "Overall Qual": rng.integers(1, 11, n).astype(float),
+            "Gr Liv Area": rng.normal(1500, 400, n),
+            "Central Air": rng.integers(0, 2, n).astype(float),
+        }
+    )
+    df["SalePrice"] = (
+        20000 * df["Overall Qual"] + 60 * df["Gr Liv Area"] + rng.normal(0, 5000, n)
+    )
+    return df
+
+
+def test_incremental_updates_match_batch_least_squares() -> None:
+    df = labelled_frame()
+    model = online.OnlineRegressor(FEATURES)
+    for start in range(0, len(df), 37):
+        model.update_frame(df.iloc[start : start + 37], "SalePrice")
+    # Round-trip through JSON as a restarted updater would.
+    model = online.OnlineRegressor.from_state(json.loads(json.dumps(model.to_state())))
+
+    coef, intercept = model.coefficients()
+
+    design = np.column_stack([np.ones(len(df)), df[FEATURES].to_numpy()])
+    expected = np.linalg.lstsq(design, df["SalePrice"].to_numpy(), rcond=None)[0]
+    assert model.count == len(df)
+    assert np.isclose(intercept, expected[0], rtol=1e-8)
+    assert np.allclose(coef, expected[1:], rtol=1e-8)
+
+
+def test_publish_swaps_model_in_running_service(tmp_path: Path) -> None:
+    project = Path(__file__).resolve().parent.parent
+    shutil.copytree(project / "configs", tmp_path / "configs")
+    shutil.copytree(project / "models", tmp_path / "models")
+    config_path = tmp_path / "configs" / "default.yaml"
+    config_path.write_text(
+        config_path.read_text(encoding="utf-8").replace(
+            "model_format: pickle", "model_format: compact"
+        ),
+        encoding="utf-8",
+    )
+    model_path = tmp_path / "models" / "linear_regression.json"
+    current, _ = load_default_compact_model(config_path)
+    payload = {name: 1.0 for name in current.features}
+
+    df = labelled_frame()
+    df["Overall Cond"] = 5.0
+    df["Total Bsmt SF"] = 0.0
+    updater = online.OnlineRegressor(current.features).update_frame(df, "SalePrice")
+
+    with TestClient(service.create_app(config_path)) as client:
+        before = client.post("/predict", json={"features": payload}).json()["prediction"]
+        published = updater.publish(model_path)
+        after = client.post("/predict", json={"features": payload}).json()["prediction"]
+
+    assert registry.get(model_path) is published
+    expected = updater.to_compiled().predict_many([payload])[0]
+    assert np.isclose(after, expected)
+    assert not np.isclose(before, after)
+
+
+def test_update_records_uses_labelled_events_only() -> None:
+    df = labelled_frame(50)
+    records = [{"payload": row, "prediction": 0.0} for row in df.to_dict("records")]
+    records.append({"payload": {name: 1.0 for name in FEATURES}, "prediction": 0.0})
+
+    model = online.OnlineRegressor(FEATURES).update_records(records, "SalePrice")
+
+    expected = online.OnlineRegressor(FEATURES).update_frame(df, "SalePrice")
+    assert model.count == len(df)
+    assert np.allclose(model.coefficients()[0], expected.coefficients()[0])
+
+
+def test_main_folds_labelled_csv_into_saved_state(tmp_path: Path) -> None:
+    project = Path(__file__).resolve().parent.parent
+    shutil.copytree(project / "configs", tmp_path / "configs")
+    config_path = tmp_path / "configs" / "default.yaml"
+    settings = load_config(config_path)
+    df = labelled_frame()
+    df["Overall Cond"] = 5.0
+    df["Total Bsmt SF"] = df["Gr Liv Area"] * 0.5 + 100
+    start = online.OnlineRegressor(settings.training.features).update_frame(df[:200], "SalePrice")
+    online.save_state(start, settings)
+    df[200:].to_csv(tmp_path / "labelled.csv", index=False)
+
+    online.main([str(tmp_path / "labelled.csv"), "--config", str(config_path)])
+
+    assert online.load_or_bootstrap(settings).count == len(df)
+    assert (tmp_path / "models" / "linear_regression.json").exists()
+
+
+def test_main_requires_labelled_file(capsys) -> None:
+    with pytest.raises(SystemExit) as exc_info:
+        online.main([])
+
+    assert exc_info.value.code == 2
+    assert "labelled" in capsys.readouterr().err
+
+
+def test_update_records_names_missing_feature() -> None:
+    row = {"Overall Qual": 5.0, "Gr Liv Area": 1500.0, "SalePrice": 1.0}
+
+    with pytest.raises(SchemaError, match="Central Air"):
+        online.OnlineRegressor(FEATURES).update_records([{"payload": row}], "SalePrice")
+
+
+def test_state_from_an_older_run_is_rebuilt(tmp_path: Path) -> None:
+    project = Path(__file__).resolve().parent.parent
+    shutil.copytree(project / "configs", tmp_path / "configs")
+    config_path = tmp_path / "configs" / "default.yaml"
+    raw = labelled_frame(120)
+    raw["Overall Cond"] = 5
+    raw["Total Bsmt SF"] = raw["Gr Liv Area"] * 0.5
+    raw["Central Air"] = np.where(raw["Central Air"] > 0, "Y", "N")
+    (tmp_path / "data" / "raw").mkdir(parents=True)
+    raw.to_csv(tmp_path / "data" / "raw" / "ames_subset.csv", index=False)
+    train.main(config_path)
+    settings = load_config(config_path)
+    stale = online.OnlineRegressor(settings.training.features).update_frame(
+        raw.assign(**{"Central Air": 1.0})[:3], "SalePrice"
+    )
+    stale.run = "an-older-run"
+    online.save_state(stale, settings)
+
+    model = online.load_or_bootstrap(settings)
+
+    assert model.run == default_store(settings).latest()
+    assert model.count == len(raw)
@@ -1,13 +1,19 @@
 """Basic tests for prediction helpers."""
 
+import subprocess
+import sys
 from pathlib import Path
 
 import joblib
 import numpy as np
+import pandas as pd
+import pytest
 from sklearn.dummy import DummyRegressor
+from sklearn.linear_model import LinearRegression
 from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 
-from src import predict
+from src import predict, train
 
 
 def dummy_model(tmp_path: Path) -> Path:
@@ -36,3 +42,97 @@ def test_batch_predict_handles_multiple_rows(tmp_path: Path) -> None:
 
     assert isinstance(predictions, list)
     assert len(predictions) == 2
+
+
+def fitted_linear_pipeline(**scaler_options) -> tuple[Pipeline, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(50, 3)) * [1.0, 10.0, 100.0], columns=["a", "b", "c"])
+    y = X @ np.array([3.0, -2.0, 0.5]) + 7.0 + rng.normal(size=50)
+    pipeline = Pipeline(
+        steps=[
+            ("scaler", StandardScaler(**scaler_options)),
+            ("regressor", LinearRegression()),
+        ]
+    )
+    pipeline.fit(X, y)
+    return pipeline, X
+
+
+def test_compiled_model_matches_pipeline() -> None:
+    pipeline, X = fitted_linear_pipeline()
+    compiled = predict.compile_model(pipeline, ["c", "a", "b"])
+
+    expected = pipeline.predict(X)
+    result = compiled.predict_array(X[["c", "a", "b"]].to_numpy())
+
+    assert compiled.is_folded
+    np.testing.assert_allclose(result, expected, rtol=1e-9)
+    rows = X.to_dict(orient="records")
+    assert np.allclose(predict.batch_predict(compiled, rows), expected)
+
+
+@pytest.mark.parametrize(
+    "scaler_options", [{"with_mean": False}, {"with_std": False}]
+)
+def test_compiled_model_respects_scaler_flags(scaler_options: dict) -> None:
+    pipeline, X = fitted_linear_pipeline(**scaler_options)
+    compiled = predict.compile_model(pipeline, ["a", "b", "c"])
+
+    assert compiled.is_folded
+    np.testing.assert_allclose(
+        compiled.predict_array(X.to_numpy()), pipeline.predict(X), rtol=1e-9
+    )
+
+
+def test_compiled_model_falls_back_for_unfoldable_estimators(tmp_path: Path) -> None:
+    model = predict.load_model(dummy_model(tmp_path))
+    compiled = predict.compile_model(model, ["feature"])
+
+    assert not compiled.is_folded
+    assert predict.predict_price(compiled, {"feature": 1}) == predict.predict_price(
+        model, {"feature": 1}
+    )
+
+
+def test_compact_model_round_trip_matches_pipeline(tmp_path: Path) -> None:
+    pipeline, X = fitted_linear_pipeline()
+    path = train.export_compact_model(pipeline, ["b", "c", "a"], tmp_path / "model.json")
+
+    compact = predict.load_compact_model(path)
+
+    assert compact.pipeline is None
+    np.testing.assert_allclose(
+        compact.predict_array(X[["b", "c", "a"]].to_numpy()), pipeline.predict(X), rtol=1e-9
+    )
+
+
+def test_compact_model_serves_without_sklearn() -> None:
+    code = (
+        "import sys; from src import predict; "
+        "model, s = predict.load_default_compact_model('configs/default.yaml'); "
+        "predict.predict_price(model, dict.fromkeys(s.training.features, 1.0)); "
+        "print('sklearn' in sys.modules)"
+    )
+    project = Path(__file__).resolve().parent.parent
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=project, capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize(
+    "scaler_options", [{"with_mean": False}, {"with_std": False}]
+)
+def test_compact_model_round_trip_respects_scaler_flags(
+    tmp_path: Path, scaler_options: dict
+) -> None:
+    pipeline, X = fitted_linear_pipeline(**scaler_options)
+    path = train.export_compact_model(pipeline, ["a", "b", "c"], tmp_path / "model.json")
+
+    compact = predict.load_compact_model(path)
+
+    np.testing.assert_allclose(
+        compact.predict_array(X.to_numpy()), pipeline.predict(X), rtol=1e-9
+    )
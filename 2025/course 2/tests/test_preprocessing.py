@@ -2,16 +2,14 @@
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from src import data_prep
 
 
-def test_preprocess_removes_nulls(tmp_path: Path) -> None:
-    raw_csv = tmp_path / "raw.csv"
-    processed_csv = tmp_path / "processed.csv"
-
-    df = pd.DataFrame(
+def raw_frame() -> pd.DataFrame:
+    return pd.DataFrame(
         {
             "Overall Qual": [5, None],
             "Overall Cond": [7, 8],
@@ -21,10 +19,88 @@ def test_preprocess_removes_nulls(tmp_path: Path) -> None:
             "SalePrice": [200000, 250000],
         }
     )
-    df.to_csv(raw_csv, index=False)
+
+
+def test_preprocess_removes_nulls(tmp_path: Path) -> None:
+    raw_csv = tmp_path / "raw.csv"
+    processed_csv = tmp_path / "processed.csv"
+
+    raw_frame().to_csv(raw_csv, index=False)
 
     result_path = data_prep.preprocess(raw_csv, processed_csv)
 
     cleaned = pd.read_csv(result_path)
     assert cleaned.isnull().sum().sum() == 0
     assert len(cleaned) == 1
+
+
+def test_load_processed_uses_memory_mapped_cache(tmp_path: Path) -> None:
+    raw_csv = tmp_path / "raw.csv"
+    processed_csv = tmp_path / "processed.csv"
+    raw_frame().to_csv(raw_csv, index=False)
+
+    first = data_prep.load_processed(processed_csv, raw_path=raw_csv)
+    second = data_prep.load_processed(processed_csv, raw_path=raw_csv)
+
+    assert data_prep.cache_dir_for(processed_csv).is_dir()
+    base = second["Gr Liv Area"].to_numpy()
+    while base.base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+    assert first.to_dict() == second.to_dict() == pd.read_csv(processed_csv).to_dict()
+
+
+def test_load_processed_rebuilds_cache_when_raw_changes(tmp_path: Path) -> None:
+    raw_csv = tmp_path / "raw.csv"
+    processed_csv = tmp_path / "processed.csv"
+    raw_frame().to_csv(raw_csv, index=False)
+    data_prep.load_processed(processed_csv, raw_path=raw_csv)
+
+    updated = raw_frame()
+    updated.loc[0, "Gr Liv Area"] = 1600
+    updated.to_csv(raw_csv, index=False)
+    reloaded = data_prep.load_processed(processed_csv, raw_path=raw_csv)
+
+    assert reloaded["Gr Liv Area"].tolist() == [1600]
+
+
+def test_streaming_preprocess_matches_in_memory(tmp_path: Path) -> None:
+    raw_csv = tmp_path / "raw.csv"
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(
+        {
+            "Overall Qual": rng.integers(1, 10, 25).astype(float),
+            "Overall Cond": rng.integers(1, 10, 25),
+            "Gr Liv Area": rng.normal(1500, 400, 25),
+            "Central Air": rng.choice(["Y", "N"], 25),
+            "Total Bsmt SF": rng.normal(1000, 300, 25),
+            "SalePrice": rng.normal(180000, 50000, 25),
+        }
+    )
+    df.loc[[3, 17], "Overall Qual"] = None
+    df.to_csv(raw_csv, index=False)
+
+    expected = pd.read_csv(data_prep.preprocess(raw_csv, tmp_path / "full.csv"))
+    path, stats = data_prep.preprocess_streaming(raw_csv, tmp_path / "streamed.csv", chunk_size=4)
+
+    streamed = pd.read_csv(path)
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+    assert set(stats) == set(expected.columns) - {"SalePrice"}
+    for column, values in stats.items():
+        assert np.isclose(values["mean"], expected[column].mean())
+        assert np.isclose(values["std"], expected[column].std(ddof=0))
+        assert values["min"] == expected[column].min()
+        assert values["max"] == expected[column].max()
+
+
+def test_load_processed_keeps_streamed_stats_in_cache(tmp_path: Path) -> None:
+    raw_csv = tmp_path / "raw.csv"
+    processed_csv = tmp_path / "processed.csv"
+    raw_frame().to_csv(raw_csv, index=False)
+
+    df, stats = data_prep.load_processed_with_stats(processed_csv, raw_csv, chunk_size=1)
+    _, cached_stats = data_prep.load_processed_with_stats(processed_csv, raw_csv, chunk_size=1)
+
+    assert df["Gr Liv Area"].tolist() == [1500]
+    assert stats["Gr Liv Area"] == {"mean": 1500.0, "std": 0.0, "min": 1500.0, "max": 1500.0}
+    assert cached_stats == stats
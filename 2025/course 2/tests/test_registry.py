@@ -0,0 +1,39 @@
+"""Tests for the process-wide model registry."""
+
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+from src.registry import ModelRegistry
+
+
+def dump_model(path: Path, slope: float) -> None:
+    model = LinearRegression().fit(np.array([[0.0], [1.0]]), np.array([0.0, slope]))
+    tmp_path = path.with_name(path.name + ".tmp")
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def test_registry_loads_once_and_reloads_on_change(tmp_path: Path) -> None:
+    path = tmp_path / "model.pkl"
+    dump_model(path, 2.0)
+    registry = ModelRegistry()
+
+    first = registry.get(path)
+    again = registry.get(path)
+    compiled = registry.get_derived(path, "slope", lambda model: model.coef_[0])
+
+    assert first is again and registry.loads == 1
+    assert np.isclose(compiled, 2.0)
+    assert isinstance(first.coef_, np.memmap)
+
+    dump_model(path, 5.0)
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+    reloaded = registry.get(path)
+
+    assert registry.loads == 2
+    assert np.isclose(reloaded.coef_[0], 5.0)
+    assert registry.get_derived(path, "slope", lambda model: model.coef_[0]) == reloaded.coef_[0]
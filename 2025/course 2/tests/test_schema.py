@@ -0,0 +1,81 @@
+"""Tests for schema-validated feature packing."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src import predict
+from src.schema import FeatureSchema, SchemaError
+
+
+def fitted_pipeline() -> tuple[Pipeline, pd.DataFrame]:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(40, 3)) * [1.0, 10.0, 100.0], columns=["a", "b", "c"])
+    y = X @ np.array([3.0, -2.0, 0.5]) + 7.0
+    pipeline = Pipeline(steps=[("scaler", StandardScaler()), ("regressor", LinearRegression())])
+    return pipeline.fit(X, y), X
+
+
+def test_pack_rows_orders_columns_and_reuses_buffer() -> None:
+    schema = FeatureSchema(["a", "b", "c"])
+    out = np.empty((2, 3))
+
+    packed = schema.pack_rows([{"c": 3, "a": 1, "b": 2}, {"b": 5, "c": 6, "a": 4}], out=out)
+
+    assert packed is out
+    assert packed.tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+
+@pytest.mark.parametrize(
+    "row, message",
+    [
+        ({"a": 1, "b": 2}, "Row 1: missing features ['c']"),
+        ({"a": 1, "b": 2, "c": 3, "d": 4}, "Row 1: unexpected features ['d']"),
+        ({"a": 1, "b": "x", "c": 3}, "Row 1: non-numeric values for ['b']"),
+        ({"a": 1, "b": float("nan"), "c": 3}, "Row 1: non-finite values for ['b']"),
+    ],
+)
+def test_pack_rows_reports_bad_rows(row: dict, message: str) -> None:
+    schema = FeatureSchema(["a", "b", "c"])
+
+    with pytest.raises(SchemaError) as excinfo:
+        schema.pack_rows([{"a": 0, "b": 0, "c": 0}, row])
+
+    assert str(excinfo.value) == message
+
+
+def test_columnar_input_is_read_in_place() -> None:
+    pipeline, X = fitted_pipeline()
+    compiled = predict.compile_model(pipeline)
+    columns = {name: np.ascontiguousarray(X[name].to_numpy()) for name in ["c", "b", "a"]}
+
+    views = compiled.schema.columns(columns)
+    scores = predict.predict_columns(compiled, columns)
+
+    assert all(np.shares_memory(view, columns[name]) for view, name in zip(views, "abc"))
+    assert np.allclose(scores, pipeline.predict(X))
+    assert np.allclose(compiled.predict_columns(X), scores)
+    with pytest.raises(SchemaError, match=r"Missing feature columns \['c'\]"):
+        compiled.predict_columns({"a": columns["a"], "b": columns["b"]})
+
+
+def test_arrow_tables_are_accepted() -> None:
+    pa = pytest.importorskip("pyarrow")
+    pipeline, X = fitted_pipeline()
+    compiled = predict.compile_model(pipeline)
+
+    table = pa.Table.from_pandas(X, preserve_index=False)
+
+    assert np.allclose(compiled.predict_columns(table), pipeline.predict(X))
+
+
+def test_pipeline_payloads_are_validated_before_sklearn() -> None:
+    pipeline, X = fitted_pipeline()
+    shuffled = {"c": X["c"][0], "a": X["a"][0], "b": X["b"][0]}
+
+    assert np.isclose(predict.predict_price(pipeline, shuffled), pipeline.predict(X.iloc[:1])[0])
+    with pytest.raises(SchemaError, match="missing features"):
+        predict.batch_predict(pipeline, [shuffled, {"a": 1.0, "b": 2.0}])
@@ -0,0 +1,165 @@
+"""Tests for the request-coalescing prediction service."""
+
+import asyncio
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from src import service
+
+
+def test_micro_batcher_coalesces_concurrent_requests() -> None:
+    batch_sizes = []
+
+    def predict_fn(X: np.ndarray) -> np.ndarray:
+        batch_sizes.append(len(X))
+        return X.sum(axis=1)
+
+    async def run() -> list[float]:
+        batcher = service.MicroBatcher(predict_fn, max_batch_size=4, max_wait_ms=50)
+        await batcher.start()
+        try:
+            rows = [np.array([float(i), 1.0]) for i in range(10)]
+            return await asyncio.gather(*(batcher.submit(row) for row in rows))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == [float(i) + 1.0 for i in range(10)]
+    assert batch_sizes == [4, 4, 2]
+
+
+PAYLOAD = {
+    "Overall Qual": 6,
+    "Overall Cond": 5,
+    "Gr Liv Area": 1500,
+    "Central Air": 1,
+    "Total Bsmt SF": 1000,
+}
+
+
+def copy_project(tmp_path: Path) -> Path:
+    project = Path(__file__).resolve().parent.parent
+    shutil.copytree(project / "configs", tmp_path / "configs")
+    shutil.copytree(project / "models", tmp_path / "models")
+    return tmp_path / "configs" / "default.yaml"
+
+
+def test_micro_batcher_survives_a_bad_batch() -> None:
+    async def run() -> tuple[Exception, float]:
+        batcher = service.MicroBatcher(lambda X: X.sum(axis=1), max_wait_ms=50)
+        await batcher.start()
+        try:
+            # Rows of different lengths cannot be stacked into one matrix.
+            results = await asyncio.gather(
+                batcher.submit(np.ones(2)), batcher.submit(np.ones(3)), return_exceptions=True
+            )
+            return results[0], await batcher.submit(np.ones(2))
+        finally:
+            await batcher.stop()
+
+    error, later = asyncio.run(run())
+
+    assert isinstance(error, ValueError)
+    assert later == 2.0
+
+
+def test_micro_batcher_stop_fails_waiting_requests() -> None:
+    release = threading.Event()
+
+    def predict_fn(X: np.ndarray) -> np.ndarray:
+        release.wait(5)
+        return X.sum(axis=1)
+
+    async def run() -> list:
+        batcher = service.MicroBatcher(predict_fn, max_batch_size=1, max_wait_ms=0)
+        await batcher.start()
+        waiting = [asyncio.ensure_future(batcher.submit(np.ones(2))) for _ in range(3)]
+        await asyncio.sleep(0.05)  # first row in flight, the rest queued
+        await batcher.stop()
+        results = await asyncio.wait_for(
+            asyncio.gather(*waiting, return_exceptions=True), timeout=1
+        )
+        release.set()
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_predict_endpoint_resolves_model_only_when_files_change(
+    tmp_path: Path, monkeypatch
+) -> None:
+    config_path = copy_project(tmp_path)
+    resolves = []
+
+    def counting_resolve(path):
+        resolves.append(path)
+        return load_default_compiled_model(path)
+
+    load_default_compiled_model = service.load_default_compiled_model
+    monkeypatch.setattr(service, "load_default_compiled_model", counting_resolve)
+    model_path = tmp_path / "models" / "linear_regression.pkl"
+
+    with TestClient(service.create_app(config_path)) as client:
+        for _ in range(5):
+            assert client.post("/predict", json={"features": PAYLOAD}).status_code == 200
+        stat = model_path.stat()
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert client.post("/predict", json={"features": PAYLOAD}).status_code == 200
+
+    assert len(resolves) == 2
+
+
+def test_predict_endpoint_serves_default_model(tmp_path: Path) -> None:
+    app = service.create_app(copy_project(tmp_path))
+
+    with TestClient(app) as client:
+        response = client.post("/predict", json={"features": PAYLOAD})
+        missing = client.post("/predict", json={"features": {"Overall Qual": 6}})
+
+    assert response.status_code == 200
+    assert response.json()["prediction"] > 0
+    assert missing.status_code == 422
+
+
+def test_predict_endpoint_answers_repeats_from_cache(tmp_path: Path) -> None:
+    config_path = copy_project(tmp_path)
+    text = config_path.read_text(encoding="utf-8")
+    config_path.write_text(
+        text.replace("cache:\n  enabled: false", "cache:\n  enabled: true"),
+        encoding="utf-8",
+    )
+    app = service.create_app(config_path)
+
+    with TestClient(app) as client:
+        first = client.post("/predict", json={"features": PAYLOAD}).json()
+        second = client.post("/predict", json={"features": PAYLOAD}).json()
+        stats = client.get("/health").json()["cache"]
+
+    assert first == second
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_cached_predict_rejects_incomplete_payloads(tmp_path: Path) -> None:
+    config_path = copy_project(tmp_path)
+    text = config_path.read_text(encoding="utf-8")
+    config_path.write_text(
+        text.replace("cache:\n  enabled: false", "cache:\n  enabled: true"),
+        encoding="utf-8",
+    )
+    app = service.create_app(config_path)
+
+    with TestClient(app) as client:
+        missing = client.post("/predict", json={"features": {"Overall Qual": 6}})
+        stats = client.get("/health").json()["cache"]
+
+    assert missing.status_code == 422
+    assert "missing features" in missing.json()["detail"]
+    assert stats["misses"] == 0
@@ -0,0 +1,166 @@
+"""Tests for shared-memory model weights and the multi-worker launcher."""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.predict import CompiledModel, load_compact_model, save_compact_model
+from src.shared_weights import SharedModelReader, WeightPublisher, segment_name
+
+
+PROJECT = Path(__file__).resolve().parent.parent
+
+
+def linear(weights: list[float], intercept: float) -> CompiledModel:
+    return CompiledModel(
+        features=["a", "b"],
+        weights=np.array(weights),
+        intercept=intercept,
+        pipeline=None,
+        version=f"v{intercept}",
+    )
+
+
+def test_readers_follow_generations_without_copies() -> None:
+    publisher = WeightPublisher()
+    try:
+        publisher.publish(linear([1.0, 2.0], 3.0))
+        reader = SharedModelReader(publisher.name)
+        first = reader.current()
+        assert first.predict_array(np.array([[1.0, 1.0]])).tolist() == [6.0]
+        assert not first.weights.flags.writeable
+        assert reader.current() is first
+
+        assert publisher.publish(linear([10.0, 0.0], 0.0)) == 2
+        second = reader.current()
+        assert second.version == "v0.0"
+        assert second.predict_array(np.array([[1.0, 1.0]])).tolist() == [10.0]
+        # The old generation is unlinked; the first model's mapping survives.
+        assert not Path("/dev/shm", segment_name(publisher.name, 1)).exists()
+        assert first.predict_array(np.array([[1.0, 1.0]])).tolist() == [6.0]
+
+        script = (
+            "import sys, numpy as np\n"
+            "from src.shared_weights import SharedModelReader\n"
+            "model = SharedModelReader(sys.argv[1]).current()\n"
+            "print(model.predict_array(np.ones((1, 2)))[0], 'sklearn' in sys.modules)\n"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", script, publisher.name],
+            cwd=PROJECT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        assert out == ["10.0", "False"]
+        del first, second
+        reader.close()
+    finally:
+        publisher.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedModelReader(publisher.name)
+
+
+def test_reader_keeps_last_model_when_segment_vanishes() -> None:
+    publisher = WeightPublisher()
+    try:
+        publisher.publish(linear([1.0, 2.0], 3.0))
+        reader = SharedModelReader(publisher.name)
+        first = reader.current()
+        publisher.publish(linear([10.0, 0.0], 0.0))
+        # A publisher dying mid-reload: the advertised segment is gone and
+        # the counter never moves on.
+        publisher._segment.unlink()
+        publisher._segment.close()
+        publisher._segment = None
+
+        assert reader.current() is first
+        assert reader.current() is first
+        fresh = SharedModelReader(publisher.name)
+        with pytest.raises(RuntimeError, match="generation 2"):
+            fresh.current()
+        fresh.close()
+        del first
+        reader.close()
+    finally:
+        publisher.close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def post_prediction(port: int, payload: dict) -> float:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/predict",
+        data=json.dumps({"features": payload}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())["prediction"]
+
+
+def test_launcher_hot_reloads_all_workers(tmp_path: Path) -> None:
+    shutil.copytree(PROJECT / "configs", tmp_path / "configs")
+    shutil.copytree(PROJECT / "models", tmp_path / "models")
+    config_path = tmp_path / "configs" / "default.yaml"
+    config_path.write_text(
+        config_path.read_text(encoding="utf-8").replace(
+            "model_format: pickle", "model_format: compact"
+        ),
+        encoding="utf-8",
+    )
+    model_path = tmp_path / "models" / "linear_regression.json"
+    features = load_compact_model(model_path).features
+    payload = dict.fromkeys(features, 1.0)
+    port = free_port()
+
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "src.launcher",
+            "--config", str(config_path),
+            "--workers", "2",
+            "--port", str(port),
+            "--reload-interval", "0.1",
+        ],
+        cwd=PROJECT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                before = post_prediction(port, payload)
+                break
+            except OSError:
+                assert time.monotonic() < deadline, "launcher did not start"
+                time.sleep(0.2)
+
+        k = len(features)
+        save_compact_model(model_path, features, [0.0] * k, [1.0] * k, [0.0] * k, 12345.0)
+        deadline = time.monotonic() + 10
+        predictions = set()
+        while predictions != {12345.0}:
+            assert time.monotonic() < deadline, f"reload not picked up: {predictions}"
+            time.sleep(0.2)
+            predictions = {post_prediction(port, payload) for _ in range(8)}
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    assert before != 12345.0
+    if os.path.isdir("/dev/shm"):
+        assert not [name for name in os.listdir("/dev/shm") if name.startswith("ames_")]
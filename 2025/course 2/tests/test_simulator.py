@@ -0,0 +1,38 @@
+"""Tests for the house listing simulator."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src import simulator
+
+
+STATS_PATH = Path(__file__).resolve().parent.parent / "artifacts" / "feature_stats.json"
+
+
+def test_generate_batch_is_reproducible_and_bounded() -> None:
+    stats = simulator.load_feature_stats(STATS_PATH)
+
+    first = simulator.generate_batch(stats, 1000, rng=7)
+    second = simulator.generate_batch(stats, 1000, rng=np.random.default_rng(7))
+
+    assert len(first) == 1000
+    assert "target_mean" not in first.columns and "test_size" not in first.columns
+    for feature, column in first.columns.items():
+        np.testing.assert_array_equal(column, second.columns[feature])
+        assert column.min() >= stats[feature]["min"]
+        assert column.max() <= stats[feature]["max"]
+    assert set(np.unique(first.columns["Central Air"])) <= {0.0, 1.0}
+
+
+def test_event_batch_lazily_yields_house_events() -> None:
+    stats = json.loads(STATS_PATH.read_text(encoding="utf-8"))
+    batch = simulator.generate_batch(stats, 3, rng=0)
+
+    events = list(batch)
+
+    assert all(isinstance(event, simulator.HouseEvent) for event in events)
+    assert events[1].payload["Gr Liv Area"] == batch.columns["Gr Liv Area"][1]
+    features = ["Gr Liv Area", "Central Air"]
+    assert batch.to_matrix(features).shape == (3, 2)
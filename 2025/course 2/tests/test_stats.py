@@ -0,0 +1,53 @@
+"""Tests for the mergeable feature statistics."""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from src import stats
+from src.train import compute_feature_stats
+
+
+def sample_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    return pd.DataFrame(
+        {
+            "Gr Liv Area": rng.normal(1e6, 5.0, 200),
+            "Overall Qual": rng.integers(1, 10, 200),
+            "SalePrice": rng.normal(180000, 50000, 200),
+        }
+    )
+
+
+def test_compute_feature_stats_matches_pandas() -> None:
+    df = sample_frame()
+
+    result = compute_feature_stats(df)
+
+    assert list(result) == ["Gr Liv Area", "Overall Qual"]
+    for column, values in result.items():
+        assert np.isclose(values["mean"], df[column].mean())
+        assert np.isclose(values["std"], df[column].std(ddof=0))
+        assert values["min"] == df[column].min()
+        assert values["max"] == df[column].max()
+
+
+def test_merged_shards_match_single_pass() -> None:
+    df = sample_frame()
+    shards = [
+        stats.FeatureStatsAccumulator.from_frame(part)
+        for part in (df.iloc[:13], df.iloc[13:13], df.iloc[13:150], df.iloc[150:])
+    ]
+    # Round-trip one shard through JSON as a worker would.
+    shards[2] = stats.FeatureStatsAccumulator.from_state(
+        json.loads(json.dumps(shards[2].to_state()))
+    )
+
+    merged = stats.merge_all(shards)
+
+    whole = stats.FeatureStatsAccumulator.from_frame(df)
+    assert merged.count == len(df)
+    for column, values in merged.to_dict().items():
+        for key, value in values.items():
+            assert np.isclose(value, whole.to_dict()[column][key], rtol=1e-12)
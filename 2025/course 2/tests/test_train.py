@@ -0,0 +1,161 @@
+"""Tests for model training and hyperparameter search."""
+
+import dataclasses
+import re
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import predict, train
+from src.artifact_store import CODE_FILES, default_store
+from src.config import SearchConfig, load_config
+
+
+PROJECT = Path(__file__).resolve().parent.parent
+
+
+def linear_data() -> tuple[pd.DataFrame, pd.Series]:
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 3)), columns=["a", "b", "c"])
+    y = pd.Series(X.to_numpy() @ np.array([5.0, -3.0, 2.0]) + rng.normal(0, 0.1, 300))
+    return X, y
+
+
+def test_expand_search_space_builds_grid() -> None:
+    specs = train.expand_search_space(
+        [{"model": "linear"}, {"model": "poly_ridge", "degree": [2, 3], "alpha": [1.0, 10.0]}]
+    )
+
+    assert len(specs) == 5
+    assert {"model": "poly_ridge", "degree": 3, "alpha": 10.0} in specs
+
+
+def test_search_model_picks_best_candidate_and_prunes_poor_ones() -> None:
+    X, y = linear_data()
+    search = SearchConfig(
+        enabled=True,
+        cv_folds=4,
+        n_jobs=1,
+        early_stop_factor=2.0,
+        candidates=[{"model": "linear"}, {"model": "lasso", "alpha": [1000.0]}],
+    )
+
+    best, results = train.search_model(X, y, search)
+
+    assert best == {"model": "linear"}
+    by_model = {result["spec"]["model"]: result for result in results}
+    assert by_model["lasso"]["pruned"]
+    assert len(by_model["lasso"]["folds"]) == 1
+    assert len(by_model["linear"]["folds"]) == 4
+
+
+def make_project(tmp_path: Path, sale_price_scale: float = 1.0) -> Path:
+    project = tmp_path / "project"
+    if not project.exists():
+        shutil.copytree(PROJECT / "configs", project / "configs")
+    rng = np.random.default_rng(0)
+    n = 200
+    raw = pd.DataFrame(
+        {
+            "Overall Qual": rng.integers(1, 11, n),
+            "Overall Cond": rng.integers(1, 10, n),
+            "Gr Liv Area": rng.normal(1500, 400, n),
+            "Central Air": rng.choice(["Y", "N"], n),
+            "Total Bsmt SF": rng.normal(1000, 300, n),
+        }
+    )
+    raw["SalePrice"] = sale_price_scale * (20000 * raw["Overall Qual"] + 60 * raw["Gr Liv Area"])
+    raw_dir = project / "data" / "raw"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    raw.to_csv(raw_dir / "ames_subset.csv", index=False)
+    return project / "configs" / "default.yaml"
+
+
+def test_main_reuses_cached_run(tmp_path: Path, monkeypatch) -> None:
+    config_path = make_project(tmp_path)
+    first = train.main(config_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached run should not retrain")
+
+    monkeypatch.setattr(train, "train_model", fail)
+    second = train.main(config_path)
+
+    np.testing.assert_array_equal(first[-1].coef_, second[-1].coef_)
+
+
+def test_main_restores_overwritten_artifacts(tmp_path: Path, monkeypatch) -> None:
+    config_path = make_project(tmp_path)
+    train.main(config_path)
+    models = tmp_path / "project" / "models"
+    compact = (models / "linear_regression.json").read_bytes()
+    (models / "linear_regression.json").write_text("{}", encoding="utf-8")
+    (models / "linear_regression.pkl").unlink()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached run should not retrain")
+
+    monkeypatch.setattr(train, "train_model", fail)
+    train.main(config_path)
+
+    assert (models / "linear_regression.pkl").exists()
+    assert (models / "linear_regression.json").read_bytes() == compact
+    settings = load_config(config_path)
+    assert train.artifacts_match(settings, default_store(settings).latest())
+
+
+def test_main_reuses_streamed_feature_stats(tmp_path: Path, monkeypatch) -> None:
+    config_path = make_project(tmp_path)
+    settings = load_config(config_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("stats should come from the streaming pass")
+
+    monkeypatch.setattr(train, "compute_feature_stats", fail)
+    train.main(config_path)
+
+    df = train.prepare_data(settings)
+    _, stats = default_store(settings).load(default_store(settings).latest())
+    assert stats["Gr Liv Area"]["mean"] == pytest.approx(df["Gr Liv Area"].mean())
+    assert "histogram" in stats["Gr Liv Area"]
+
+
+def test_run_key_changes_with_drift_bins(tmp_path: Path) -> None:
+    settings = load_config(make_project(tmp_path))
+    df = pd.DataFrame({"a": [1.0, 2.0]})
+    rebinned = dataclasses.replace(
+        settings, drift=dataclasses.replace(settings.drift, bins=settings.drift.bins + 5)
+    )
+
+    assert train.run_key(df, settings) != train.run_key(df, rebinned)
+
+
+def test_code_version_covers_training_modules() -> None:
+    source = (PROJECT / "src" / "train.py").read_text(encoding="utf-8")
+    imported = set(re.findall(r"^from \.(\w+) import", source, re.MULTILINE))
+
+    # artifact_store keys the runs, config values are hashed separately and
+    # predict only serves (its compact writer is not part of a stored run).
+    assert imported - {"artifact_store", "config", "predict"} <= {
+        name.removesuffix(".py") for name in CODE_FILES
+    }
+
+
+def test_versions_can_be_pinned_and_rolled_back(tmp_path: Path) -> None:
+    config_path = make_project(tmp_path)
+    old = train.main(config_path)
+    make_project(tmp_path, sale_price_scale=2.0)
+    new = train.main(config_path)
+    store = default_store(load_config(config_path))
+    old_key, new_key = list(store.versions())
+
+    assert store.latest() == new_key
+    latest, _ = predict.load_default_model(config_path)
+    np.testing.assert_allclose(latest[-1].coef_, new[-1].coef_)
+
+    store.pin(old_key)
+    pinned, _ = predict.load_default_model(config_path)
+    np.testing.assert_allclose(pinned[-1].coef_, old[-1].coef_)
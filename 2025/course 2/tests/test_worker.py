@@ -0,0 +1,82 @@
+"""Tests for the background scoring worker."""
+
+import time
+
+import numpy as np
+
+from src.predict import CompiledModel
+from src.worker import ScoringWorker
+
+
+STATS = {
+    "a": {"min": 0.0, "max": 10.0, "mean": 5.0, "std": 2.0},
+    "b": {"min": -1.0, "max": 1.0, "mean": 0.0, "std": 1.0},
+}
+
+
+def test_worker_scores_each_batch_in_one_call() -> None:
+    model = CompiledModel(
+        features=["a", "b"], weights=np.array([2.0, 0.0]), intercept=1.0, pipeline=None
+    )
+    worker = ScoringWorker(model, STATS, interval_seconds=0.001, batch_size=50, seed=0)
+    worker.start()
+    try:
+        while worker.results.qsize() < 3:
+            time.sleep(0.001)
+    finally:
+        worker.stop(timeout=1)
+
+    batches = worker.drain()
+
+    assert len(batches) >= 3
+    for batch in batches:
+        assert len(batch.predictions) == 50
+        np.testing.assert_allclose(batch.predictions, 2 * batch.events.columns["a"] + 1)
+
+
+def test_worker_drops_oldest_batch_when_queue_is_full() -> None:
+    model = CompiledModel(features=["a"], weights=np.ones(1), intercept=0.0, pipeline=None)
+    worker = ScoringWorker(model, STATS, interval_seconds=0, batch_size=1, max_pending=2)
+
+    for _ in range(3):
+        worker.run_once()
+
+    assert worker.dropped == 1
+    assert len(worker.drain()) == 2
+
+
+def test_worker_uses_the_current_model_for_each_batch() -> None:
+    models = [
+        CompiledModel(features=["a"], weights=np.ones(1), intercept=offset, pipeline=None)
+        for offset in (0.0, 100.0)
+    ]
+    current = iter(models)
+    worker = ScoringWorker(lambda: next(current), STATS, interval_seconds=0, batch_size=5)
+
+    first, second = worker.run_once(), worker.run_once()
+
+    np.testing.assert_allclose(first.predictions, first.events.columns["a"])
+    np.testing.assert_allclose(second.predictions, second.events.columns["a"] + 100)
+
+
+def test_shorter_interval_wakes_the_worker() -> None:
+    model = CompiledModel(features=["a"], weights=np.ones(1), intercept=0.0, pipeline=None)
+    worker = ScoringWorker(model, STATS, interval_seconds=60, batch_size=1)
+    worker.start()
+    try:
+        worker.results.get(timeout=1)
+        worker.interval_seconds = 0.01
+        worker.results.get(timeout=1)  # would wait out the 60 s sleep before
+    finally:
+        worker.stop(timeout=1)
+
+    assert not worker.is_alive()
+
+
+def test_worker_stops_when_nobody_drains() -> None:
+    model = CompiledModel(features=["a"], weights=np.ones(1), intercept=0.0, pipeline=None)
+    worker = ScoringWorker(model, STATS, interval_seconds=0.01, batch_size=1, idle_timeout=0.05)
+    worker.start()
+    worker.join(timeout=2)
+
+    assert not worker.is_alive()
@@ -1,22 +1,70 @@
 # Create the endpoint
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import models.ml.classifier as clf
-from fastapi import FastAPI, Body
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
 from joblib import load
 from models.iris import Iris
+from models.ml.compiled_tree import CompiledTree
+
+MODEL_PATH = "models/ml/iris_dt_v1.joblib"
+# Written by training.py; compiled from MODEL_PATH at startup when missing
+COMPILED_PATH = "models/ml/iris_dt_v1.npz"
+N_FEATURES = 4
+# Threads that run inference; further requests queue for a free one
+INFERENCE_THREADS = int(os.environ.get("INFERENCE_THREADS", min(4, os.cpu_count() or 1)))
 
 app = FastAPI(title="Iris ML API", description="API for iris dataset ml model", version="1.0")
 
 
-# Load the model
+# Load the model and start the inference pool
 @app.on_event("startup")
 async def load_model():
-    clf.model = load("models/ml/iris_dt_v1.joblib")
+    # Same answers as the sklearn pipeline, scored with a few NumPy ops per tree level
+    if os.path.exists(COMPILED_PATH):
+        clf.model = CompiledTree.load(COMPILED_PATH)
+    else:
+        clf.model = CompiledTree.from_pipeline(load(MODEL_PATH))
+    clf.executor = ThreadPoolExecutor(max_workers=INFERENCE_THREADS, thread_name_prefix="inference")
+
+
+@app.on_event("shutdown")
+async def stop_executor():
+    clf.executor.shutdown()
+
+
+def score(data):
+    # One predict_proba pass; the class is the most probable column. The
+    # response is serialized here too, off the event loop.
+    if not len(data):
+        return JSONResponse({"prediction": [], "log_proba": []})
+    proba = clf.model.predict_proba(data)
+    prediction = clf.model.classes_[proba.argmax(axis=1)]
+    return JSONResponse({"prediction": prediction.tolist(), "log_proba": proba.tolist()})
+
+
+async def run_inference(data):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(clf.executor, score, data)
 
 
 # Define the route for predictions
 @app.post("/predict", tags=["predictions"])
 async def get_prediction(iris: Iris):
-    data = dict(iris)["data"]
-    prediction = clf.model.predict(data).tolist()
-    log_proba = clf.model.predict_proba(data).tolist()
-    return {"prediction": prediction, "log_proba": log_proba}
+    return await run_inference(np.asarray(iris.data, dtype=np.float64).reshape(-1, N_FEATURES))
+
+
+# Large batches: rows of 4 little-endian float32 values, no per-element validation
+@app.post("/predict/packed", tags=["predictions"])
+async def get_prediction_packed(request: Request):
+    body = await request.body()
+    if len(body) % (4 * N_FEATURES):
+        raise HTTPException(status_code=422, detail=f"Body must be rows of {N_FEATURES} float32 values")
+    data = np.frombuffer(body, dtype="<f4").reshape(-1, N_FEATURES)
+    if not np.isfinite(data).all():
+        raise HTTPException(status_code=422, detail="Features must be finite")
+    return await run_inference(data)
@@ -0,0 +1,76 @@
+# Compare the sklearn pipeline with the compiled tree: exactness, per-row latency, batch throughput
+import argparse
+import time
+
+import numpy as np
+from sklearn import datasets
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from models.ml.compiled_tree import CompiledTree
+
+
+def fit_pipeline():
+    # Same model as models/ml/training.py
+    X, y = datasets.load_iris(return_X_y=True)
+    pipeline = Pipeline([("scaling", MinMaxScaler()), ("clf", DecisionTreeClassifier(random_state=42))])
+    return pipeline.fit(X, y), X
+
+
+def sample_rows(X, n, rng):
+    # Iris-like rows spread a little past the training range
+    return rng.uniform(X.min(axis=0) - 0.5, X.max(axis=0) + 0.5, size=(n, X.shape[1]))
+
+
+def check_exact(pipeline, compiled, X):
+    for dtype in (np.float64, np.float32):
+        data = X.astype(dtype)
+        assert np.array_equal(compiled.predict(data), pipeline.predict(data)), dtype
+        assert np.array_equal(compiled.predict_proba(data), pipeline.predict_proba(data)), dtype
+
+
+def per_row_us(predict_proba, rows):
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        predict_proba(row)
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e6
+
+
+def rows_per_second(predict_proba, batch, repeats):
+    best = min(_timed(predict_proba, batch) for _ in range(repeats))
+    return len(batch) / best
+
+
+def _timed(predict_proba, batch):
+    start = time.perf_counter()
+    predict_proba(batch)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sklearn pipeline vs compiled tree")
+    parser.add_argument("--rows", type=int, default=1000, help="single-row calls to time")
+    parser.add_argument("--batch", type=int, default=100_000, help="rows per batch call")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pipeline, X = fit_pipeline()
+    compiled = CompiledTree.from_pipeline(pipeline)
+    batch = sample_rows(X, args.batch, rng)
+    check_exact(pipeline, compiled, np.vstack([X, batch]))
+    print(f"exact match with sklearn on {len(X) + len(batch):,} rows (float64 and float32)")
+
+    rows = sample_rows(X, args.rows, rng)[:, np.newaxis, :]
+    print(f"{'path':<10}{'per row (us)':>14}{'batch (rows/s)':>18}")
+    for name, model in (("sklearn", pipeline), ("compiled", compiled)):
+        latency = per_row_us(model.predict_proba, rows)
+        throughput = rows_per_second(model.predict_proba, batch, args.repeats)
+        print(f"{name:<10}{latency:>14.1f}{throughput:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
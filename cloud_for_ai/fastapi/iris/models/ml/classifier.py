@@ -1,2 +1,5 @@
 # Initialize a plaseholder to import and reuse the model
 clf = None
+model = None
+# Bounded thread pool that runs inference off the event loop
+executor = None
@@ -0,0 +1,181 @@
+# Compile the MinMaxScaler + DecisionTreeClassifier pipeline into flat arrays
+import numpy as np
+
+# Input dtypes with their own folded thresholds; anything else is cast to float64
+DTYPES = (np.float64, np.float32)
+
+
+def _scaled_goes_left(x, scale, offset, clip, threshold, dtype):
+    # Replays the pipeline on one raw value x of `dtype`: MinMaxScaler does
+    # `X *= scale_; X += min_` in place (so float32 input is rounded back to
+    # float32 after each step), then the tree compares float32(x') <= threshold.
+    x = dtype(np.float64(x) * scale)
+    x = dtype(np.float64(x) + offset)
+    if clip is not None:
+        x = dtype(min(max(x, clip[0]), clip[1]))
+    return np.float64(np.float32(x)) <= threshold
+
+
+def fold_threshold(threshold, scale, offset, clip=None, dtype=np.float64):
+    """Largest raw value of `dtype` that the scaled split sends to the left child.
+
+    The scaling is monotone, so `raw <= result` reproduces the original test
+    bit for bit, including the float32 rounding inside the tree.
+    """
+
+    def goes_left(x):
+        # Probing near the dtype's max overflows to inf, as sklearn would.
+        with np.errstate(over="ignore"):
+            return _scaled_goes_left(x, scale, offset, clip, threshold, dtype)
+
+    top = dtype(np.finfo(dtype).max)
+    if goes_left(top):
+        return np.inf
+    if not goes_left(-top):
+        return -np.inf
+
+    # Bracket the boundary around the algebraic estimate, then bisect.
+    estimate = float(np.clip((threshold - offset) / scale, -top, top))
+    step = abs(estimate) * 1e-6 + 1e-6
+    lo = hi = dtype(estimate)
+    while not goes_left(lo):
+        lo, step = dtype(max(float(lo) - step, -float(top))), step * 2
+    while goes_left(hi):
+        hi, step = dtype(min(float(hi) + step, float(top))), step * 2
+    while True:
+        above = np.nextafter(lo, dtype(np.inf))
+        if above == hi:
+            return lo
+        mid = dtype(float(lo) / 2 + float(hi) / 2)
+        if not lo < mid < hi:
+            mid = above
+        if goes_left(mid):
+            lo = mid
+        else:
+            hi = mid
+
+
+class CompiledTree:
+    """A fitted MinMaxScaler + DecisionTreeClassifier as contiguous NumPy arrays.
+
+    Leaves point back to themselves, so scoring a batch is `depth` rounds of
+    gather-compare-select over all rows at once, without per-row Python.
+    `predict` and `predict_proba` return exactly what the sklearn pipeline
+    returns for float64 and float32 input.
+    """
+
+    def __init__(self, feature, thresholds, left, right, missing_left, value, classes, depth, n_features):
+        self.feature = feature
+        self.thresholds = thresholds  # dtype name -> folded thresholds
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.classes_ = classes
+        self.depth = depth
+        self.n_features = n_features
+        # Interleaved (right, left) pairs: the next node is children[2 * node + go_left]
+        self.children = np.stack([right, left], axis=1).ravel()
+        # sklearn normalizes leaf values for predict_proba, but takes argmax of the raw values for predict
+        normalizer = value.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        self.proba = value / normalizer
+        self.leaf_class = classes.take(np.argmax(value, axis=1), axis=0)
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        scaler, tree = pipeline[0], pipeline[-1]
+        nodes = tree.tree_
+        n_nodes = nodes.node_count
+        is_leaf = nodes.children_left == -1
+        nodes_ix = np.arange(n_nodes)
+        clip = tuple(scaler.feature_range) if scaler.clip else None
+
+        feature = np.where(is_leaf, 0, nodes.feature).astype(np.intp)
+        thresholds = {}
+        for dtype in DTYPES:
+            folded = np.full(n_nodes, np.inf, dtype=dtype)
+            for node in np.flatnonzero(~is_leaf):
+                f = feature[node]
+                folded[node] = fold_threshold(
+                    nodes.threshold[node], scaler.scale_[f], scaler.min_[f], clip, dtype
+                )
+            thresholds[np.dtype(dtype).name] = folded
+        missing_left = getattr(nodes, "missing_go_to_left", np.zeros(n_nodes, dtype=np.uint8))
+
+        return cls(
+            feature=feature,
+            thresholds=thresholds,
+            left=np.where(is_leaf, nodes_ix, nodes.children_left).astype(np.intp),
+            right=np.where(is_leaf, nodes_ix, nodes.children_right).astype(np.intp),
+            missing_left=np.asarray(missing_left, dtype=bool) & ~is_leaf,
+            value=np.ascontiguousarray(nodes.value[:, 0, : tree.n_classes_], dtype=np.float64),
+            classes=np.asarray(tree.classes_),
+            depth=int(nodes.max_depth),
+            n_features=int(tree.n_features_in_),
+        )
+
+    def save(self, path):
+        arrays = {f"threshold_{name}": values for name, values in self.thresholds.items()}
+        np.savez(
+            path,
+            feature=self.feature,
+            left=self.left,
+            right=self.right,
+            missing_left=self.missing_left,
+            value=self.value,
+            classes=self.classes_,
+            depth=self.depth,
+            n_features=self.n_features,
+            **arrays,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            thresholds = {np.dtype(dtype).name: data[f"threshold_{np.dtype(dtype).name}"] for dtype in DTYPES}
+            return cls(
+                feature=data["feature"].astype(np.intp),
+                thresholds=thresholds,
+                left=data["left"].astype(np.intp),
+                right=data["right"].astype(np.intp),
+                missing_left=data["missing_left"],
+                value=data["value"],
+                classes=data["classes"],
+                depth=int(data["depth"]),
+                n_features=int(data["n_features"]),
+            )
+
+    def apply(self, X):
+        """Leaf index for every row of X."""
+
+        X = np.asarray(X)
+        if X.dtype not in DTYPES:
+            X = X.astype(np.float64)
+        X = np.ascontiguousarray(X)
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2D array, got shape {X.shape}")
+        n_rows, n_features = X.shape
+        if n_features != self.n_features:
+            raise ValueError(f"X has {n_features} features, but the model expects {self.n_features}")
+        if np.isinf(X).any():
+            raise ValueError("Input contains infinity")
+        threshold = self.thresholds[X.dtype.name]
+        flat = X.ravel()
+        row_start = np.arange(n_rows) * n_features
+        has_nan = np.isnan(flat).any()
+
+        node = np.zeros(n_rows, dtype=np.intp)
+        for _ in range(self.depth):
+            x = flat[row_start + self.feature[node]]
+            go_left = x <= threshold[node]
+            if has_nan:
+                go_left |= np.isnan(x) & self.missing_left[node]
+            node = self.children[2 * node + go_left]
+        return node
+
+    def predict_proba(self, X):
+        return self.proba[self.apply(X)]
+
+    def predict(self, X):
+        return self.leaf_class[self.apply(X)]
@@ -4,6 +4,8 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.tree import DecisionTreeClassifier
 
+from compiled_tree import CompiledTree
+
 # Load and split the data
 iris = datasets.load_iris(return_X_y=True)
 X = iris[0]
@@ -17,3 +19,6 @@ pipeline.fit(X, y)
 
 # save the model
 dump(pipeline, "./iris_dt_v1.joblib")
+
+# export the compiled tree: scaling folded into the thresholds, flat arrays
+CompiledTree.from_pipeline(pipeline).save("./iris_dt_v1.npz")
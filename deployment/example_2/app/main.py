@@ -1,10 +1,44 @@
+import os
 import pickle
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List
+
 import numpy as np
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
 
-app = FastAPI(title="Predicting Wine Class")
+# /app/wine.pkl inside the container; override for local runs.
+MODEL_PATH = Path(os.environ.get("WINE_MODEL_PATH", Path(__file__).with_name("wine.pkl")))
+
+# Column order the classifier was trained with.
+FEATURES = (
+    "alcohol",
+    "malic_acid",
+    "ash",
+    "alcalinity_of_ash",
+    "magnesium",
+    "total_phenols",
+    "flavanoids",
+    "nonflavanoid_phenols",
+    "proanthocyanins",
+    "color_intensity",
+    "hue",
+    "od280_od315_of_diluted_wines",
+    "proline",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load classifier from pickle file once, before the first request
+    with open(MODEL_PATH, "rb") as file:
+        app.state.clf = pickle.load(file)
+    yield
+
+
+app = FastAPI(title="Predicting Wine Class", lifespan=lifespan)
 
 
 # Represents a particular wine (or datapoint)
@@ -24,12 +58,21 @@ class Wine(BaseModel):
     proline: float
 
 
-@app.get("startup")
-def load_clf():
-    # Load classifier from pickle file
-    with open("/app/wine.pkl", "rb") as file:
-        global clf
-        clf = pickle.load(file)
+# Many wines at once, one list per feature (columnar)
+class WineBatch(BaseModel):
+    alcohol: List[float]
+    malic_acid: List[float]
+    ash: List[float]
+    alcalinity_of_ash: List[float]
+    magnesium: List[float]
+    total_phenols: List[float]
+    flavanoids: List[float]
+    nonflavanoid_phenols: List[float]
+    proanthocyanins: List[float]
+    color_intensity: List[float]
+    hue: List[float]
+    od280_od315_of_diluted_wines: List[float]
+    proline: List[float]
 
 
 @app.get("/")
@@ -39,27 +82,18 @@ def home():
 
 @app.post("/predict")
 def predict(wine: Wine):
-    data_point = np.array(
-        [
-            [
-                wine.alcohol,
-                wine.malic_acid,
-                wine.ash,
-                wine.alcalinity_of_ash,
-                wine.magnesium,
-                wine.total_phenols,
-                wine.flavanoids,
-                wine.nonflavanoid_phenols,
-                wine.proanthocyanins,
-                wine.color_intensity,
-                wine.hue,
-                wine.od280_od315_of_diluted_wines,
-                wine.proline,
-            ]
-        ]
-    )
-
-    pred = clf.predict(data_point).tolist()
-    pred = pred[0]
-    print(pred)
+    data_point = np.array([[getattr(wine, name) for name in FEATURES]])
+    pred = app.state.clf.predict(data_point).tolist()[0]
     return {"Prediction": pred}
+
+
+@app.post("/predict/batch")
+def predict_batch(batch: WineBatch):
+    columns = [getattr(batch, name) for name in FEATURES]
+    if len({len(column) for column in columns}) != 1:
+        raise HTTPException(status_code=422, detail="All feature lists must have the same length")
+    if not columns[0]:
+        return {"Predictions": []}
+    # One (n, 13) matrix and a single predict call for the whole batch
+    data = np.array(columns, dtype=np.float64).T
+    return {"Predictions": app.state.clf.predict(data).tolist()}
@@ -0,0 +1,84 @@
+"""Compare /predict and /predict/batch throughput under concurrency.
+
+Start the server first (``uvicorn app.main:app --port 8000`` from this
+directory, or the Docker container), then run::
+
+    python bench.py --url http://localhost:8000 --wines 2000 --concurrency 8 --batch-size 100
+
+Both modes score the same wines (the files in ``wine-examples/`` repeated),
+each client thread keeping one keep-alive connection. Only the standard
+library is used.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+EXAMPLES = Path(__file__).with_name("wine-examples")
+
+
+def load_wines(n):
+    examples = [json.loads(path.read_text()) for path in sorted(EXAMPLES.glob("*.json"))]
+    return [examples[i % len(examples)] for i in range(n)]
+
+
+def columnar(wines):
+    return {name: [wine[name] for wine in wines] for name in wines[0]}
+
+
+def run(url, path, bodies, concurrency):
+    """POST every body to `path`; returns elapsed seconds."""
+
+    parts = urlsplit(url)
+    local = threading.local()
+
+    def post(body):
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        local.conn.request("POST", path, body, {"Content-Type": "application/json"})
+        response = local.conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"{path} returned HTTP {response.status}")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(post, bodies))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:80")
+    parser.add_argument("--wines", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    wines = load_wines(args.wines)
+    single = [json.dumps(wine) for wine in wines]
+    batches = [
+        json.dumps(columnar(wines[i : i + args.batch_size]))
+        for i in range(0, len(wines), args.batch_size)
+    ]
+
+    print(f"{'mode':<8}{'requests':>10}{'req/s':>10}{'wines/s':>10}")
+    for mode, path, bodies in (
+        ("single", "/predict", single),
+        ("batch", "/predict/batch", batches),
+    ):
+        run(args.url, path, bodies[: args.concurrency], args.concurrency)  # warm up
+        elapsed = run(args.url, path, bodies, args.concurrency)
+        print(
+            f"{mode:<8}{len(bodies):>10}{len(bodies) / elapsed:>10.0f}"
+            f"{len(wines) / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
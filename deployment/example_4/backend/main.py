@@ -1,15 +1,48 @@
+from typing import List
+
+import numpy as np
 import pandas as pd
-from fastapi import FastAPI
-from pydantic import BaseModel
-import json
 import uvicorn
-import pandas as pd
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
 from pickle import load
 
 
 app = FastAPI()
 with open("model.pkl", "rb") as f:
     model = load(f)
+# predict_proba column of the "left" class (1), in the model's own class order.
+LEFT_COLUMN = list(model.classes_).index(1)
+
+# Categorical encoders, built once: label -> code the model was trained on.
+departments_list = [
+    "IT",
+    "RandD",
+    "accounting",
+    "hr",
+    "management",
+    "marketing",
+    "product_mng",
+    "sales",
+    "support",
+    "technical",
+]
+salaries = ["low", "medium", "high"]
+DEPARTMENT_CODES = {name: code for code, name in enumerate(departments_list)}
+SALARY_CODES = {name: code for code, name in enumerate(salaries)}
+
+# Request fields that are already numeric, in training column order.
+NUMERIC = [
+    "satisfaction_level",
+    "last_evaluation",
+    "number_project",
+    "average_montly_hours",
+    "time_spend_company",
+    "Work_accident",
+    "promotion_last_5years",
+]
+# Column names the model was fitted with (see example4_dc.csv).
+COLUMNS = NUMERIC + ["Departments", "salary"]
 
 
 class user_input(BaseModel):
@@ -24,36 +57,41 @@ class user_input(BaseModel):
     salary: str
 
 
+# Many employees at once, one list per field (columnar).
+class batch_input(BaseModel):
+    satisfaction_level: List[float]
+    last_evaluation: List[float]
+    number_project: List[int]
+    average_montly_hours: List[int]
+    time_spend_company: List[int]
+    Work_accident: List[int]
+    promotion_last_5years: List[int]
+    departments: List[str]
+    salary: List[str]
+
+
+def encode(columns):
+    """Pack a mapping of field -> values into an (n, 9) float matrix."""
+
+    n = len(columns["salary"])
+    if any(len(columns[name]) != n for name in NUMERIC + ["departments"]):
+        raise HTTPException(status_code=422, detail="All fields must have the same length")
+    data = np.empty((n, len(COLUMNS)))
+    for j, name in enumerate(NUMERIC):
+        data[:, j] = columns[name]
+    try:
+        data[:, -2] = [DEPARTMENT_CODES[name] for name in columns["departments"]]
+        data[:, -1] = [SALARY_CODES[name] for name in columns["salary"]]
+    except KeyError as exc:
+        raise HTTPException(status_code=422, detail=f"Unknown category {exc}") from None
+    return data
+
+
 def predict(data):
-    departments_list = [
-        "IT",
-        "RandD",
-        "accounting",
-        "hr",
-        "management",
-        "marketing",
-        "product_mng",
-        "sales",
-        "support",
-        "technical",
-    ]
-    data[-2] = departments_list.index(data[-2])
-    salaries = ["low", "medium", "high"]
-    data[-1] = salaries.index(data[-1])
-    columns = [
-        "satisfaction_level",
-        "last_evaluation",
-        "number_project",
-        "average_montly_hours",
-        "time_spend_company",
-        "Work_accident",
-        "promotion_last_5years",
-        "departments",
-        "salary",
-    ]
-    prediction = model.predict(pd.DataFrame([data], columns=columns))
-    proba = model.predict_proba(pd.DataFrame([data], columns=columns))
-    return prediction, proba
+    """Class and churn probability for every row, from one predict_proba call."""
+
+    proba = model.predict_proba(pd.DataFrame(data, columns=COLUMNS, copy=False))
+    return model.classes_[proba.argmax(axis=1)], proba[:, LEFT_COLUMN]
 
 
 @app.get("/")
@@ -63,21 +101,19 @@ def welcome():
 
 @app.post("/predict")
 def func(Input: user_input):
-    data = [
-        Input.satisfaction_level,
-        Input.last_evaluation,
-        Input.number_project,
-        Input.average_montly_hours,
-        Input.time_spend_company,
-        Input.Work_accident,
-        Input.promotion_last_5years,
-        Input.departments,
-        Input.salary,
-    ]
+    fields = Input.model_dump()
+    pred, proba = predict(encode({name: [value] for name, value in fields.items()}))
+    return {"prediction": int(pred[0]), "probability": float(proba[0])}
+
+
+@app.post("/predict/batch")
+def predict_batch(Input: batch_input):
+    data = encode(Input.model_dump())
+    if not len(data):
+        return {"prediction": [], "probability": []}
     pred, proba = predict(data)
-    output = {"prediction": int(pred[0]), "probability": float(proba[0][1])}
-    return json.dumps(output)
+    return {"prediction": pred.tolist(), "probability": proba.tolist()}
 
 
 if __name__ == "__main__":
-    uvicorn.run("hello_world_fastapi:app")
+    uvicorn.run("main:app")
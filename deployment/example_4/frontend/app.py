@@ -1,6 +1,30 @@
-import streamlit as st
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 import requests
-import json
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+API_URL = os.environ.get("API_URL", "http://localhost:8000")
+# Bulk scoring: rows per request and requests in flight at once.
+CHUNK_ROWS = 2000
+MAX_IN_FLIGHT = 4
+# Scored output is kept in memory up to this size, then in a temp file.
+SPOOL_BYTES = 8 * 2**20
+
+
+@st.cache_resource
+def get_session():
+    # One pooled session per server process, reused across reruns and threads
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_IN_FLIGHT)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 # headers
 st.title("End-to-End App")  # title to be shown
@@ -54,16 +78,92 @@ input_data = dict(zip(names, params))
 
 # Predictions
 if st.button("Predict"):
-    # pred = predict(satisfaction_level, last_evaluation, number_project, average_montly_hours, time_spend_company,
-    #                                         Work_accident, promotion_last_5years,department, salary)
     try:
-        output_ = requests.post(url="http://localhost:8000/predict", data=json.dumps(input_data))
-    except:
-        print("Not able to connect to api server")
-    # output_ = requests.post(url = 'http://localhost:8000/predict', data = json.dumps(input_data))
-    ans = eval(output_.json())
+        output_ = get_session().post(url=f"{API_URL}/predict", json=input_data, timeout=10)
+        output_.raise_for_status()
+    except requests.RequestException as exc:
+        st.error(f"Not able to connect to api server: {exc}")
+        st.stop()
+    ans = output_.json()
     output = "Yes" if ans["prediction"] == 1 else "No"
     if output == "Yes":
         st.success(f"The employee might leave the company with a probability of {(ans['probability'])*100: .2f}")
     if output == "No":
         st.success(f"The employee might not leave the company with a probability of {(1-ans['probability'])*100: .2f}")
+
+
+# Bulk scoring
+# CSV headers that may stand in for a request field (the training file's spelling).
+aliases = {"departments": "Departments"}
+
+
+def score_chunk(session, chunk):
+    """Score one DataFrame chunk with a single /predict/batch request."""
+
+    payload = {name: chunk[name if name in chunk else aliases[name]].tolist() for name in names}
+    response = session.post(f"{API_URL}/predict/batch", json=payload, timeout=60)
+    response.raise_for_status()
+    result = response.json()
+    return chunk.assign(prediction=result["prediction"], probability=result["probability"])
+
+
+def score_file(file, session, chunk_rows=CHUNK_ROWS, max_in_flight=MAX_IN_FLIGHT):
+    """Yield scored chunks in file order, with at most `max_in_flight` requests pending.
+
+    `session` is fetched in the script thread: st.cache_resource must not be
+    called from the pool threads, which have no script run context.
+    """
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        for chunk in pd.read_csv(file, chunksize=chunk_rows):
+            pending.append(pool.submit(score_chunk, session, chunk))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+st.header("Or score a CSV file:")
+uploaded = st.file_uploader("Employee file with one row per employee", type="csv")
+if uploaded is not None and st.button("Score file"):
+    header = pd.read_csv(uploaded, nrows=0).columns
+    missing = [name for name in names if name not in header and aliases.get(name) not in header]
+    if missing:
+        st.error(f"The file is missing columns: {', '.join(missing)}")
+        st.stop()
+    uploaded.seek(0)
+    total = max(sum(1 for _ in uploaded) - 1, 1)  # line by line, not one big copy
+    uploaded.seek(0)
+
+    # Scored rows go to disk past SPOOL_BYTES, so memory does not grow with the file.
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    progress = st.progress(0.0, text="Scoring...")
+    latest = st.empty()
+    done, leaving = 0, 0
+    try:
+        for scored in score_file(uploaded, get_session()):
+            scored.to_csv(output, index=False, header=not done, mode="ab")
+            done += len(scored)
+            leaving += int(scored["prediction"].sum())
+            progress.progress(
+                min(done / total, 1.0),
+                text=f"Scored {done:,} employees, {leaving:,} likely to leave",
+            )
+            latest.dataframe(scored.head(10))
+    except requests.RequestException as exc:
+        st.error(f"Scoring stopped after {done:,} employees: {exc}")
+    # Kept across reruns so clicking the download button does not lose it
+    previous = st.session_state.get("scored")
+    if previous:
+        previous[1].close()
+    if done:
+        st.session_state["scored"] = (f"scored_{uploaded.name}", output)
+    else:
+        output.close()
+        st.session_state["scored"] = None
+
+if st.session_state.get("scored"):
+    file_name, output = st.session_state["scored"]
+    output.seek(0)
+    st.download_button("Download scored file", data=output, file_name=file_name, mime="text/csv")